@@ -1,23 +1,64 @@
 import os
 import argparse
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import re
 import json
 import logging
+from array import array
 
 from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
 from strategy.survivor import SurvivorStrategy
 from orders import OrderTracker
 from logger import logger
+from backtest_writer import BacktestWriter
+import backtest_metrics
+
+SURVIVOR_CONFIG_FILE = "strategy/configs/survivor.yml"
+
+
+def load_survivor_config(config_file: str = SURVIVOR_CONFIG_FILE, force_trades: bool = False) -> Dict[str, Any]:
+    """
+    Load the Survivor `default` config with the backtest sizing overrides applied.
+    """
+    import yaml
+    with open(config_file, 'r') as f:
+        config = yaml.safe_load(f)['default']
+    
+    # Realistic account sizing for ₹1 Lakh capital
+    config['pe_quantity'] = 25  # Force small lot size
+    config['ce_quantity'] = 25
+    config['sell_multiplier_threshold'] = 5  # Allow some scaling but keep it sane
+    
+    # If using CSV, we might need slightly larger gaps than 1 to avoid excessive multiplier triggers
+    if force_trades:
+        config['pe_gap'] = 1
+        config['ce_gap'] = 1
+        logger.info("Forcing trades - setting gaps to 1")
+    else:
+        # Default manageable gaps for daily data
+        config['pe_gap'] = 50 
+        config['ce_gap'] = 50
+    return config
+
 
 class BacktestEngine:
-    def __init__(self, strategy_class, config: Dict[str, Any], initial_capital: float = 100000.0, max_trades_per_day: int = 5):
+    def __init__(self, strategy_class, config: Dict[str, Any], initial_capital: float = 100000.0, max_trades_per_day: int = 5,
+                 output_dir: str = "backtest_results", stream_results: bool = False):
         self.strategy_class = strategy_class
         self.config = config
         self.initial_capital = initial_capital
         self.max_trades_per_day = max_trades_per_day
+        self.output_dir = output_dir
+        # Stream fills and per-bar equity to JSONL instead of holding every trade in memory
+        self.stream_results = stream_results
+        self.writer = None
+        # Per-bar equity curve kept for metrics when not streaming (compact typed arrays)
+        self._curve_ts = array('q')
+        self._curve_equity = array('d')
+        self._curve_margin = array('d')
         
         # Initialize Backtest Broker
         self.broker = BrokerGateway.from_name("backtest")
@@ -28,10 +69,13 @@ class BacktestEngine:
         # Initialize Tracker
         self.order_tracker = OrderTracker()
         
+        self.csv_provider = None
+
         # Strategy instance
         self.strategy = None
         self.trades = []
         self.daily_trade_count = {}
+        self.results = None
 
     def fetch_historical_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
@@ -59,8 +103,15 @@ class BacktestEngine:
         Load historical data from local CSV files.
         """
         from brokers.integrations.backtest.csv_provider import CSVDataProvider
-        self.csv_provider = CSVDataProvider(downloads_path)
-        self.driver.set_csv_provider(self.csv_provider)
+        return self.use_csv_provider(CSVDataProvider(downloads_path))
+
+    def use_csv_provider(self, provider) -> pd.DataFrame:
+        """
+        Attach an already-loaded CSVDataProvider, or a SharedMarketDataHandle
+        published by another process (see brokers/integrations/backtest/shared.py).
+        """
+        self.driver.set_csv_provider(provider)
+        self.csv_provider = self.driver.csv_provider
         
         if self.csv_provider.index_data is not None:
              return self.csv_provider.index_data
@@ -68,11 +119,31 @@ class BacktestEngine:
         logger.error("Failed to load index data from CSV.")
         return pd.DataFrame()
 
-    def run(self, data_df: pd.DataFrame):
-        if data_df.empty:
-            logger.error("Cannot run backtest with empty data.")
-            return
+    def select_csv_window(self, data: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+        """
+        Filter CSV index data to [start, end] and point `symbol_initials` at the
+        near-month series of the first day in the window.
+        """
+        start_ts = pd.to_datetime(start)
+        end_ts = pd.to_datetime(end)
+        data = data[(data.index >= start_ts) & (data.index <= end_ts)]
         
+        # Determine symbol_initials from first available chain
+        if not data.empty:
+            first_date = data.index[0]
+            chain = self.csv_provider.get_option_chain(first_date)
+            if chain and not chain['CE'].empty:
+                synth = chain['CE'].iloc[0]['synth_symbol']
+                # synth is like NIFTY26FEB25500CE
+                # Strategy wants prefix NIFTY26FEB
+                match = re.match(r"(NIFTY\d{2}[A-Z]{3})", synth)
+                if match:
+                    self.config['symbol_initials'] = match.group(1)
+                    logger.info(f"Detected CSV symbol prefix: {self.config['symbol_initials']}")
+        return data
+
+    def _prepare_run(self, data_df: pd.DataFrame):
+        """Seed driver state from the first row and construct the strategy."""
         # Set instruments for the driver (needed for margin calculations etc if any)
         # For simplicity, we'll mock it if not present
         if self.driver.instruments_df is None:
@@ -87,104 +158,360 @@ class BacktestEngine:
             self.driver.set_instruments(mock_inst)
 
         # Prepare initial price if possible
-        if not data_df.empty:
-            first_row = data_df.iloc[0]
-            initial_time = first_row['timestamp'] if 'timestamp' in first_row else data_df.index[0]
-            initial_price = first_row['close'] if 'close' in first_row else first_row['Close']
-            self.driver.set_current_time(initial_time)
-            self.driver.set_price(self.config['index_symbol'], initial_price)
-            if self.csv_provider:
-                self.driver.download_instruments()
+        first_row = data_df.iloc[0]
+        initial_time = first_row['timestamp'] if 'timestamp' in first_row else data_df.index[0]
+        initial_price = first_row['close'] if 'close' in first_row else first_row['Close']
+        self.driver.set_current_time(initial_time)
+        self.driver.set_price(self.config['index_symbol'], initial_price)
+        if self.csv_provider:
+            self.driver.download_instruments()
 
         # Initialize strategy
-        self.strategy = self.strategy_class(self.broker, self.config, self.order_tracker)
-        
-        logger.info(f"Starting backtest loop with {len(data_df)} days/ticks...")
-        
-        skip_first_day = True
-        
-        for idx, row in data_df.iterrows():
-            # Handle both Zerodha style ('timestamp', 'close') and CSV style ('Date', 'Close')
-            current_time = row['timestamp'] if 'timestamp' in row else row.name
-            
-            # Update driver state only once for instrument download etc
-            self.driver.set_current_time(current_time)
-            
-            # Handle Rolling Expiry for CSV
-            if self.csv_provider:
-                chain = self.driver.get_option_chain("NIFTY", current_time)
-                if chain and not chain['CE'].empty:
-                    first_synth = chain['CE'].iloc[0]['synth_symbol']
-                    match = re.match(r"(NIFTY\d{2}[A-Z]{3})", first_synth)
-                    if match:
-                        new_prefix = match.group(1)
-                        if new_prefix != self.strategy.symbol_initials:
-                            logger.info(f"Rolling contract prefix: {self.strategy.symbol_initials} -> {new_prefix}")
-                            self.strategy.symbol_initials = new_prefix
-                            self.strategy.refresh_instruments()
-                
-                self.driver.download_instruments()
-            
-            if skip_first_day:
-                # Use first day only for setting price and initial state
-                day_price = row['Close'] if 'Close' in row else row['close']
-                self.driver.set_price(self.config['index_symbol'], day_price)
-                skip_first_day = False
-                logger.info(f"Initialized metrics on {current_time} (Price: {day_price}). Trading starts next tick.")
-                continue
+        self.strategy = self._new_strategy()
+
+    def _new_strategy(self):
+        """Build the strategy and run its start hook (instruments, reference levels) as start() would."""
+        strategy = self.strategy_class(self.broker, self.config, self.order_tracker)
+        if hasattr(strategy, 'on_start'):
+            strategy.on_start()
+        return strategy
+
+    def _roll_contract(self, current_time):
+        """Switch the strategy to the near-month prefix of the CSV chain on `current_time`."""
+        chain = self.driver.get_option_chain("NIFTY", current_time)
+        if chain and not chain['CE'].empty:
+            first_synth = chain['CE'].iloc[0]['synth_symbol']
+            match = re.match(r"(NIFTY\d{2}[A-Z]{3})", first_synth)
+            if match:
+                new_prefix = match.group(1)
+                if new_prefix != self.strategy.symbol_initials:
+                    logger.info(f"Rolling contract prefix: {self.strategy.symbol_initials} -> {new_prefix}")
+                    self.strategy.symbol_initials = new_prefix
+                    self.strategy.refresh_instruments()
+
+        self.driver.download_instruments()
+
+    def run(self, data_df: pd.DataFrame, fast: bool = False, save: bool = True):
+        if data_df.empty:
+            logger.error("Cannot run backtest with empty data.")
+            return
+
+        if fast:
+            return self.run_fast(data_df, save=save)
+
+        self._prepare_run(data_df)
+        self._open_writer()
+
+        try:
+            logger.info(f"Starting backtest loop with {len(data_df)} days/ticks...")
+
+            skip_first_day = True
+            current_day = None
+            day_marks: Dict[str, float] = {}
+
+            for idx, row in data_df.iterrows():
+                # Handle both Zerodha style ('timestamp', 'close') and CSV style ('Date', 'Close')
+                current_time = row['timestamp'] if 'timestamp' in row else row.name
+
+                # Update driver state only once for instrument download etc
+                self.driver.set_current_time(current_time)
+                if current_time.date() != current_day:
+                    current_day = current_time.date()
+                    day_marks = {}
+
+                # Handle Rolling Expiry for CSV
+                if self.csv_provider:
+                    self._roll_contract(current_time)
+
+                if skip_first_day:
+                    # Use first day only for setting price and initial state
+                    day_price = row['Close'] if 'Close' in row else row['close']
+                    self.driver.set_price(self.config['index_symbol'], day_price)
+                    skip_first_day = False
+                    logger.info(f"Initialized metrics on {current_time} (Price: {day_price}). Trading starts next tick.")
+                    self._record_bar(current_time)
+                    continue
+
+                # Simulated ticks: Open, High, Low, Close
+                prices = [row['Open'], row['High'], row['Low'], row['Close']] if 'Open' in row else [row['close']]
+
+                for price in prices:
+                    self.driver.set_price(self.config['index_symbol'], price)
+
+                    # Update P&L for all open positions by refreshing their prices
+                    if self.driver.positions:
+                        self._mark_positions(current_time, day_marks)
+
+                    # Trade limit check
+                    date_str = current_time.date().isoformat()
+                    trades_today = self.daily_trade_count.get(date_str, 0)
+
+                    # Simulate Tick Update
+                    tick = {'last_price': price, 'ltp': price, 'timestamp': current_time}
+
+                    # Capture trades made during this step
+                    pre_trade_count = self.driver.trade_count
+
+                    if trades_today < self.max_trades_per_day:
+                        self.strategy.on_ticks_update(tick)
+
+                    post_trade_count = self.driver.trade_count
+                    if post_trade_count > pre_trade_count:
+                        new_trades = post_trade_count - pre_trade_count
+                        self.daily_trade_count[date_str] = trades_today + new_trades
+                        logger.info(f"Executed {new_trades} trades at {current_time} - Price: {price}")
+
+                self._record_bar(current_time)
+        finally:
+            # Also when the loop raises, so the streamed files are flushed and closed
+            self._close_writer()
+
+        self._finish_run(save)
+
+    def run_fast(self, data_df: pd.DataFrame, save: bool = True):
+        """
+        Array-backed variant of run(): timestamps and OHLC are pulled into NumPy up front,
+        contract rolling / instrument refresh happen once per trading day instead of once
+        per row, and held option marks are fetched once per symbol per day.
+        """
+        if data_df.empty:
+            logger.error("Cannot run backtest with empty data.")
+            return
+
+        self._prepare_run(data_df)
+        self._open_writer()
+
+        timestamps = pd.DatetimeIndex(data_df['timestamp'] if 'timestamp' in data_df.columns else data_df.index)
+        if 'Open' in data_df.columns:
+            prices = data_df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)
+        else:
+            close_col = 'close' if 'close' in data_df.columns else 'Close'
+            prices = data_df[[close_col]].to_numpy(dtype=np.float64)
+        days = timestamps.normalize().asi8
+        times = timestamps.to_pydatetime()
+
+        index_symbol = self.config['index_symbol']
+        driver = self.driver
+        strategy = self.strategy
+
+        logger.info(f"Starting array backtest loop with {len(prices)} days/ticks...")
+
+        current_day = None
+        date_str = None
+        day_marks: Dict[str, float] = {}
+
+        try:
+            for i in range(len(prices)):
+                current_time = times[i]
+                driver.set_current_time(current_time)
+
+                if days[i] != current_day:
+                    current_day = days[i]
+                    date_str = current_time.date().isoformat()
+                    day_marks = {}
+                    if self.csv_provider:
+                        self._roll_contract(current_time)
+
+                if i == 0:
+                    # Use first bar only for setting price and initial state
+                    day_price = prices[0, -1]
+                    driver.set_price(index_symbol, day_price)
+                    logger.info(f"Initialized metrics on {current_time} (Price: {day_price}). Trading starts next tick.")
+                    self._record_bar(current_time)
+                    continue
+
+                for price in prices[i].tolist():
+                    driver.set_price(index_symbol, price)
+                    if driver.positions:
+                        self._mark_positions(current_time, day_marks)
+
+                    trades_today = self.daily_trade_count.get(date_str, 0)
+                    if trades_today >= self.max_trades_per_day:
+                        continue
+
+                    pre_trade_count = driver.trade_count
+                    strategy.on_ticks_update({'last_price': price, 'ltp': price, 'timestamp': current_time})
+
+                    new_trades = driver.trade_count - pre_trade_count
+                    if new_trades:
+                        self.daily_trade_count[date_str] = trades_today + new_trades
+                        logger.info(f"Executed {new_trades} trades at {current_time} - Price: {price}")
+
+                self._record_bar(current_time)
+        finally:
+            # Also when the loop raises, so the streamed files are flushed and closed
+            self._close_writer()
+
+        self._finish_run(save)
+
+    def run_replay(self, provider, save: bool = True):
+        """
+        Replay intraday index and option prices from a TickReplayProvider in timestamp
+        order. Option events update the driver's prices; each index event is one tick
+        for the strategy.
+        """
+        self.driver.set_csv_provider(provider)
+        self.csv_provider = provider
+        index_symbol = self.config['index_symbol']
+        driver = self.driver
+        self._open_writer()
+
+        logger.info(f"Starting tick replay from {provider.index_file} and {len(provider.option_files)} option files...")
+
+        current_ns = None
+        current_time = None
+        current_day = None
+        date_str = None
+        events = 0
+
+        try:
+            for ts_ns, _, symbol, price in provider.events():
+                events += 1
+                if ts_ns != current_ns:
+                    current_ns = ts_ns
+                    current_time = pd.Timestamp(ts_ns).to_pydatetime()
+                    driver.set_current_time(current_time)
+
+                if symbol != index_symbol:
+                    driver.set_price(symbol, price)
+                    continue
+
+                driver.set_price(index_symbol, price)
+
+                if self.strategy is None:
+                    # First index tick only seeds state; trading starts on the next one
+                    driver.download_instruments()
+                    prefix = provider.near_prefix(current_time)
+                    if prefix:
+                        self.config['symbol_initials'] = prefix
+                    self.strategy = self._new_strategy()
+                    current_day = current_time.date()
+                    date_str = current_day.isoformat()
+                    logger.info(f"Initialized metrics on {current_time} (Price: {price}). Trading starts next tick.")
+                    self._record_bar(current_time)
+                    continue
+
+                if current_time.date() != current_day:
+                    current_day = current_time.date()
+                    date_str = current_day.isoformat()
+                    self._roll_contract(current_time)
 
-            # Simulated ticks: Open, High, Low, Close
-            prices = [row['Open'], row['High'], row['Low'], row['Close']] if 'Open' in row else [row['close']]
-            
-            for price in prices:
-                self.driver.set_price(self.config['index_symbol'], price)
-                
-                # Update P&L for all open positions by refreshing their prices
-                open_symbols = list(self.driver.positions.keys())
-                for symbol in open_symbols:
-                    if symbol != self.config['index_symbol']:
-                        quote = self.driver.get_quote(symbol)
-                        if quote and quote.last_price:
-                            self.driver.set_price(symbol, quote.last_price)
-                
-                # Trade limit check
-                date_str = current_time.date().isoformat()
                 trades_today = self.daily_trade_count.get(date_str, 0)
-                
-                # Simulate Tick Update
-                tick = {'last_price': price, 'ltp': price, 'timestamp': current_time}
-                
-                # Capture trades made during this step
-                pre_trade_count = len(self.driver.trades)
-                
                 if trades_today < self.max_trades_per_day:
-                    self.strategy.on_ticks_update(tick)
-                
-                post_trade_count = len(self.driver.trades)
-                if post_trade_count > pre_trade_count:
-                    new_trades = post_trade_count - pre_trade_count
-                    self.daily_trade_count[date_str] = trades_today + new_trades
-                    logger.info(f"Executed {new_trades} trades at {current_time} - Price: {price}")
+                    pre_trade_count = driver.trade_count
+                    self.strategy.on_ticks_update({'last_price': price, 'ltp': price, 'timestamp': current_time})
+
+                    new_trades = driver.trade_count - pre_trade_count
+                    if new_trades:
+                        self.daily_trade_count[date_str] = trades_today + new_trades
+                        logger.info(f"Executed {new_trades} trades at {current_time} - Price: {price}")
+
+                self._record_bar(current_time)
+        finally:
+            # Also when the loop raises, so the streamed files are flushed and closed
+            self._close_writer()
+
+        if self.strategy is None:
+            logger.error("Cannot run backtest: replay produced no index ticks.")
+            return
+
+        logger.info(f"Replayed {events} events")
+        self._finish_run(save)
+
+    def _open_writer(self):
+        if not self.stream_results:
+            return
+        self.writer = BacktestWriter(self.output_dir)
+        self.driver.keep_history = False
+        self.driver.add_fill_listener(self.writer.record_fill)
 
+    def _record_bar(self, current_time):
+        funds = self.driver.get_funds()
+        if self.writer is not None:
+            self.writer.record_equity(current_time, funds)
+            return
+        self._curve_ts.append(pd.Timestamp(current_time).value)
+        self._curve_equity.append(funds.equity)
+        self._curve_margin.append(funds.used_margin)
+
+    def _close_writer(self):
+        if self.writer is not None:
+            self.driver.remove_fill_listener(self.writer.record_fill)
+            self.writer.close()
+
+    def _finish_run(self, save: bool):
+        summary = None
+        if self.writer is not None:
+            summary = self.writer.summary()
+            self._close_writer()
         self.results = self.calculate_metrics()
-        self.save_results()
+        if summary:
+            self.results.update(summary)
+        if save:
+            self.save_results()
+
+    def performance_metrics(self) -> Dict[str, Any]:
+        """
+        Sharpe/Sortino, drawdown, hit rate, per-expiry P&L, margin use and turnover, from
+        the streamed files when streaming, else from the in-memory curve and trades.
+        """
+        if self.writer is not None:
+            curve = backtest_metrics.load_equity_jsonl(self.writer.equity_path)
+            trades = backtest_metrics.load_trades_jsonl(self.writer.trades_path)
+        else:
+            curve = {
+                "timestamp": np.array(self._curve_ts, dtype=np.int64),
+                "equity": np.array(self._curve_equity, dtype=np.float64),
+                "used_margin": np.array(self._curve_margin, dtype=np.float64),
+            }
+            trades = backtest_metrics.trades_to_arrays(self.driver.trades)
+        return backtest_metrics.compute_metrics(
+            curve["timestamp"], curve["equity"], curve["used_margin"], trades, self.initial_capital
+        )
+
+    def _mark_positions(self, current_time, day_marks: Dict[str, float]):
+        """
+        Refresh open option positions, looking each symbol up at most once per day.
+        Marks come from the CSV provider: the driver's own quote would only echo the
+        last fill price. Shared by run() and run_fast() so both value the book alike.
+        """
+        index_symbol = self.config['index_symbol']
+        marks = {}
+        for symbol in self.driver.positions:
+            if symbol == index_symbol:
+                continue
+            price = day_marks.get(symbol)
+            if price is None:
+                if self.csv_provider:
+                    price = self.csv_provider.get_option_price(symbol, current_time)
+                else:
+                    price = self.driver.get_quote(symbol).last_price
+                day_marks[symbol] = price
+            if price:
+                marks[symbol] = price
+        if marks:
+            self.driver.set_prices(marks)
 
     def calculate_metrics(self) -> Dict[str, Any]:
         funds = self.driver.get_funds()
         total_pnl = funds.equity - self.initial_capital
-        total_trades = len(self.driver.trades)
+        total_trades = self.driver.trade_count
         
-        return {
+        results = {
             "initial_capital": self.initial_capital,
             "final_equity": funds.equity,
             "total_pnl": total_pnl,
             "total_pnl_percent": (total_pnl / self.initial_capital) * 100,
             "total_trades": total_trades,
-            "trades": self.driver.trades
+            "metrics": self.performance_metrics(),
         }
+        # When streaming, fills live in trades.jsonl rather than in memory
+        if self.driver.keep_history:
+            results["trades"] = self.driver.trades
+        return results
 
     def save_results(self):
-        output_dir = "backtest_results"
+        output_dir = self.output_dir
         os.makedirs(output_dir, exist_ok=True)
         
         with open(os.path.join(output_dir, "results.json"), "w") as f:
@@ -202,60 +529,51 @@ if __name__ == "__main__":
     parser.add_argument("--csv-path", type=str, default=r"C:\Users\Rahul Sharma\Documents\Downloads", help="Path to CSV files")
     
     parser.add_argument("--force-trades", action="store_true", help="Force trades by reducing gaps to 1")
+    parser.add_argument("--fast", action="store_true", help="Use the array-backed event loop instead of iterrows")
+    parser.add_argument("--replay-index", type=str, default=None, help="Minute/tick index CSV to replay instead of daily bars")
+    parser.add_argument("--replay-options", type=str, nargs="+", default=[], help="Minute/tick option CSVs for --replay-index")
+    parser.add_argument("--stream", action="store_true", help="Stream fills and the equity curve to JSONL during the run")
+    parser.add_argument("--replay-chunksize", type=int, default=200_000, help="Rows read per chunk while replaying")
     
     args = parser.parse_args()
     
     # Load strategy configuration
-    config_file = "strategy/configs/survivor.yml"
-    import yaml
-    with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)['default']
+    config = load_survivor_config(force_trades=args.force_trades)
     
-    # Realistic account sizing for ₹1 Lakh capital
-    config['pe_quantity'] = 25  # Force small lot size
-    config['ce_quantity'] = 25
-    config['sell_multiplier_threshold'] = 5  # Allow some scaling but keep it sane
+    engine = BacktestEngine(SurvivorStrategy, config, initial_capital=args.capital, max_trades_per_day=args.max_trades,
+                            stream_results=args.stream)
     
-    # If using CSV, we might need slightly larger gaps than 1 to avoid excessive multiplier triggers
-    if args.force_trades:
-        config['pe_gap'] = 1
-        config['ce_gap'] = 1
-        logger.info("Forcing trades - setting gaps to 1")
+    if args.replay_index:
+        from brokers.integrations.backtest.replay import TickReplayProvider
+        provider = TickReplayProvider(
+            args.replay_index,
+            args.replay_options,
+            config['index_symbol'],
+            chunksize=args.replay_chunksize,
+            start=args.start,
+            end=args.end,
+        )
+        engine.run_replay(provider)
     else:
-        # Default manageable gaps for daily data
-        config['pe_gap'] = 50 
-        config['ce_gap'] = 50
-    
-    engine = BacktestEngine(SurvivorStrategy, config, initial_capital=args.capital, max_trades_per_day=args.max_trades)
-    
-    # Fetch data
-    if args.use_csv:
-        data = engine.load_csv_data(args.csv_path)
-        # Filter by start and end dates
-        start_ts = pd.to_datetime(args.start)
-        end_ts = pd.to_datetime(args.end)
-        data = data[(data.index >= start_ts) & (data.index <= end_ts)]
+        # Fetch data
+        if args.use_csv:
+            data = engine.load_csv_data(args.csv_path)
+            # Filter by start and end dates
+            data = engine.select_csv_window(data, args.start, args.end)
+        else:
+            data = engine.fetch_historical_data(config['index_symbol'], args.start, args.end)
         
-        # Determine symbol_initials from first available chain
         if not data.empty:
-            first_date = data.index[0]
-            chain = engine.csv_provider.get_option_chain(first_date)
-            if chain and not chain['CE'].empty:
-                synth = chain['CE'].iloc[0]['synth_symbol']
-                # synth is like NIFTY26FEB25500CE
-                # Strategy wants prefix NIFTY26FEB
-                match = re.match(r"(NIFTY\d{2}[A-Z]{3})", synth)
-                if match:
-                    config['symbol_initials'] = match.group(1)
-                    logger.info(f"Detected CSV symbol prefix: {config['symbol_initials']}")
-    else:
-        data = engine.fetch_historical_data(config['index_symbol'], args.start, args.end)
+            engine.run(data, fast=args.fast)
     
-    if not data.empty:
-        engine.run(data)
+    if engine.results:
         print("\nBacktest Summary:")
         print(f"Final Equity: {engine.results['final_equity']:.2f}")
         print(f"Total P&L: {engine.results['total_pnl']:.2f} ({engine.results['total_pnl_percent']:.2f}%)")
         print(f"Total Trades: {engine.results['total_trades']}")
+        metrics = engine.results['metrics']
+        print(f"Sharpe: {metrics['sharpe']:.2f}  Sortino: {metrics['sortino']:.2f}")
+        print(f"Max Drawdown: {metrics['max_drawdown']:.2f} ({metrics['max_drawdown_pct']:.2f}%, {metrics['max_drawdown_days']:.1f} days)")
+        print(f"Hit Rate: {metrics['hit_rate'] * 100:.1f}% over {metrics['round_trips']} round trips")
     else:
         print("Data source is empty. Cannot run backtest.")
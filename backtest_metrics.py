@@ -0,0 +1,197 @@
+"""
+Vectorized performance metrics for backtest results.
+
+Everything works on flat NumPy arrays, taken either from an engine's in-memory
+equity curve or from the JSONL files written by BacktestWriter, so it is cheap
+enough to run for every configuration of a parameter sweep.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# NSE cash session: 09:15-15:30
+SESSION_MINUTES = 375
+TRADING_DAYS = 252
+
+_SERIES_RE = re.compile(r"^[A-Z]+?(\d{2}[A-Z]{3})\d+(?:CE|PE)$")
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+
+
+def periods_per_year(timestamps: np.ndarray) -> float:
+    """Annualisation factor inferred from the median bar spacing (ns timestamps)."""
+    if len(timestamps) < 2:
+        return float(TRADING_DAYS)
+    spacing = float(np.median(np.diff(timestamps)))
+    if spacing <= 0:
+        return float(TRADING_DAYS)
+    if spacing >= NS_PER_DAY:
+        return TRADING_DAYS * NS_PER_DAY / spacing
+    return TRADING_DAYS * SESSION_MINUTES * NS_PER_MINUTE / spacing
+
+
+def returns_metrics(equity: np.ndarray, annualization: float) -> Dict[str, float]:
+    if len(equity) < 2:
+        return {"sharpe": 0.0, "sortino": 0.0, "volatility": 0.0}
+    prev = equity[:-1]
+    returns = np.divide(np.diff(equity), prev, out=np.zeros(len(prev)), where=prev != 0)
+    mean = returns.mean()
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    scale = np.sqrt(annualization)
+    return {
+        "sharpe": float(mean / std * scale) if std > 0 else 0.0,
+        "sortino": float(mean / downside * scale) if downside > 0 else 0.0,
+        "volatility": float(std * scale),
+    }
+
+
+def drawdown_metrics(timestamps: np.ndarray, equity: np.ndarray) -> Dict[str, float]:
+    if len(equity) == 0:
+        return {"max_drawdown": 0.0, "max_drawdown_pct": 0.0, "max_drawdown_bars": 0, "max_drawdown_days": 0.0}
+    peak = np.maximum.accumulate(equity)
+    drawdown = peak - equity
+    drawdown_pct = np.divide(drawdown, peak, out=np.zeros(len(peak)), where=peak != 0) * 100
+
+    # Underwater spells run from the last high to the recovery bar (or to the end of the curve)
+    underwater = np.concatenate(([0], (drawdown > 0).astype(np.int8), [0]))
+    edges = np.diff(underwater)
+    highs = np.flatnonzero(edges == 1) - 1
+    ends = np.minimum(np.flatnonzero(edges == -1), len(equity) - 1)
+    bars = ends - highs
+    longest = int(np.argmax(bars)) if len(bars) else 0
+    duration_ns = timestamps[ends[longest]] - timestamps[highs[longest]] if len(bars) else 0
+    return {
+        "max_drawdown": float(drawdown.max()),
+        "max_drawdown_pct": float(drawdown_pct.max()),
+        "max_drawdown_bars": int(bars[longest]) if len(bars) else 0,
+        "max_drawdown_days": float(duration_ns) / NS_PER_DAY,
+    }
+
+
+def trades_to_arrays(trades: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Columnar view of the driver's fill dicts (symbol, signed quantity, price)."""
+    symbols, quantities, prices = [], [], []
+    for t in trades:
+        side = str(t["transaction_type"]).upper()
+        sign = 1 if side.endswith("BUY") else -1
+        symbols.append(t["symbol"])
+        quantities.append(sign * t["quantity"])
+        prices.append(t["price"])
+    return {
+        "symbol": np.asarray(symbols, dtype=object),
+        "quantity": np.asarray(quantities, dtype=np.float64),
+        "price": np.asarray(prices, dtype=np.float64),
+    }
+
+
+def trade_metrics(trades: Dict[str, np.ndarray], initial_capital: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Hit rate and per-expiry P&L over closed round trips, plus turnover.
+
+    A round trip is the run of fills in one symbol from flat back to flat; fills
+    after the last return to flat count as still open.
+    """
+    n = len(trades["symbol"])
+    empty = {
+        "round_trips": 0, "open_trips": 0, "hit_rate": 0.0, "avg_win": 0.0, "avg_loss": 0.0,
+        "profit_factor": 0.0, "realized_pnl": 0.0, "turnover": 0.0, "turnover_ratio": 0.0,
+        "pnl_by_expiry": {},
+    }
+    if n == 0:
+        return empty
+
+    names, codes = np.unique(trades["symbol"].astype(str), return_inverse=True)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    qty = trades["quantity"][order]
+    price = trades["price"][order]
+    cash = -qty * price
+
+    # Position after each fill, per symbol (cumsum restarted at each symbol boundary)
+    running = np.cumsum(qty)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    offsets = np.repeat(np.r_[0.0, running[starts[1:] - 1]], np.diff(np.r_[starts, n]))
+    position = running - offsets
+
+    closes = np.isclose(position, 0.0)
+    last_in_symbol = np.r_[codes[1:] != codes[:-1], True]
+    boundary = closes | last_in_symbol
+    trip = np.cumsum(boundary) - boundary
+    trip_count = int(boundary.sum())
+    trip_pnl = np.bincount(trip, weights=cash, minlength=trip_count)
+    trip_closed = np.bincount(trip, weights=closes.astype(np.float64), minlength=trip_count) > 0
+    trip_symbol = codes[boundary]
+
+    closed_pnl = trip_pnl[trip_closed]
+    wins = closed_pnl[closed_pnl > 0]
+    losses = closed_pnl[closed_pnl < 0]
+
+    series = np.array([(m.group(1) if (m := _SERIES_RE.match(s)) else "UNKNOWN") for s in names], dtype=object)
+    expiry_names, expiry_codes = np.unique(series[trip_symbol[trip_closed]].astype(str), return_inverse=True)
+    by_expiry = np.bincount(expiry_codes, weights=closed_pnl, minlength=len(expiry_names))
+
+    turnover = float(np.abs(qty * price).sum())
+    return {
+        "round_trips": int(trip_closed.sum()),
+        "open_trips": int((~trip_closed).sum()),
+        "hit_rate": float(len(wins) / len(closed_pnl)) if len(closed_pnl) else 0.0,
+        "avg_win": float(wins.mean()) if len(wins) else 0.0,
+        "avg_loss": float(losses.mean()) if len(losses) else 0.0,
+        "profit_factor": float(wins.sum() / -losses.sum()) if len(losses) else 0.0,
+        "realized_pnl": float(closed_pnl.sum()),
+        "turnover": turnover,
+        "turnover_ratio": turnover / initial_capital if initial_capital else 0.0,
+        "pnl_by_expiry": {name: float(v) for name, v in zip(expiry_names.tolist(), by_expiry.tolist())},
+    }
+
+
+def compute_metrics(
+    timestamps: np.ndarray,
+    equity: np.ndarray,
+    used_margin: Optional[np.ndarray] = None,
+    trades: Optional[Dict[str, np.ndarray]] = None,
+    initial_capital: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    All metrics for one run. `timestamps` are int64 ns, one per equity point.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    equity = np.asarray(equity, dtype=np.float64)
+    metrics: Dict[str, Any] = {"bars": int(len(equity))}
+    metrics.update(returns_metrics(equity, periods_per_year(timestamps)))
+    metrics.update(drawdown_metrics(timestamps, equity))
+
+    if used_margin is not None and len(equity):
+        util = np.divide(np.asarray(used_margin, dtype=np.float64), equity, out=np.zeros(len(equity)), where=equity > 0)
+        metrics["margin_utilization_avg"] = float(util.mean())
+        metrics["margin_utilization_max"] = float(util.max())
+
+    metrics.update(trade_metrics(trades if trades is not None else trades_to_arrays([]), initial_capital))
+    return metrics
+
+
+def load_equity_jsonl(path: str) -> Dict[str, np.ndarray]:
+    """Equity curve arrays from a BacktestWriter equity.jsonl."""
+    import pandas as pd
+
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    if not rows:
+        return {"timestamp": np.zeros(0, dtype=np.int64), "equity": np.zeros(0), "used_margin": np.zeros(0)}
+    timestamps = pd.to_datetime([r["timestamp"] for r in rows]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return {
+        "timestamp": timestamps,
+        "equity": np.fromiter((r["equity"] for r in rows), dtype=np.float64, count=len(rows)),
+        "used_margin": np.fromiter((r["used_margin"] for r in rows), dtype=np.float64, count=len(rows)),
+    }
+
+
+def load_trades_jsonl(path: str) -> Dict[str, np.ndarray]:
+    """Trade arrays from a BacktestWriter trades.jsonl."""
+    with open(path, "r", encoding="utf-8") as f:
+        return trades_to_arrays(json.loads(line) for line in f)
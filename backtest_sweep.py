@@ -0,0 +1,233 @@
+"""
+Parallel parameter sweep for the Survivor backtest.
+
+Runs a grid (or a random sample of a grid) over survivor.yml keys across a
+ProcessPoolExecutor and writes one comparison table. Market data is loaded once
+by the parent and published to shared memory; workers attach to that single
+read-only copy instead of each holding their own.
+
+Example:
+    python backtest_sweep.py --start 2026-01-22 --end 2026-02-20 --csv-path ./downloads \\
+        --param pe_gap=20,30,50 --param ce_gap=20:60:10 --param sell_multiplier_threshold=3,5
+"""
+
+import os
+import argparse
+import itertools
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from backtest_engine import BacktestEngine, load_survivor_config
+from logger import logger
+
+# survivor.yml keys that a sweep may vary
+SWEEPABLE_KEYS = (
+    'pe_gap', 'ce_gap',
+    'pe_symbol_gap', 'ce_symbol_gap',
+    'pe_quantity', 'ce_quantity',
+    'pe_reset_gap', 'ce_reset_gap',
+    'min_price_to_sell',
+    'sell_multiplier_threshold',
+)
+
+SUMMARY_KEYS = ('final_equity', 'total_pnl', 'total_pnl_percent', 'total_trades')
+METRIC_KEYS = ('sharpe', 'sortino', 'max_drawdown', 'max_drawdown_pct', 'max_drawdown_days',
+               'hit_rate', 'profit_factor', 'margin_utilization_max', 'turnover_ratio')
+
+RESULT_COLUMNS = list(SUMMARY_KEYS) + list(METRIC_KEYS) + ['elapsed_s', 'error']
+
+
+def parse_param(spec: str) -> tuple:
+    """
+    Parse ``key=v1,v2,v3`` or ``key=start:stop:step`` (stop inclusive) into (key, values).
+    """
+    if '=' not in spec:
+        raise argparse.ArgumentTypeError(f"Expected key=values, got {spec!r}")
+    key, raw = spec.split('=', 1)
+    key = key.strip()
+    if key not in SWEEPABLE_KEYS:
+        raise argparse.ArgumentTypeError(f"{key!r} is not sweepable; choose from {', '.join(SWEEPABLE_KEYS)}")
+
+    if ':' in raw:
+        parts = [_number(p) for p in raw.split(':')]
+        if len(parts) != 3 or parts[2] <= 0:
+            raise argparse.ArgumentTypeError(f"Range for {key} must be start:stop:step with step > 0")
+        start, stop, step = parts
+        values = []
+        value = start
+        while value <= stop:
+            values.append(value)
+            value += step
+    else:
+        values = [_number(p) for p in raw.split(',') if p.strip()]
+
+    if not values:
+        raise argparse.ArgumentTypeError(f"No values given for {key}")
+    return key, values
+
+
+def _number(text: str):
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def build_grid(params: Dict[str, List[Any]], samples: Optional[int] = None, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of `params`; with `samples`, a random subset of that many combinations.
+    """
+    keys = list(params)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(params[k] for k in keys))]
+    if samples is not None and samples < len(combos):
+        combos = random.Random(seed).sample(combos, samples)
+    return combos
+
+
+# Per-process state, populated by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(handle, start: str, end: str, base_config: Dict[str, Any], verbose: bool):
+    from brokers.integrations.backtest.shared import attach_provider
+
+    if not verbose:
+        logger.setLevel(logging.WARNING)
+        logging.getLogger("brokers").setLevel(logging.WARNING)
+
+    # Attach once per worker; every run in this process reuses the shared views
+    _worker['provider'] = attach_provider(handle)
+    _worker['start'] = start
+    _worker['end'] = end
+    _worker['base_config'] = base_config
+
+
+def _run_one(run_id: int, overrides: Dict[str, Any], initial_capital: float, max_trades_per_day: int) -> Dict[str, Any]:
+    from strategy.survivor import SurvivorStrategy
+
+    row: Dict[str, Any] = {'run_id': run_id, **overrides}
+    started = time.perf_counter()
+    try:
+        config = dict(_worker['base_config'])
+        config.update(overrides)
+        engine = BacktestEngine(SurvivorStrategy, config, initial_capital=initial_capital,
+                                max_trades_per_day=max_trades_per_day)
+        data = engine.use_csv_provider(_worker['provider'])
+        data = engine.select_csv_window(data, _worker['start'], _worker['end'])
+        if data.empty:
+            raise ValueError("No data in the selected window")
+        engine.run(data, fast=True, save=False)
+        results = engine.results
+        row.update({k: results[k] for k in SUMMARY_KEYS})
+        row.update({k: results['metrics'].get(k) for k in METRIC_KEYS})
+        row['error'] = None
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['elapsed_s'] = round(time.perf_counter() - started, 3)
+    return row
+
+
+def run_sweep(
+    grid: List[Dict[str, Any]],
+    csv_path: str,
+    start: str,
+    end: str,
+    base_config: Dict[str, Any],
+    initial_capital: float = 100000.0,
+    max_trades_per_day: int = 5,
+    workers: Optional[int] = None,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """
+    Run every override set in `grid` and return one row per run, best P&L first.
+    """
+    from brokers.integrations.backtest.csv_provider import CSVDataProvider
+    from brokers.integrations.backtest.shared import SharedMarketData
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Running {len(grid)} backtests on {workers} workers")
+
+    rows = []
+    with SharedMarketData.publish(CSVDataProvider(csv_path)) as shared, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(shared.handle, start, end, base_config, verbose),
+    ) as pool:
+        futures = [
+            pool.submit(_run_one, run_id, overrides, initial_capital, max_trades_per_day)
+            for run_id, overrides in enumerate(grid)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            if row['error']:
+                logger.error(f"[{done}/{len(grid)}] run {row['run_id']} failed: {row['error']}")
+            else:
+                logger.info(f"[{done}/{len(grid)}] run {row['run_id']} P&L {row['total_pnl']:.2f}")
+
+    table = pd.DataFrame(rows)
+    for column in RESULT_COLUMNS:
+        if column not in table.columns:
+            table[column] = None
+    return table.sort_values('total_pnl', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def exit_code(table: pd.DataFrame) -> int:
+    """
+    Process exit status for a finished sweep: 1 if no run produced a result, else 0.
+    """
+    failed = table['error'].notna()
+    if not failed.any():
+        return 0
+    first = table.loc[failed].sort_values('run_id').iloc[0]
+    if failed.all():
+        logger.error(f"All {len(table)} runs failed; run {first['run_id']}: {first['error']}")
+        return 1
+    logger.error(f"{int(failed.sum())} of {len(table)} runs failed; run {first['run_id']}: {first['error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Survivor Strategy Parameter Sweep")
+    parser.add_argument("--start", type=str, required=True, help="Start date YYYY-MM-DD")
+    parser.add_argument("--end", type=str, required=True, help="End date YYYY-MM-DD")
+    parser.add_argument("--capital", type=float, default=100000.0)
+    parser.add_argument("--max-trades", type=int, default=5)
+    parser.add_argument("--csv-path", type=str, default=r"C:\Users\Rahul Sharma\Documents\Downloads", help="Path to CSV files")
+    parser.add_argument("--param", type=parse_param, action="append", required=True,
+                        help="Sweep values as key=v1,v2 or key=start:stop:step (repeatable)")
+    parser.add_argument("--samples", type=int, default=None, help="Random search: run this many combinations from the grid")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --samples")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", type=str, default=os.path.join("backtest_results", "sweep_results.csv"))
+    parser.add_argument("--top", type=int, default=10, help="Rows of the comparison table to print")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logging inside workers")
+
+    args = parser.parse_args()
+
+    grid = build_grid(dict(args.param), samples=args.samples, seed=args.seed)
+    table = run_sweep(
+        grid,
+        csv_path=args.csv_path,
+        start=args.start,
+        end=args.end,
+        base_config=load_survivor_config(),
+        initial_capital=args.capital,
+        max_trades_per_day=args.max_trades,
+        workers=args.workers,
+        verbose=args.verbose,
+    )
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    table.to_csv(args.output, index=False)
+
+    print(f"\nSweep Summary ({len(table)} runs, saved to {args.output}):")
+    print(table.head(args.top).to_string(index=False))
+    sys.exit(exit_code(table))
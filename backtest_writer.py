@@ -0,0 +1,130 @@
+import os
+import json
+from typing import Any, Dict, List, Optional
+
+from logger import logger
+
+TRADES_FILE = "trades.jsonl"
+EQUITY_FILE = "equity.jsonl"
+
+
+class _JsonlBuffer:
+    """Append-only JSON Lines file that writes in batches of `buffer_size` rows."""
+
+    def __init__(self, path: str, buffer_size: int):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.rows = 0
+        self._buffer: List[str] = []
+        self._file = open(path, "w", encoding="utf-8")
+
+    def append(self, row: Dict[str, Any]):
+        self._buffer.append(json.dumps(row, default=str))
+        self.rows += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class BacktestWriter:
+    """
+    Streams fills and per-bar equity/drawdown snapshots to JSONL files during a run,
+    so memory stays flat however long the backtest is.
+
+    trades.jsonl  one row per fill (the driver's order dict)
+    equity.jsonl  one row per bar: timestamp, equity, cash, used_margin, peak, drawdown, drawdown_pct
+    """
+
+    def __init__(self, output_dir: str = "backtest_results", buffer_size: int = 1000):
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.trades_path = os.path.join(output_dir, TRADES_FILE)
+        self.equity_path = os.path.join(output_dir, EQUITY_FILE)
+        self._trades = _JsonlBuffer(self.trades_path, buffer_size)
+        self._equity = _JsonlBuffer(self.equity_path, buffer_size)
+        self.peak: Optional[float] = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+
+    def record_fill(self, order: Dict[str, Any]):
+        self._trades.append(order)
+
+    def record_equity(self, timestamp, funds):
+        equity = funds.equity
+        if self.peak is None or equity > self.peak:
+            self.peak = equity
+        drawdown = self.peak - equity
+        drawdown_pct = (drawdown / self.peak) * 100 if self.peak else 0.0
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+        self.max_drawdown_pct = max(self.max_drawdown_pct, drawdown_pct)
+        self._equity.append({
+            "timestamp": timestamp,
+            "equity": equity,
+            "cash": funds.available_cash,
+            "used_margin": funds.used_margin,
+            "peak": self.peak,
+            "drawdown": drawdown,
+            "drawdown_pct": drawdown_pct,
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "trades_file": self.trades_path,
+            "equity_file": self.equity_path,
+            "fills_written": self._trades.rows,
+            "equity_points": self._equity.rows,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_pct": self.max_drawdown_pct,
+        }
+
+    @property
+    def closed(self) -> bool:
+        return self._equity._file.closed
+
+    def flush(self):
+        self._trades.flush()
+        self._equity.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self._trades.close()
+        self._equity.close()
+        logger.info(f"Streamed {self._trades.rows} fills and {self._equity.rows} equity points to {self.output_dir}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_jsonl(path: str, every: int = 1, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Read a JSONL file written by BacktestWriter, keeping every `every`-th row (up to `limit`).
+    A last line without its newline is still being written by a live run and is skipped.
+    """
+    rows: List[Dict[str, Any]] = []
+    if not os.path.exists(path):
+        return rows
+    every = max(1, every)
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if not line.endswith("\n"):
+                break
+            if i % every:
+                continue
+            rows.append(json.loads(line))
+            if limit is not None and len(rows) >= limit:
+                break
+    return rows
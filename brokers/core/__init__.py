@@ -21,6 +21,7 @@ from .errors import (
     HTTPError,
 )
 from .interface import BrokerDriver
+from .async_interface import AsyncBrokerDriver, SyncDriverAdapter, as_async
 from .gateway import BrokerGateway
 
 __all__ = [
@@ -49,6 +50,9 @@ __all__ = [
     "HTTPError",
     # Interface / Facade
     "BrokerDriver",
+    "AsyncBrokerDriver",
+    "SyncDriverAdapter",
+    "as_async",
     "BrokerGateway",
 ]
 
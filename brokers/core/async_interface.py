@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .schemas import BrokerCapabilities, Funds, OrderRequest, OrderResponse, Position, Quote
+
+# Worker threads per adapted sync driver; bounds concurrent blocking broker calls
+DEFAULT_ASYNC_WORKERS = int(os.getenv("BROKERS_ASYNC_WORKERS", "8") or 8)
+
+
+def _thread_safe(driver: Any) -> bool:
+    """Whether `driver` (possibly behind a gateway/risk controller) may be called from several threads."""
+    try:
+        return bool(driver.get_capabilities().supports_concurrent_orders)
+    except Exception:  # noqa: BLE001 - unknown shape, assume not
+        return False
+
+
+class AsyncBrokerDriver(ABC):
+    """Awaitable counterpart of BrokerDriver, for use from asyncio code."""
+
+    def __init__(self) -> None:
+        self.capabilities: BrokerCapabilities = BrokerCapabilities()
+
+    def get_capabilities(self) -> BrokerCapabilities:
+        return self.capabilities
+
+    # --- Account ---
+    @abstractmethod
+    async def get_funds(self) -> Funds:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_positions(self) -> List[Position]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    # --- Orders ---
+    @abstractmethod
+    async def place_order(self, request: OrderRequest) -> OrderResponse:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str) -> OrderResponse:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    @abstractmethod
+    async def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_orderbook(self) -> List[Dict[str, Any]]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_tradebook(self) -> List[Dict[str, Any]]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    # --- Market data ---
+    @abstractmethod
+    async def get_quote(self, symbol: str) -> Quote:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+        quotes = await asyncio.gather(*(self.get_quote(s) for s in symbols), return_exceptions=True)
+        return {s: q for s, q in zip(symbols, quotes) if isinstance(q, Quote)}
+
+    @abstractmethod
+    async def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+    # --- Instruments ---
+    async def download_instruments(self, **kwargs: Any) -> None:  # Optional
+        return None
+
+    async def get_instruments(self) -> Any:  # Optional
+        return []
+
+    async def aclose(self) -> None:
+        return None
+
+
+class SyncDriverAdapter(AsyncBrokerDriver):
+    """
+    AsyncBrokerDriver over an existing synchronous driver (or anything shaped like
+    one, e.g. the risk controller): every call runs on a bounded thread pool, so a
+    slow REST round-trip never blocks the event loop. Calls overlap only if the
+    driver declares itself thread-safe (``supports_concurrent_orders``); for any
+    other driver (e.g. the paper/backtest drivers) they take a per-driver lock and
+    run one at a time.
+
+    This is currently the only way to get an AsyncBrokerDriver; no broker has a
+    native async implementation yet.
+
+    Methods without an explicit wrapper are still reachable: ``await adapter.foo(...)``
+    runs ``driver.foo(...)`` on the pool.
+    """
+
+    def __init__(self, driver: Any, max_workers: int = DEFAULT_ASYNC_WORKERS) -> None:
+        super().__init__()
+        self.driver = driver
+        self.capabilities = getattr(driver, "capabilities", self.capabilities)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="broker-io")
+        self._serial: Optional[threading.Lock] = None if _thread_safe(driver) else threading.Lock()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run any blocking callable on this adapter's pool."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if self._serial is not None:
+            call = functools.partial(self._locked, call)
+        return await loop.run_in_executor(self._executor, call)
+
+    def _locked(self, call: Callable[[], Any]) -> Any:
+        with self._serial:
+            return call()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.driver, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(attr, *args, **kwargs)
+
+        return call
+
+    async def get_funds(self) -> Funds:
+        return await self.run(self.driver.get_funds)
+
+    async def get_positions(self) -> List[Position]:
+        return await self.run(self.driver.get_positions)
+
+    async def place_order(self, request: OrderRequest) -> OrderResponse:
+        return await self.run(self.driver.place_order, request)
+
+    async def cancel_order(self, order_id: str) -> OrderResponse:
+        return await self.run(self.driver.cancel_order, order_id)
+
+    async def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
+        return await self.run(self.driver.modify_order, order_id, updates)
+
+    async def get_orderbook(self) -> List[Dict[str, Any]]:
+        return await self.run(self.driver.get_orderbook)
+
+    async def get_tradebook(self) -> List[Dict[str, Any]]:
+        return await self.run(self.driver.get_tradebook)
+
+    async def get_quote(self, symbol: str) -> Quote:
+        return await self.run(self.driver.get_quote, symbol)
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+        # One batched sync call rather than one pool slot per symbol
+        return await self.run(self.driver.get_quotes, symbols)
+
+    async def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:
+        return await self.run(self.driver.get_history, symbol, interval, start, end)
+
+    async def download_instruments(self, **kwargs: Any) -> None:
+        return await self.run(self.driver.download_instruments, **kwargs)
+
+    async def get_instruments(self) -> Any:
+        return await self.run(self.driver.get_instruments)
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_adapters: "weakref.WeakKeyDictionary[Any, SyncDriverAdapter]" = weakref.WeakKeyDictionary()
+_adapters_lock = threading.Lock()
+
+
+def as_async(driver: Any, max_workers: Optional[int] = None) -> AsyncBrokerDriver:
+    """
+    `driver` itself if it is already async, else the adapter shared by everyone
+    using that driver (so they share one bounded pool and, if needed, one lock).
+    """
+    if isinstance(driver, AsyncBrokerDriver):
+        return driver
+    with _adapters_lock:
+        adapter = _adapters.get(driver)
+        if adapter is None:
+            adapter = SyncDriverAdapter(driver, max_workers or DEFAULT_ASYNC_WORKERS)
+            _adapters[driver] = adapter
+        return adapter
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from datetime import datetime, timedelta
+import logging
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from .errors import MarginUnavailableError, UnsupportedOperationError
 from .interface import BrokerDriver
+from .quotes import QuoteCoalescer, fetch_quotes
+from .ticks import LastValueCache
 from .schemas import (
     BrokerCapabilities,
     Funds,
@@ -17,15 +23,105 @@ from .schemas import (
     Position,
     Quote,
 )
+from ..instruments import InstrumentIndex
 from ..symbols.registry import symbol_registry
 
+logger = logging.getLogger(__name__)
+
+# A few ms is enough for strategies quoting on the same tick to share one REST call
+DEFAULT_QUOTE_COALESCE_MS = 5.0
+
+
+def as_order_response(result: Any, order_id: Optional[str] = None) -> OrderResponse:
+    """
+    Coerce a driver's order/cancel result to an OrderResponse. Besides OrderResponse
+    itself this accepts legacy dicts ({"status": "success" | "ok" | ..., "order_id": ...})
+    and the bare booleans some cancel endpoints return.
+    """
+    if isinstance(result, OrderResponse):
+        return result
+    if isinstance(result, bool):
+        return OrderResponse(status="ok" if result else "error", order_id=order_id)
+    if isinstance(result, dict):
+        status = str(result.get("status") or result.get("s") or "").lower()
+        oid = result.get("order_id", result.get("id"))
+        # -1 is the legacy "no order id" marker
+        oid = str(oid) if oid not in (None, -1, "-1", "") else order_id
+        return OrderResponse(
+            status="ok" if status in ("ok", "success") and oid is not None else "error",
+            order_id=oid,
+            message=result.get("message"),
+            raw=result,
+        )
+    return OrderResponse(status="error", order_id=order_id, message=f"unexpected driver response: {result!r}")
+
+
+def place_leg(driver: Any, request: OrderRequest) -> OrderResponse:
+    """`driver.place_order(request)` as an OrderResponse, with an exception reported as an error response."""
+    try:
+        return as_order_response(driver.place_order(request))
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Placing {request.transaction_type.value} {request.symbol} failed: {e}")
+        return OrderResponse(status="error", order_id=None, message=str(e))
+
+
+def rollback_unpaired(
+    driver: Any, first: OrderResponse, second: OrderResponse
+) -> Tuple[OrderResponse, OrderResponse]:
+    """
+    If exactly one of two paired legs was accepted, cancel it and report it as an
+    error. A leg that cannot be cancelled (e.g. already filled) stays "ok".
+    """
+    if (first.status == "ok") == (second.status == "ok"):
+        return first, second
+    placed, rejected = (first, second) if first.status == "ok" else (second, first)
+    try:
+        cancel = as_order_response(driver.cancel_order(str(placed.order_id)), str(placed.order_id))
+    except Exception as e:  # noqa: BLE001
+        cancel = OrderResponse(status="error", order_id=placed.order_id, message=str(e))
+    if cancel.status != "ok":
+        logger.error(f"Paired leg rejected ({rejected.message}) and rollback of order {placed.order_id} failed: {cancel.message}")
+        return first, second
+    logger.warning(f"Paired leg rejected ({rejected.message}); cancelled order {placed.order_id}")
+    rolled_back = replace(placed, status="error", message=f"rolled back: paired leg rejected ({rejected.message})")
+    return (rolled_back, second) if placed is first else (first, rolled_back)
+
 
 class BrokerGateway:
     """Facade orchestrating symbol normalization and delegation to a driver."""
 
-    def __init__(self, driver: BrokerDriver, broker_name: str) -> None:
+    def __init__(
+        self,
+        driver: BrokerDriver,
+        broker_name: str,
+        quote_coalesce_ms: Optional[float] = None,
+        quote_max_age_ms: Optional[float] = None,
+    ) -> None:
         self.driver = driver
         self.broker_name = broker_name
+        # get_quote serves websocket prices younger than this before going to REST (0 = always REST)
+        if quote_max_age_ms is None:
+            quote_max_age_ms = float(os.getenv("BROKERS_QUOTE_MAX_AGE_MS", "1000") or 0)
+        self.quote_max_age = quote_max_age_ms / 1000.0
+        self.last_values = LastValueCache()
+        self.tick_errors = 0
+        # Concurrent get_quote calls within this window share one batched request (0 = off).
+        # On by default only where the broker has a batched quote endpoint; elsewhere
+        # (paper/backtest, single-quote REST drivers) the wait would be pure latency.
+        if quote_coalesce_ms is None:
+            default = DEFAULT_QUOTE_COALESCE_MS if self.driver.get_capabilities().max_quote_symbols > 0 else 0
+            quote_coalesce_ms = float(os.getenv("BROKERS_QUOTE_COALESCE_MS", str(default)) or 0)
+        # Threads for submitting paired order legs side by side (started on first use)
+        self._order_pool: Optional[ThreadPoolExecutor] = None
+        self._order_pool_lock = threading.Lock()
+        self._quote_coalescer: Optional[QuoteCoalescer] = None
+        if quote_coalesce_ms > 0 and hasattr(self.driver, "get_quotes"):
+            self._quote_coalescer = QuoteCoalescer(
+                self.driver.get_quotes,
+                self.driver.get_quote,
+                window=quote_coalesce_ms / 1000.0,
+                max_batch=self.driver.get_capabilities().max_quote_symbols,
+            )
 
     # --- Construction helpers ---
     @classmethod
@@ -67,13 +163,15 @@ class BrokerGateway:
             return result
 
         # Typed path
+        return self.driver.place_order(self._to_broker_request(request))
+
+    def _to_broker_request(self, request: OrderRequest) -> OrderRequest:
         internal = f"{request.exchange.value}:{request.symbol}"
         broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
-        req2 = replace(
+        return replace(
             request,
             symbol=broker_symbol.split(":", 1)[1] if ":" in broker_symbol else broker_symbol,
         )
-        return self.driver.place_order(req2)
 
     def cancel_order(self, order_id: Union[str, Dict[str, Any]]) -> Union[OrderResponse, Dict[str, Any]]:
         # Back-compat: allow dict {"id": ...}
@@ -99,12 +197,71 @@ class BrokerGateway:
     def get_quote(self, symbol: str) -> Quote:
         internal = symbol_registry.normalize(symbol)
         broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
+        quote = self._cached_quote(broker_symbol)
+        if quote is not None:
+            return quote
+        if self._quote_coalescer is not None:
+            return self._quote_coalescer.get_quote(broker_symbol)
         return self.driver.get_quote(broker_symbol)
 
+    def get_cached_quote(self, symbol: str, max_age: Optional[float] = None) -> Optional[Quote]:
+        """Quote from the tick cache only (no REST call), or None if missing or older than `max_age` seconds."""
+        internal = symbol_registry.normalize(symbol)
+        broker_symbol = symbol_registry.to_broker_symbol(self.broker_name, internal)
+        return self._cached_quote(broker_symbol, max_age)
+
+    def _cached_quote(self, broker_symbol: str, max_age: Optional[float] = None) -> Optional[Quote]:
+        max_age = self.quote_max_age if max_age is None else max_age
+        if max_age <= 0 or ":" not in broker_symbol:
+            return None
+        value = self.last_values.get(broker_symbol, max_age)
+        if value is None:
+            return None
+        exch, tradingsymbol = broker_symbol.split(":", 1)
+        if exch not in Exchange.__members__:
+            return None
+        return Quote(
+            symbol=tradingsymbol.replace("-EQ", ""),  # as the drivers' REST quotes report it
+            exchange=Exchange[exch],
+            last_price=value.price,
+            bid=value.bid,
+            ask=value.ask,
+            timestamp=value.timestamp,
+            raw={"source": "websocket", "sequence": value.sequence},
+        )
+
+    def _record_ticks(self, message: Any) -> None:
+        try:
+            ticks = self.driver.normalize_ticks(message)
+        except Exception:
+            self.tick_errors += 1
+            # Log the first failure in full and then every 1000th, so a broken normalizer is
+            # visible without flooding the log at tick rate
+            if self.tick_errors % 1000 == 1:
+                logger.exception(
+                    f"Could not normalize ticks ({self.tick_errors} failures so far); "
+                    "quotes fall back to REST while this persists"
+                )
+            return
+        for tick in ticks:
+            self.last_values.update(tick["symbol"], tick["price"], tick.get("bid"), tick.get("ask"), tick.get("timestamp"))
+
     def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:
         internal_symbols = [symbol_registry.normalize(s) for s in symbols]
         broker_symbols = [symbol_registry.to_broker_symbol(self.broker_name, s) for s in internal_symbols]
-        return self.driver.get_quotes(broker_symbols)
+        # Symbols with fresh ticks come from the cache; only the rest go to REST
+        quotes: Dict[str, Quote] = {}
+        missing: List[str] = []
+        for s in broker_symbols:
+            cached = self._cached_quote(s)
+            if cached is not None:
+                quotes[s] = cached
+            else:
+                missing.append(s)
+        if missing:
+            limit = self.driver.get_capabilities().max_quote_symbols
+            quotes.update(fetch_quotes(self.driver.get_quotes, missing, limit))
+        return quotes
 
     def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
         """
@@ -171,12 +328,19 @@ class BrokerGateway:
         return self.driver.get_option_chain(underlying, exchange, **kwargs)
 
     # --- Instruments ---
-    def download_instruments(self) -> None:
-        self.driver.download_instruments()
+    def download_instruments(self, **kwargs: Any) -> None:
+        self.driver.download_instruments(**kwargs)
 
     def get_instruments(self) -> List[Instrument]:
         return self.driver.get_instruments()
 
+    @property
+    def share_instruments(self) -> bool:
+        return self.driver.share_instruments
+
+    def get_instrument_index(self) -> InstrumentIndex:
+        return self.driver.get_instrument_index()
+
     # --- Websocket ---
     def connect_websocket(
         self,
@@ -189,9 +353,15 @@ class BrokerGateway:
         on_noreconnect: Any | None = None,
         **kwargs: Any,
     ) -> None:
+        # Every tick refreshes the last-value cache before reaching the caller's callback
+        def _on_ticks(ws: Any, message: Any) -> None:
+            self._record_ticks(message)
+            if callable(on_ticks):
+                on_ticks(ws, message)
+
         # Forward known callbacks and any extra kwargs (e.g., simulate_date for fyrodha)
         self.driver.connect_websocket(
-            on_ticks=on_ticks,
+            on_ticks=_on_ticks,
             on_connect=on_connect,
             on_error=on_error,
             on_close=on_close,
@@ -229,6 +399,8 @@ class BrokerGateway:
     def unsubscribe(self, symbols: List[str]) -> None:
         internal_symbols = [symbol_registry.normalize(s) for s in symbols]
         broker_symbols = [symbol_registry.to_broker_symbol(self.broker_name, s) for s in internal_symbols]
+        for s in broker_symbols:
+            self.last_values.discard(s)
         self.driver.unsubscribe(broker_symbols)
 
     # --- Advanced orders ---
@@ -244,6 +416,53 @@ class BrokerGateway:
     def place_basket_orders(self, requests: List[OrderRequest]) -> List[OrderResponse]:
         return self.driver.place_basket_orders(requests)
 
+    def place_order_pair(
+        self, first: OrderRequest, second: OrderRequest, rollback: bool = True
+    ) -> Tuple[OrderResponse, OrderResponse]:
+        """
+        Submit two legs at once: one basket call where the broker supports it, else
+        both orders concurrently if the driver allows it, else one after the other.
+        With `rollback`, if exactly one leg is rejected the
+        accepted one is cancelled and reported as an error, so callers see both legs
+        or neither. A leg that cannot be cancelled (e.g. already filled) stays "ok".
+        """
+        requests = [self._to_broker_request(first), self._to_broker_request(second)]
+        responses: List[OrderResponse] = []
+        if self._has_basket_orders():
+            try:
+                responses = list(self.driver.place_basket_orders(requests))
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Basket placement failed, placing legs individually: {e}")
+        if any(r.status == "ok" for r in responses) and len(responses) != 2:
+            # Basket accepted something but the result cannot be mapped to legs; never place twice
+            responses = (responses + [OrderResponse(status="error", order_id=None, message="missing basket leg")])[:2]
+        elif len(responses) != 2:
+            if self.driver.get_capabilities().supports_concurrent_orders:
+                futures = [self._legs_pool().submit(place_leg, self.driver, r) for r in requests]
+                # Wait for both legs before judging either, so a failure never strands a live leg
+                responses = [f.result() for f in futures]
+            else:
+                # Stateful drivers (e.g. paper trading) book positions without a lock
+                responses = [place_leg(self.driver, r) for r in requests]
+        first_resp, second_resp = responses
+        if rollback:
+            return rollback_unpaired(self.driver, first_resp, second_resp)
+        return first_resp, second_resp
+
+    def _has_basket_orders(self) -> bool:
+        # Trust the capability flag only if the driver really overrides the base method,
+        # which just raises NotImplementedError
+        if not self.driver.get_capabilities().supports_basket_orders:
+            return False
+        impl = getattr(type(self.driver), "place_basket_orders", None)
+        return impl is not None and impl is not BrokerDriver.place_basket_orders
+
+    def _legs_pool(self) -> ThreadPoolExecutor:
+        with self._order_pool_lock:
+            if self._order_pool is None:
+                self._order_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="order-legs")
+            return self._order_pool
+
     def place_multileg_order(self, *args: Any, **kwargs: Any) -> OrderResponse:
         return self.driver.place_multileg_order(*args, **kwargs)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Iterable, List, Optional
 
+from ..instruments import InstrumentIndex
 from .schemas import (
     BrokerCapabilities,
     OrderRequest,
@@ -17,6 +18,9 @@ from .schemas import (
 class BrokerDriver(ABC):
     """Abstract broker driver interface to be implemented per broker."""
 
+    # Strategies on this driver may share one downloaded master (see instruments.store)
+    share_instruments: bool = True
+
     def __init__(self) -> None:
         self.capabilities: BrokerCapabilities = BrokerCapabilities()
 
@@ -92,6 +96,15 @@ class BrokerDriver(ABC):
     def get_instruments(self) -> List[Instrument]:  # Optional
         return []
 
+    def get_instrument_index(self) -> InstrumentIndex:
+        """Lookup index over `get_instruments()`, rebuilt only when the master is replaced."""
+        instruments = self.get_instruments()
+        index = getattr(self, "_instrument_index", None)
+        if index is None or index.source is not instruments:
+            index = InstrumentIndex(instruments)
+            self._instrument_index = index
+        return index
+
     # --- Option chain ---
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:  # Optional
         raise NotImplementedError
@@ -112,6 +125,13 @@ class BrokerDriver(ABC):
     def symbols_to_subscribe(self, symbols: Iterable[str]) -> None:  # Optional
         return None
 
+    def normalize_ticks(self, message: Any) -> List[Dict[str, Any]]:  # Optional
+        """
+        Flatten one websocket message into ``{"symbol", "price", "bid", "ask", "timestamp"}``
+        dicts keyed by broker symbol, for the gateway's last-value cache.
+        """
+        return []
+
     def connect_order_websocket(
         self,
         *,
@@ -0,0 +1,107 @@
+"""Quote batching helpers used by BrokerGateway.
+
+``fetch_quotes`` splits a symbol list into calls no larger than the broker's
+per-request limit. ``QuoteCoalescer`` merges single-symbol ``get_quote`` calls
+made by concurrent callers within a short window into one batched request and
+hands each waiter its own quote.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .schemas import Quote
+
+logger = logging.getLogger(__name__)
+
+FetchMany = Callable[[List[str]], Dict[str, Quote]]
+FetchOne = Callable[[str], Quote]
+
+
+def fetch_quotes(fetch: FetchMany, symbols: List[str], limit: int = 0) -> Dict[str, Quote]:
+    """`fetch(symbols)` in chunks of at most `limit` symbols (0 = no limit)."""
+    if limit <= 0 or len(symbols) <= limit:
+        return fetch(symbols)
+    result: Dict[str, Quote] = {}
+    for i in range(0, len(symbols), limit):
+        result.update(fetch(symbols[i:i + limit]))
+    return result
+
+
+def match_quote(quotes: Dict[str, Quote], symbol: str) -> Optional[Quote]:
+    """Quote for `symbol` from a batched result, even if the broker re-keyed it (e.g. added -EQ)."""
+    quote = quotes.get(symbol)
+    if quote is not None:
+        return quote
+    for q in quotes.values():
+        if f"{q.exchange.value}:{q.symbol}" == symbol or q.symbol == symbol:
+            return q
+    return None
+
+
+class _Batch:
+    __slots__ = ("symbols", "quotes", "error", "full", "done")
+
+    def __init__(self) -> None:
+        self.symbols: Dict[str, None] = {}
+        self.quotes: Dict[str, Quote] = {}
+        self.error: Optional[BaseException] = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class QuoteCoalescer:
+    """
+    Coalesces single-symbol quote requests made within `window` seconds.
+
+    The first caller of a window waits `window` (or until `max_batch` symbols are
+    queued), then issues one batched fetch for everything queued meanwhile; the
+    other callers block until it returns. Symbols missing from the batched result
+    are fetched individually so each caller sees the same errors as a direct call.
+    """
+
+    def __init__(self, fetch_many: FetchMany, fetch_one: FetchOne, window: float, max_batch: int = 0) -> None:
+        self._fetch_many = fetch_many
+        self._fetch_one = fetch_one
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: Optional[_Batch] = None
+        self.requests = 0
+        self.batches = 0
+
+    def get_quote(self, symbol: str) -> Quote:
+        with self._lock:
+            self.requests += 1
+            batch = self._pending
+            leader = batch is None
+            if leader:
+                batch = self._pending = _Batch()
+            batch.symbols[symbol] = None
+            if self.max_batch > 0 and len(batch.symbols) >= self.max_batch:
+                # Full: later callers start the next batch
+                self._pending = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+                self.batches += 1
+            try:
+                batch.quotes = fetch_quotes(self._fetch_many, list(batch.symbols), self.max_batch)
+            except Exception as e:  # noqa: BLE001 - fall back to per-symbol calls below
+                logger.warning(f"Batched quote fetch for {len(batch.symbols)} symbols failed: {e}")
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        quote = match_quote(batch.quotes, symbol) if batch.error is None else None
+        if quote is None:
+            return self._fetch_one(symbol)
+        return quote
@@ -27,6 +27,10 @@ class BrokerCapabilities:
     supports_cover_order: bool = False
     supports_multileg_order: bool = False
     supports_basket_orders: bool = False
+    # place_order may be called from several threads at once (stateless REST drivers)
+    supports_concurrent_orders: bool = False
+    # Most symbols one batched quote call accepts (0 = no batched endpoint)
+    max_quote_symbols: int = 0
 
 
 @dataclass
@@ -0,0 +1,66 @@
+"""Last traded values per symbol, kept current by websocket callbacks.
+
+Websocket threads write with ``update``; strategy threads read with ``get``,
+which only returns values younger than the caller's staleness bound so a quiet
+or disconnected feed falls back to REST instead of serving old prices.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class TickValue:
+    price: float
+    bid: Optional[float]
+    ask: Optional[float]
+    timestamp: Optional[datetime]  # exchange time, when the feed provides it
+    sequence: int                  # cache-wide update counter
+    received: float                # time.monotonic() at update
+
+
+class LastValueCache:
+    """Thread-safe symbol -> latest TickValue map."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, TickValue] = {}
+        self._sequence = 0
+
+    def update(
+        self,
+        symbol: str,
+        price: float,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        received = time.monotonic()
+        with self._lock:
+            self._sequence += 1
+            self._values[symbol] = TickValue(price, bid, ask, timestamp, self._sequence, received)
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[TickValue]:
+        """Latest value for `symbol`, or None if missing or older than `max_age` seconds."""
+        value = self._values.get(symbol)
+        if value is None:
+            return None
+        if max_age is not None and time.monotonic() - value.received > max_age:
+            return None
+        return value
+
+    def discard(self, symbol: str) -> None:
+        with self._lock:
+            self._values.pop(symbol, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,18 @@
+"""Master-contract (instrument) caching and lookup helpers shared by broker drivers."""
+
+from .cache import MasterContractCache, last_refresh_boundary
+from .index import InstrumentIndex, StrikeLadder
+from .normalize import normalize_fyers, normalize_zerodha, refresh_days_to_expiry
+from .store import InstrumentStore, instrument_store
+
+__all__ = [
+    "InstrumentIndex",
+    "InstrumentStore",
+    "instrument_store",
+    "MasterContractCache",
+    "last_refresh_boundary",
+    "normalize_fyers",
+    "normalize_zerodha",
+    "refresh_days_to_expiry",
+    "StrikeLadder",
+]
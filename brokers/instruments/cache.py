@@ -0,0 +1,110 @@
+"""Binary, trading-day-TTL cache for normalized master contracts.
+
+Brokers republish their instrument masters once per trading day, before the
+market opens. A cached master is therefore valid until the next refresh boundary
+(``refresh_time`` on the next weekday), and a warm start reads it back from a
+Feather file instead of downloading and re-normalizing it.
+
+``pyarrow`` is optional: without it the cache falls back to pickle.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, time, timedelta
+from typing import Callable, Optional
+
+import pandas as pd
+
+from .normalize import refresh_days_to_expiry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".cache"
+# Masters are republished early in the morning; anything cached before this on a
+# trading day is considered stale
+DEFAULT_REFRESH_TIME = time(8, 0)
+
+
+def _feather():
+    try:  # pragma: no cover - optional dependency
+        import pyarrow.feather as feather  # type: ignore
+
+        return feather
+    except Exception:  # pragma: no cover
+        return None
+
+
+def last_refresh_boundary(now: Optional[datetime] = None, refresh_time: time = DEFAULT_REFRESH_TIME) -> datetime:
+    """Most recent weekday at `refresh_time` that is not after `now`."""
+    now = now or datetime.now()
+    boundary = datetime.combine(now.date(), refresh_time)
+    if boundary > now:
+        boundary -= timedelta(days=1)
+    while boundary.weekday() >= 5:
+        boundary -= timedelta(days=1)
+    return boundary
+
+
+class MasterContractCache:
+    """One broker's normalized master contract on disk, valid for a trading day."""
+
+    def __init__(
+        self,
+        broker: str,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        refresh_time: time = DEFAULT_REFRESH_TIME,
+    ) -> None:
+        self.broker = broker
+        self.cache_dir = cache_dir
+        self.refresh_time = refresh_time
+        self._feather = _feather()
+        ext = "feather" if self._feather is not None else "pkl"
+        self.path = os.path.join(cache_dir, f"{broker}_master_contract.{ext}")
+
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        written = datetime.fromtimestamp(os.path.getmtime(self.path))
+        return written >= last_refresh_boundary(now, self.refresh_time)
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """Cached master if present and fresh, else None."""
+        if not self.is_fresh():
+            return None
+        try:
+            if self._feather is not None:
+                df = self._feather.read_feather(self.path, memory_map=True)
+            else:
+                df = pd.read_pickle(self.path)
+        except Exception as e:  # noqa: BLE001 - unreadable cache is just a miss
+            logger.warning(f"Ignoring unreadable {self.broker} master contract cache {self.path}: {e}")
+            return None
+        return refresh_days_to_expiry(df)
+
+    def save(self, df: pd.DataFrame) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            if self._feather is not None:
+                self._feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+            else:
+                df.to_pickle(tmp)
+            os.replace(tmp, self.path)
+        except Exception as e:  # noqa: BLE001 - caching is best-effort
+            logger.warning(f"Could not cache {self.broker} master contract to {self.path}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def get_or_download(self, download: Callable[[], pd.DataFrame], force: bool = False) -> pd.DataFrame:
+        """Fresh cached master, or `download()` (then cached) when stale, missing or forced."""
+        if not force:
+            df = self.load()
+            if df is not None:
+                logger.info(f"Loaded {self.broker} master contract from cache ({len(df)} rows)")
+                return df
+        df = download()
+        self.save(df)
+        logger.info(f"Downloaded {self.broker} master contract ({len(df)} rows)")
+        return df
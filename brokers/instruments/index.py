@@ -0,0 +1,172 @@
+"""In-memory lookups over a master contract.
+
+``InstrumentIndex`` is built once per downloaded master and answers the queries
+strategies make on every tick without scanning the frame: symbol or token to
+instrument, and nearest-strike search on per-(underlying, expiry, option type)
+strike ladders via ``bisect``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+OPTION_TYPES = ("CE", "PE")
+# Underlying-name column, by broker (Kite: name, Fyers: underlying_symbol)
+UNDERLYING_COLUMNS = ("name", "underlying_symbol")
+
+LadderKey = Tuple[Hashable, Hashable, str]
+
+
+class StrikeLadder:
+    """Strikes of one option series in ascending order, with their row positions."""
+
+    __slots__ = ("strikes", "rows")
+
+    def __init__(self, strikes: List[float], rows: List[int]) -> None:
+        self.strikes = strikes
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    @property
+    def step(self) -> float:
+        """Gap between the two lowest strikes (0 with fewer than two)."""
+        return abs(self.strikes[1] - self.strikes[0]) if len(self.strikes) > 1 else 0.0
+
+    def nearest(self, target: float, tolerance: Optional[float] = None) -> Optional[int]:
+        """Row position of the strike closest to `target` (lower strike on ties), or None."""
+        if not self.strikes:
+            return None
+        i = bisect_left(self.strikes, target)
+        if i == len(self.strikes) or (i > 0 and target - self.strikes[i - 1] <= self.strikes[i] - target):
+            i -= 1
+        if tolerance is not None and abs(self.strikes[i] - target) > tolerance:
+            return None
+        return self.rows[i]
+
+
+class InstrumentIndex:
+    """Hash and strike-ladder lookups over one master contract (a DataFrame or list of records)."""
+
+    def __init__(self, instruments: Any) -> None:
+        self.source = instruments
+        if instruments is None:
+            df = pd.DataFrame(columns=["symbol"])
+        elif isinstance(instruments, pd.DataFrame):
+            df = instruments
+        else:
+            df = pd.DataFrame(list(instruments))
+        self.df = df.reset_index(drop=True)
+
+        n = len(self.df)
+        symbols = self.df["symbol"].astype(str).tolist() if "symbol" in self.df.columns else []
+        self._by_symbol: Dict[str, int] = dict(zip(symbols, range(n)))
+        self._tokens: List[Any] = self.df["token"].tolist() if "token" in self.df.columns else []
+        self._by_token: Dict[Any, int] = dict(zip(self._tokens, range(n)))
+        self._by_qualified: Optional[Dict[str, int]] = None
+        self._ladders = self._build_ladders()
+        self._series: Dict[Tuple[str, str, Optional[str]], StrikeLadder] = {}
+        self._columns: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    # --- Symbol / token ---
+    def position(self, symbol: str) -> Optional[int]:
+        return self._by_symbol.get(symbol)
+
+    def resolve(self, symbol: str) -> Optional[int]:
+        """Row position for a symbol as listed, or qualified as ``EXCH:SYMBOL``."""
+        position = self._by_symbol.get(symbol)
+        if position is None and ":" in symbol:
+            if self._by_qualified is None:
+                self._by_qualified = self._build_qualified()
+            position = self._by_qualified.get(symbol)
+        return position
+
+    def _build_qualified(self) -> Dict[str, int]:
+        # Bare trading symbols repeat across exchanges (NSE:SBIN / BSE:SBIN)
+        if not {"exchange", "symbol"}.issubset(self.df.columns):
+            return {}
+        keys = (self.df["exchange"].astype(str) + ":" + self.df["symbol"].astype(str)).tolist()
+        return dict(zip(keys, range(len(keys))))
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Instrument row for `symbol` (bare or ``EXCH:SYMBOL``) as a dict, or None."""
+        return self.record(self.resolve(symbol))
+
+    def token(self, symbol: str) -> Optional[Any]:
+        """Broker token for `symbol` (bare or ``EXCH:SYMBOL``), or None."""
+        position = self.resolve(symbol)
+        if position is None or not self._tokens:
+            return None
+        return self._tokens[position]
+
+    def by_token(self, token: Any) -> Optional[Dict[str, Any]]:
+        return self.record(self._by_token.get(token))
+
+    def record(self, position: Optional[int]) -> Optional[Dict[str, Any]]:
+        if position is None:
+            return None
+        if self._columns is None:
+            self._columns = {c: self.df[c].to_numpy() for c in self.df.columns}
+        return {c: values[position] for c, values in self._columns.items()}
+
+    # --- Strike ladders ---
+    def _build_ladders(self) -> Dict[LadderKey, StrikeLadder]:
+        if not {"instrument_type", "strike"}.issubset(self.df.columns):
+            return {}
+        underlying_col = next((c for c in UNDERLYING_COLUMNS if c in self.df.columns), None)
+        options = pd.DataFrame({
+            "underlying": self.df[underlying_col].astype(object) if underlying_col else None,
+            "expiry": self.df["expiry"].astype(object) if "expiry" in self.df.columns else None,
+            "type": self.df["instrument_type"].astype(str),
+            "strike": pd.to_numeric(self.df["strike"], errors="coerce"),
+        })
+        options = options[options["type"].isin(OPTION_TYPES) & options["strike"].notna()]
+        options = options.sort_values("strike", kind="stable")
+
+        ladders: Dict[LadderKey, StrikeLadder] = {}
+        for key, rows in options.groupby(["underlying", "expiry", "type"], sort=False, dropna=False).indices.items():
+            positions = options.index[rows]
+            ladders[key] = StrikeLadder(options["strike"].to_numpy()[rows].tolist(), positions.tolist())
+        return ladders
+
+    def keys(self) -> List[LadderKey]:
+        """(underlying, expiry, option type) of every option series."""
+        return list(self._ladders)
+
+    def ladder(self, underlying: Hashable, expiry: Hashable, option_type: str) -> Optional[StrikeLadder]:
+        return self._ladders.get((underlying, expiry, option_type))
+
+    def series(self, symbol_part: str, option_type: str, segment: Optional[str] = None) -> StrikeLadder:
+        """
+        Strike ladder of the `option_type` options whose symbol contains `symbol_part`
+        (e.g. ``NIFTY25AUG``), optionally restricted to `segment`. Built on first use.
+        """
+        key = (symbol_part, option_type, segment)
+        ladder = self._series.get(key)
+        if ladder is None:
+            df = self.df
+            if not {"symbol", "instrument_type", "strike"}.issubset(df.columns):
+                return StrikeLadder([], [])
+            mask = df["symbol"].astype(str).str.contains(symbol_part, regex=False) & (df["instrument_type"].astype(str) == option_type)
+            if segment is not None:
+                mask &= df["segment"].astype(str) == segment
+            strikes = pd.to_numeric(df.loc[mask, "strike"], errors="coerce").dropna().sort_values(kind="stable")
+            ladder = StrikeLadder(strikes.tolist(), strikes.index.tolist())
+            self._series[key] = ladder
+        return ladder
+
+    def nearest(self, ladder: Optional[StrikeLadder], target: float, tolerance: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Instrument on `ladder` whose strike is closest to `target` (within `tolerance`), or None."""
+        if ladder is None:
+            return None
+        return self.record(ladder.nearest(target, tolerance))
@@ -0,0 +1,92 @@
+"""Vectorized normalization of broker master-contract dumps.
+
+Every broker's instrument dump is brought to the same shape: ``expiry`` as
+``datetime.date`` (missing for non-expiring instruments), ``days_to_expiry`` in
+business days inclusive of today, and low-cardinality string columns
+(``instrument_type``, ``segment``, ``exchange``) as categoricals. All of it runs
+as whole-column operations, so a ~100k-row master normalizes in milliseconds.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+INSTRUMENT_TYPES = CategoricalDtype(["EQ", "FUT", "CE", "PE"])
+# Zerodha-style segment names that Fyers symbols are mapped onto
+FYERS_SEGMENTS = CategoricalDtype(["NSE", "BSE", "NFO-FUT", "NFO-OPT", "BFO-FUT", "BFO-OPT"])
+
+CATEGORICAL_COLUMNS = ("instrument_type", "segment", "exchange")
+
+
+def refresh_days_to_expiry(df: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """(Re)compute `days_to_expiry` (business days, inclusive) from the `expiry` column."""
+    if "expiry" not in df.columns:
+        return df
+    today = np.datetime64(today or datetime.now().date(), "D")
+    expiry = pd.to_datetime(df["expiry"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(expiry)
+    days = np.full(len(df), np.nan)
+    days[valid] = np.busday_count(today, expiry[valid]) + 1
+    df["days_to_expiry"] = days
+    return df
+
+
+def expiry_dates(values: pd.Series, unit: Optional[str] = None) -> pd.Series:
+    """`datetime.date` expiries from dates, strings or (with `unit`) epoch numbers; unparseable -> NaT."""
+    return pd.to_datetime(values, unit=unit, errors="coerce").dt.date
+
+
+def instrument_types(symbol: pd.Series) -> pd.Series:
+    """FUT / CE / PE by symbol suffix, EQ for everything else."""
+    symbol = symbol.astype(str)
+    codes = np.select(
+        [symbol.str.endswith("FUT"), symbol.str.endswith("CE"), symbol.str.endswith("PE")],
+        [1, 2, 3],
+        default=0,
+    )
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=INSTRUMENT_TYPES), index=symbol.index)
+
+
+def fyers_segments(symbol: pd.Series, instrument_type: pd.Series) -> pd.Series:
+    """Zerodha segment (NSE, NFO-OPT, BFO-FUT, ...) for `NSE:`/`BSE:` Fyers symbols; missing otherwise."""
+    symbol = symbol.astype(str)
+    nse = symbol.str.startswith("NSE").to_numpy()
+    bse = symbol.str.startswith("BSE").to_numpy()
+    kind = instrument_type.astype(str).to_numpy()
+    fut = kind == "FUT"
+    opt = (kind == "CE") | (kind == "PE")
+    codes = np.select(
+        [nse & fut, bse & fut, nse & opt, bse & opt, nse, bse],
+        [2, 4, 3, 5, 0, 1],
+        default=-1,
+    )
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=FYERS_SEGMENTS), index=symbol.index)
+
+
+def categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the low-cardinality string columns as categoricals."""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+def normalize_fyers(df: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """Normalize a renamed Fyers sym_details frame (epoch-second expiries, `EXCH:SYMBOL` tickers)."""
+    df["instrument_type"] = instrument_types(df["symbol"])
+    df["expiry"] = expiry_dates(df["expiry"], unit="s")
+    refresh_days_to_expiry(df, today)
+    df["segment"] = fyers_segments(df["symbol"], df["instrument_type"])
+    return df
+
+
+def normalize_zerodha(df: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """Normalize a renamed Kite instruments frame (instrument_type and segment are already given)."""
+    df["expiry"] = expiry_dates(df["expiry"])
+    refresh_days_to_expiry(df, today)
+    return categorize(df)
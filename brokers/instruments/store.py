@@ -0,0 +1,145 @@
+"""Process-wide, reference-counted master contracts.
+
+Strategies running in one hub process share a broker, so they should share its
+master contract too. The first ``acquire`` for a broker downloads it; callers
+arriving while that download is in flight wait for it instead of starting their
+own (single flight). A downloaded frame is frozen once: its column arrays are
+marked read-only, so every owner gets a shallow view of the same memory that
+cannot write through to the others (pandas 2 raises on in-place writes, pandas 3
+copies on write). The master is dropped once the last owner releases it. ``refresh`` replaces a held master the
+same way, so owners refreshing together download it once.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("master", "error", "ready", "owners", "views")
+
+    def __init__(self) -> None:
+        self.master: Any = None
+        self.error: Optional[BaseException] = None
+        self.ready = threading.Event()
+        self.owners: Set[Hashable] = set()
+        self.views: Dict[Hashable, Any] = {}
+
+
+def _frozen(master: Any) -> Any:
+    """`master` rebuilt on read-only column arrays (one copy, shared by every owner)."""
+    if not isinstance(master, pd.DataFrame):
+        return master
+    columns: Dict[Hashable, Any] = {}
+    for name, column in master.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy().copy()
+            codes.flags.writeable = False
+            columns[name] = pd.Categorical.from_codes(codes, dtype=column.dtype)
+        elif isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # Other extension arrays (e.g. pandas 3 strings) rely on copy-on-write
+            columns[name] = column.array
+    # copy=False keeps the columns unconsolidated, each on its read-only array
+    return pd.DataFrame(columns, index=master.index, copy=False)
+
+
+def _view(master: Any) -> Any:
+    # A shallow copy: adding or replacing columns stays private to the owner, and
+    # in-place writes hit the read-only arrays instead of the shared data
+    if isinstance(master, pd.DataFrame):
+        return master.copy(deep=False)
+    return master
+
+
+class InstrumentStore:
+    """Master contracts keyed by broker, held while at least one owner uses them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+
+    def acquire(self, key: Hashable, owner: Hashable, download: Callable[[], Any]) -> Any:
+        """
+        `owner`'s view of the master for `key`, calling `download()` only if no other
+        owner holds it or is already fetching it.
+        """
+        return self._fetch(key, owner, download, refresh=False)
+
+    def refresh(self, key: Hashable, owner: Hashable, download: Callable[[], Any]) -> Any:
+        """
+        `owner`'s view of a freshly downloaded master for `key`. A download already in
+        flight is joined rather than repeated; other owners keep their current views
+        until they acquire again.
+        """
+        return self._fetch(key, owner, download, refresh=True)
+
+    def _fetch(self, key: Hashable, owner: Hashable, download: Callable[[], Any], refresh: bool) -> Any:
+        with self._lock:
+            previous = self._entries.get(key)
+            leader = previous is None or (refresh and previous.ready.is_set())
+            if leader:
+                entry = _Entry()
+                if previous is not None:
+                    entry.owners |= previous.owners
+                self._entries[key] = entry
+            else:
+                entry = previous
+            entry.owners.add(owner)
+
+        if leader:
+            logger.info("Downloading shared master contract")
+            try:
+                entry.master = _frozen(download())
+            except BaseException as e:
+                entry.error = e
+                with self._lock:
+                    # A failed refresh leaves the master it was replacing in place
+                    if previous is not None:
+                        self._entries[key] = previous
+                    else:
+                        self._entries.pop(key, None)
+                raise
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                raise entry.error
+
+        with self._lock:
+            view = entry.views.get(owner)
+            if view is None:
+                view = entry.views[owner] = _view(entry.master)
+        return view
+
+    def release(self, key: Hashable, owner: Hashable) -> None:
+        """Drop `owner`'s hold on `key`; the master is freed with the last one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or owner not in entry.owners:
+                return
+            entry.owners.discard(owner)
+            entry.views.pop(owner, None)
+            if not entry.owners:
+                del self._entries[key]
+                logger.info("Last owner released the shared master contract; dropping it")
+
+    def owners(self, key: Hashable) -> Set[Hashable]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return set(entry.owners) if entry is not None else set()
+
+
+# Shared by every strategy in the process
+instrument_store = InstrumentStore()
@@ -0,0 +1,106 @@
+"""On-disk Arrow (Feather) cache for parsed backtest CSV inputs.
+
+Parsing the NSE index/option CSVs (``pd.read_csv`` + ``pd.to_datetime``) dominates
+start-up for short backtests. The first run stores the typed, parsed frame as an
+uncompressed Feather file keyed by the source path, size and mtime; later runs
+memory-map that file instead of parsing the CSV again.
+
+``pyarrow`` is optional: without it the cache falls back to pickle, which still
+skips the CSV parse but loads the whole frame instead of memory-mapping it.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+from typing import Callable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "backtest")
+
+# Bump when the parsers in csv_provider change the shape of what they return
+CACHE_VERSION = 1
+
+
+def _feather():
+    try:  # pragma: no cover - optional dependency
+        import pyarrow.feather as feather  # type: ignore
+
+        return feather
+    except Exception:  # pragma: no cover
+        return None
+
+
+def cache_key(path: str) -> str:
+    """Stable key for a source file: absolute path, size, mtime and cache version."""
+
+    st = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{CACHE_VERSION}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _ext(feather) -> str:
+    return "feather" if feather is not None else "pkl"
+
+
+def cache_path_for(path: str, cache_dir: Optional[str] = None) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"{stem}-{cache_key(path)}.{_ext(_feather())}")
+
+
+def read_csv_cached(
+    path: str,
+    parse: Callable[[str], pd.DataFrame],
+    *,
+    cache_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """Return ``parse(path)``, served from the on-disk cache when the source is unchanged.
+
+    ``parse`` must return a frame with a default RangeIndex; set any index after loading.
+    """
+
+    feather = _feather()
+    target = cache_path_for(path, cache_dir)
+    if os.path.exists(target):
+        try:
+            if feather is not None:
+                df = feather.read_table(target, memory_map=True).to_pandas()
+            else:
+                df = pd.read_pickle(target)
+            logger.info(f"Loaded {path} from cache {target}")
+            return df
+        except Exception as e:  # noqa: BLE001 - corrupt/partial cache, rebuild below
+            logger.warning(f"Ignoring unreadable cache {target}: {e}")
+
+    df = parse(path)
+    try:
+        _write(feather, df, target)
+    except Exception as e:  # noqa: BLE001 - caching is best-effort
+        logger.warning(f"Could not cache {path} to {target}: {e}")
+    return df
+
+
+def _write(feather, df: pd.DataFrame, target: str) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    if feather is not None:
+        # Uncompressed so later reads can memory-map the file instead of decoding it
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+    else:
+        df.reset_index(drop=True).to_pickle(tmp)
+    os.replace(tmp, target)
+
+    # Drop stale entries for the same source (older size/mtime)
+    prefix = target.rsplit("-", 1)[0]
+    for old in glob.glob(f"{glob.escape(prefix)}-{'?' * 16}.{_ext(feather)}"):
+        if old != target:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    logger.info(f"Cached parsed CSV to {target}")
@@ -1,18 +1,61 @@
 import pandas as pd
+import numpy as np
 import os
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 import re
 
+from .cache import read_csv_cached
+
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class _StrikeSlice:
+    """Row range of one (date, expiry, option type) group in the sorted option frame."""
+    start: int
+    stop: int
+    strikes: np.ndarray  # sorted ascending, view into the sorted strike column
+    prices: np.ndarray   # resolved LTP/Close, view into the sorted price column
+
+
 class CSVDataProvider:
-    def __init__(self, downloads_path):
+    def __init__(self, downloads_path, cache_dir=None, use_cache=True):
         self.downloads_path = downloads_path
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
         self.index_data = None
         self.ce_data = None
         self.pe_data = None
+        # Lookup structures built once by _build_chain_index()
+        self._chain_index = {}   # (date, expiry, type) -> _StrikeSlice
+        self._expiries = {}      # (date, type) -> sorted list of expiries
+        self._dates = {}         # type -> sorted unique trading dates (datetime64[ns])
+        self._instruments = {}   # (date, expiry) -> instruments DataFrame for that chain
         self._load_data()
+        self._build_chain_index()
+
+    @classmethod
+    def from_frames(cls, index_data, ce_data, pe_data):
+        """
+        Build a provider around frames that are already parsed (as produced by
+        _parse_index_csv/_parse_options_csv), e.g. views attached from shared memory.
+        """
+        provider = cls.__new__(cls)
+        provider.downloads_path = None
+        provider.cache_dir = None
+        provider.use_cache = False
+        provider.index_data = index_data
+        provider.ce_data = ce_data
+        provider.pe_data = pe_data
+        provider._build_chain_index()
+        return provider
+
+    def _read(self, path, parse):
+        if not self.use_cache:
+            return parse(path)
+        return read_csv_cached(path, parse, cache_dir=self.cache_dir)
 
     def _load_data(self):
         # We'll try to load the 2026 files preferentially
@@ -22,8 +65,7 @@ class CSVDataProvider:
 
         if os.path.exists(index_file):
             logger.info(f"Loading index data from {index_file}")
-            self.index_data = pd.read_csv(index_file, skipinitialspace=True, quotechar='"')
-            self.index_data['Date'] = pd.to_datetime(self.index_data['Date'])
+            self.index_data = self._read(index_file, self._parse_index_csv)
             self.index_data.set_index('Date', inplace=True)
             self.index_data.sort_index(inplace=True)
         else:
@@ -31,12 +73,8 @@ class CSVDataProvider:
 
         if os.path.exists(ce_file):
             logger.info(f"Loading CE options data from {ce_file}")
-            self.ce_data = pd.read_csv(ce_file, skipinitialspace=True)
-            self.ce_data.columns = self.ce_data.columns.str.strip()
-            self.ce_data['Date'] = pd.to_datetime(self.ce_data['Date'])
-            # Expiry is in 25-Jun-2030 format
-            self.ce_data['Expiry'] = pd.to_datetime(self.ce_data['Expiry'])
-            
+            self.ce_data = self._read(ce_file, self._parse_options_csv)
+
             # If index_data is missing recent dates, supplement from CE data
             if self.index_data is not None:
                 latest_index_date = self.index_data.index.max()
@@ -56,17 +94,100 @@ class CSVDataProvider:
 
         if os.path.exists(pe_file):
             logger.info(f"Loading PE options data from {pe_file}")
-            self.pe_data = pd.read_csv(pe_file, skipinitialspace=True)
-            self.pe_data.columns = self.pe_data.columns.str.strip()
-            self.pe_data['Date'] = pd.to_datetime(self.pe_data['Date'])
-            self.pe_data['Expiry'] = pd.to_datetime(self.pe_data['Expiry'])
+            self.pe_data = self._read(pe_file, self._parse_options_csv)
         else:
             logger.warning(f"PE options file not found: {pe_file}")
 
+    @staticmethod
+    def _parse_index_csv(path):
+        data = pd.read_csv(path, skipinitialspace=True, quotechar='"')
+        data['Date'] = pd.to_datetime(data['Date'])
+        return data
+
+    @classmethod
+    def _parse_options_csv(cls, path):
+        """
+        Parse an NSE OPTIDX dump into the typed frame the chain index expects:
+        sorted by (Date, Expiry, Strike Price), with resolved `_price` and
+        categorical `synth_symbol` columns. This is what gets cached on disk.
+        """
+        data = pd.read_csv(path, skipinitialspace=True)
+        data.columns = data.columns.str.strip()
+        data['Date'] = pd.to_datetime(data['Date'])
+        # Expiry is in 25-Jun-2030 format
+        data['Expiry'] = pd.to_datetime(data['Expiry'])
+        data = data.sort_values(['Date', 'Expiry', 'Strike Price'], kind='mergesort').reset_index(drop=True)
+        data['_price'] = cls._resolve_prices(data)
+        data['synth_symbol'] = cls._synth_symbols(data)
+        return data
+
+    def _build_chain_index(self):
+        """
+        Record the row range of every (date, expiry, type) group in the sorted option
+        frames, so lookups become dict hits plus a binary search on the strike array
+        instead of full-frame boolean masks.
+        """
+        self._chain_index = {}
+        self._expiries = {}
+        self._dates = {}
+        self._instruments = {}
+        for opt_type in ("CE", "PE"):
+            data = self.ce_data if opt_type == "CE" else self.pe_data
+            if data is None:
+                continue
+
+            dates = data['Date'].to_numpy(dtype='datetime64[ns]')
+            expiries = data['Expiry'].to_numpy(dtype='datetime64[ns]')
+            strikes = data['Strike Price'].to_numpy(dtype=np.float64)
+            prices = data['_price'].to_numpy(dtype=np.float64)
+            self._dates[opt_type] = np.unique(dates)
+            if len(data) == 0:
+                continue
+
+            breaks = np.flatnonzero((dates[1:] != dates[:-1]) | (expiries[1:] != expiries[:-1])) + 1
+            starts = np.concatenate(([0], breaks))
+            stops = np.concatenate((breaks, [len(data)]))
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                date = pd.Timestamp(dates[start])
+                expiry = pd.Timestamp(expiries[start])
+                self._chain_index[(date, expiry, opt_type)] = _StrikeSlice(
+                    start, stop, strikes[start:stop], prices[start:stop]
+                )
+                # Groups arrive sorted by expiry within a date
+                self._expiries.setdefault((date, opt_type), []).append(expiry)
+
+    @staticmethod
+    def _synth_symbols(data):
+        """Vectorized synthetic symbols (NIFTY24FEB24000CE) as a categorical column."""
+        expiry_codes = {e: "NIFTY" + e.strftime('%y%b').upper() for e in data['Expiry'].dropna().unique()}
+        prefix = data['Expiry'].map(expiry_codes).astype(object)
+        strike = data['Strike Price'].astype(np.int64).astype(str)
+        return (prefix + strike + data['Option type'].astype(str)).astype('category')
+
+    @staticmethod
+    def _resolve_prices(data):
+        # LTP is preferred; "-", blanks and zeros fall back to Close
+        ltp = pd.to_numeric(data['LTP'], errors='coerce') if 'LTP' in data else pd.Series(np.nan, index=data.index)
+        close = pd.to_numeric(data['Close'], errors='coerce') if 'Close' in data else pd.Series(np.nan, index=data.index)
+        return ltp.where(ltp.notna() & (ltp != 0), close).fillna(0.0).astype(np.float64)
+
+    def _resolve_date(self, opt_type, date):
+        """Return `date` if it has rows for `opt_type`, else the last earlier date (or None)."""
+        dates = self._dates.get(opt_type)
+        if dates is None or len(dates) == 0:
+            return None
+        pos = np.searchsorted(dates, date.to_datetime64(), side='right')
+        if pos == 0:
+            return None
+        return pd.Timestamp(dates[pos - 1])
+
+    def _has_date(self, opt_type, date):
+        return (date, opt_type) in self._expiries
+
     def get_index_price(self, timestamp):
         if self.index_data is None:
             return None
-        
+
         date = timestamp.date()
         try:
             row = self.index_data.loc[pd.Timestamp(date)]
@@ -80,39 +201,25 @@ class CSVDataProvider:
     def get_option_chain(self, timestamp):
         if self.ce_data is None or self.pe_data is None:
             return None
-        
+
         date = pd.Timestamp(timestamp.date())
-        ce_subset = self.ce_data[self.ce_data['Date'] == date]
-        pe_subset = self.pe_data[self.pe_data['Date'] == date]
-        
-        if ce_subset.empty and pe_subset.empty:
+        chain_date = date
+        if not (self._has_date("CE", date) or self._has_date("PE", date)):
             # Fallback to last available day
-            last_date = self.ce_data[self.ce_data['Date'] <= date]['Date'].max()
-            if pd.isna(last_date):
+            chain_date = self._resolve_date("CE", date)
+            if chain_date is None:
                 print(f"DEBUG: No chain data for {date}")
                 return None
-            ce_subset = self.ce_data[self.ce_data['Date'] == last_date]
-            pe_subset = self.pe_data[self.pe_data['Date'] == last_date]
-            print(f"DEBUG: Using fallback date {last_date} for {date}")
+            print(f"DEBUG: Using fallback date {chain_date} for {date}")
 
         # Near-month expiry filtering
-        near_expiry = ce_subset['Expiry'].min()
-        ce_chain = ce_subset[ce_subset['Expiry'] == near_expiry].copy()
-        pe_chain = pe_subset[pe_subset['Expiry'] == near_expiry].copy()
-        
+        near_expiry = self._near_expiry(chain_date)
+        ce_chain = self._chain_slice(self.ce_data, chain_date, near_expiry, "CE")
+        pe_chain = self._chain_slice(self.pe_data, chain_date, near_expiry, "PE")
+
         if ce_chain.empty:
             print(f"DEBUG: No CE chain for expiry {near_expiry} on {date}")
 
-        # Add synthetic symbols NIFTY24FEB24000CE
-        def synth_symbol(row):
-            exp = row['Expiry']
-            month_str = exp.strftime('%b').upper()
-            year_str = exp.strftime('%y')
-            return f"NIFTY{year_str}{month_str}{int(row['Strike Price'])}{row['Option type']}"
-
-        ce_chain['synth_symbol'] = ce_chain.apply(synth_symbol, axis=1)
-        pe_chain['synth_symbol'] = pe_chain.apply(synth_symbol, axis=1)
-
         return {
             'CE': ce_chain,
             'PE': pe_chain,
@@ -120,41 +227,69 @@ class CSVDataProvider:
             'expiry': near_expiry
         }
 
+    def get_instruments(self, timestamp):
+        """
+        Instruments table (symbol, strike, lot_size, instrument_type, segment) for the
+        near-month chain on `timestamp`. Built once per chain and cached, so repeated
+        calls for the same trading day return the same DataFrame.
+        """
+        chain = self.get_option_chain(timestamp)
+        if not chain:
+            return None
+
+        key = (chain['date'], chain['expiry'])
+        instruments = self._instruments.get(key)
+        if instruments is None:
+            legs = pd.concat([chain['CE'], chain['PE']], ignore_index=True)
+            instruments = pd.DataFrame({
+                'symbol': legs['synth_symbol'].astype(object),
+                'strike': legs['Strike Price'],
+                'lot_size': 50,
+                'instrument_type': legs['Option type'],
+                'segment': 'NFO-OPT',
+            })
+            self._instruments[key] = instruments
+        return instruments
+
+    def _near_expiry(self, date):
+        expiries = self._expiries.get((date, "CE")) or self._expiries.get((date, "PE")) or []
+        return expiries[0] if expiries else pd.NaT
+
+    def _chain_slice(self, data, date, expiry, opt_type):
+        entry = self._chain_index.get((date, expiry, opt_type))
+        if entry is None:
+            return data.iloc[0:0]
+        return data.iloc[entry.start:entry.stop]
+
     def get_option_price(self, symbol, timestamp):
         # Extract components from synthetic symbol NIFTY26FEB25500CE
         match = re.match(r"NIFTY(\d{2})([A-Z]{3})(\d+)(CE|PE)", symbol)
         if not match:
             return 0.0
-        
+
         year_str, month_str, strike_str, type_str = match.groups()
         strike = float(strike_str)
-        
+
         data = self.ce_data if type_str == "CE" else self.pe_data
         if data is None: return 0.0
-        
+
         date = pd.Timestamp(timestamp.date())
-        # Filter for date and strike
-        subset = data[(data['Date'] == date) & (data['Strike Price'] == strike)]
-        
-        if subset.empty:
-            # Fallback to last available day
-            last_dt = data[data['Date'] <= date]['Date'].max()
-            if pd.isna(last_dt): return 0.0
-            subset = data[(data['Date'] == last_dt) & (data['Strike Price'] == strike)]
-            
-        if not subset.empty:
-            # Check for LTP or Close
-            val = subset.iloc[0]['LTP']
-            if val == "-" or pd.isna(val) or val == 0:
-                val = subset.iloc[0]['Close']
-            
-            try:
-                price = float(val) if val != "-" else 0.0
+        # Fallback to last available day
+        quote_date = date if self._has_date(type_str, date) else self._resolve_date(type_str, date)
+        if quote_date is None:
+            return 0.0
+
+        # Prefer expiries of the month encoded in the symbol, nearest first
+        expiries = self._expiries.get((quote_date, type_str), [])
+        in_month = [e for e in expiries if e.strftime('%y') == year_str and e.strftime('%b').upper() == month_str]
+        for expiry in in_month + [e for e in expiries if e not in in_month]:
+            entry = self._chain_index[(quote_date, expiry, type_str)]
+            pos = np.searchsorted(entry.strikes, strike)
+            if pos < len(entry.strikes) and entry.strikes[pos] == strike:
+                price = float(entry.prices[pos])
                 if price == 0:
                      print(f"DEBUG: Price for {symbol} on {timestamp} is 0.0")
                 return price
-            except:
-                return 0.0
-        
+
         print(f"DEBUG: No price data found for {symbol} on {timestamp}")
         return 0.0
@@ -1,10 +1,9 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
-import pandas as pd
+import numpy as np
 import logging
 
-logger = logging.getLogger(__name__)
 from ...core.enums import Exchange, OrderType, ProductType, TransactionType
 from ...core.interface import BrokerDriver
 from ...core.schemas import (
@@ -16,12 +15,23 @@ from ...core.schemas import (
     Quote,
     Instrument,
 )
+from .shared import SharedMarketDataHandle, attach_provider
+
+logger = logging.getLogger(__name__)
+
+# Simple margin model: 1 Lakh per lot (50 qty) for short positions
+MARGIN_PER_LOT = 100000.0
+MARGIN_LOT_SIZE = 50.0
+
 
 class BacktestDriver(BrokerDriver):
     """
     Backtest driver for simulating trades using historical data.
     """
 
+    # The master is swapped for each simulated day's chain
+    share_instruments = False
+
     def __init__(self, initial_capital: float = 100000.0) -> None:
         super().__init__()
         self.capabilities = BrokerCapabilities(
@@ -44,30 +54,84 @@ class BacktestDriver(BrokerDriver):
         self.current_prices: Dict[str, float] = {}
         self.instruments_df = None
         self.csv_provider = None
+        # With keep_history=False orders/fills are only handed to fill listeners (e.g. a
+        # streaming writer), keeping memory flat on long runs
+        self.keep_history = True
+        self.order_count = 0
+        self.trade_count = 0
+        self._fill_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Running aggregates over self.positions, kept in step by _book/_unbook so
+        # get_funds() never has to walk the positions
+        self._unrealized = 0.0      # sum of pos.pnl
+        self._position_value = 0.0  # sum of quantity_total * average_price
+        self._short_qty = 0         # sum of abs(quantity_total) over short positions
 
     def set_csv_provider(self, provider):
+        """Accepts a CSVDataProvider or a SharedMarketDataHandle to attach to."""
+        if isinstance(provider, SharedMarketDataHandle):
+            provider = attach_provider(provider)
         self.csv_provider = provider
 
+    def add_fill_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        self._fill_listeners.append(callback)
+
+    def remove_fill_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._fill_listeners:
+            self._fill_listeners.remove(callback)
+
     def set_current_time(self, dt: datetime):
         self.current_time = dt
 
     def set_price(self, symbol: str, price: float):
         self.current_prices[symbol] = price
         # Update P&L for open positions
-        if symbol in self.positions:
-            pos = self.positions[symbol]
+        pos = self.positions.get(symbol)
+        if pos is not None:
+            old_pnl = pos.pnl
+            # (avg - price) * |qty| for shorts is the same expression with qty < 0
+            pos.pnl = (price - pos.average_price) * pos.quantity_total
+            self._unrealized += pos.pnl - old_pnl
+
+    def set_prices(self, prices: Dict[str, float]):
+        """Apply many prices at once and revalue every affected position in one vectorized pass."""
+        self.current_prices.update(prices)
+        held = [pos for symbol, pos in self.positions.items() if symbol in prices]
+        if not held:
+            return
+        n = len(held)
+        price = np.fromiter((prices[pos.symbol] for pos in held), dtype=np.float64, count=n)
+        avg = np.fromiter((pos.average_price for pos in held), dtype=np.float64, count=n)
+        qty = np.fromiter((pos.quantity_total for pos in held), dtype=np.float64, count=n)
+        old = np.fromiter((pos.pnl for pos in held), dtype=np.float64, count=n)
+        pnl = (price - avg) * qty
+        for pos, value in zip(held, pnl.tolist()):
+            pos.pnl = value
+        self._unrealized += float(pnl.sum() - old.sum())
+
+    def _book(self, pos: Position):
+        self._unrealized += pos.pnl
+        self._position_value += pos.quantity_total * pos.average_price
+        if pos.quantity_total < 0:
+            self._short_qty -= pos.quantity_total
+
+    def _unbook(self, pos: Position):
+        self._unrealized -= pos.pnl
+        self._position_value -= pos.quantity_total * pos.average_price
+        if pos.quantity_total < 0:
+            self._short_qty += pos.quantity_total
+
+    def _mark(self, pos: Position):
+        price = self.current_prices.get(pos.symbol)
+        if price:
             pos.pnl = (price - pos.average_price) * pos.quantity_total
-            if pos.quantity_total < 0: # Short position
-                pos.pnl = (pos.average_price - price) * abs(pos.quantity_total)
 
     def get_funds(self) -> Funds:
-        equity = self.current_cash
-        used_margin = 0.0
-        for pos in self.positions.values():
-            equity += pos.pnl + (pos.quantity_total * pos.average_price)
-            # Simple margin model: 1 Lakh per lot (50 qty) for short positions
-            if pos.quantity_total < 0:
-                used_margin += abs(pos.quantity_total / 50.0) * 100000.0
+        if not self.positions:
+            # Drop accumulated float drift whenever the book is flat
+            self._unrealized = self._position_value = 0.0
+            self._short_qty = 0
+        equity = self.current_cash + self._unrealized + self._position_value
+        used_margin = (self._short_qty / MARGIN_LOT_SIZE) * MARGIN_PER_LOT
                 
         return Funds(
             equity=equity,
@@ -88,14 +152,15 @@ class BacktestDriver(BrokerDriver):
 
         # Margin Check (Simple model: 1 Lakh per lot)
         if request.transaction_type == "SELL":
-            required_margin = (request.quantity / 50.0) * 100000.0
+            required_margin = (request.quantity / MARGIN_LOT_SIZE) * MARGIN_PER_LOT
             funds = self.get_funds()
             available_margin = funds.equity - funds.used_margin
             if required_margin > available_margin:
                 logger.warning(f"Insufficient Margin: Required {required_margin}, Available {available_margin}")
                 return OrderResponse(status="error", order_id=None, message="Insufficient Margin")
 
-        order_id = f"BT{len(self.orders) + 1}"
+        self.order_count += 1
+        order_id = f"BT{self.order_count}"
         order_entry = {
             "order_id": order_id,
             "symbol": request.symbol,
@@ -108,7 +173,8 @@ class BacktestDriver(BrokerDriver):
             "timestamp": self.current_time.isoformat() if self.current_time else datetime.now().isoformat(),
             "tag": request.tag
         }
-        self.orders.append(order_entry)
+        if self.keep_history:
+            self.orders.append(order_entry)
         
         # Immediate execution for market orders in backtest
         self._execute_trade(order_entry)
@@ -122,10 +188,13 @@ class BacktestDriver(BrokerDriver):
         side = order["transaction_type"]
 
         trade_value = qty * price
+        pos = self.positions.get(symbol)
+        if pos is not None:
+            self._unbook(pos)
+
         if side == TransactionType.BUY:
             self.current_cash -= trade_value
-            if symbol in self.positions:
-                pos = self.positions[symbol]
+            if pos is not None:
                 new_qty = pos.quantity_total + qty
                 if new_qty == 0:
                     del self.positions[symbol]
@@ -145,8 +214,7 @@ class BacktestDriver(BrokerDriver):
                 )
         else: # SELL
             self.current_cash += trade_value
-            if symbol in self.positions:
-                pos = self.positions[symbol]
+            if pos is not None:
                 new_qty = pos.quantity_total - qty
                 if new_qty == 0:
                     del self.positions[symbol]
@@ -165,8 +233,17 @@ class BacktestDriver(BrokerDriver):
                     average_price=price,
                     product_type=ProductType.MARGIN
                 )
+
+        pos = self.positions.get(symbol)
+        if pos is not None:
+            self._mark(pos)
+            self._book(pos)
         
-        self.trades.append(order)
+        self.trade_count += 1
+        if self.keep_history:
+            self.trades.append(order)
+        for listener in self._fill_listeners:
+            listener(order)
 
 
     def cancel_order(self, order_id: str) -> OrderResponse:
@@ -207,21 +284,10 @@ class BacktestDriver(BrokerDriver):
 
     def download_instruments(self) -> None:
         if self.csv_provider and self.current_time:
-            chain = self.csv_provider.get_option_chain(self.current_time)
-            if chain:
-                df_ce = chain['CE']
-                df_pe = chain['PE']
-                # Create instruments DF
-                inst_list = []
-                for _, row in pd.concat([df_ce, df_pe]).iterrows():
-                    inst_list.append({
-                        'symbol': row['synth_symbol'],
-                        'strike': row['Strike Price'],
-                        'lot_size': 50,
-                        'instrument_type': row['Option type'],
-                        'segment': 'NFO-OPT'
-                    })
-                self.instruments_df = pd.DataFrame(inst_list)
+            # Provider caches one instruments table per chain; just point at it
+            instruments = self.csv_provider.get_instruments(self.current_time)
+            if instruments is not None:
+                self.instruments_df = instruments
 
     def get_instruments(self) -> Any:
         return self.instruments_df
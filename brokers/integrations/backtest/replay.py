@@ -0,0 +1,224 @@
+"""Intraday tick replay from minute (or tick) level CSV files.
+
+Each input file is read lazily in chunks and turned into a time-ordered stream of
+``(ts_ns, priority, symbol, price)`` events; ``heapq.merge`` interleaves the
+streams so the whole data set never has to be in memory at once. Files must be
+sorted by timestamp individually (as exported dumps are); they do not need to be
+aligned with each other.
+
+Expected columns (case-insensitive, first match wins):
+
+* timestamp: ``timestamp``, ``datetime``, ``date``, ``time``
+* price: ``ltp``, ``last_price``, ``close``, ``price``
+* symbol (option files only): ``symbol``, ``tradingsymbol``, ``synth_symbol``
+
+Option symbols follow the synthetic ``NIFTY26FEB25000CE`` form used by the CSV
+provider.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_COLUMNS = ("timestamp", "datetime", "date", "time")
+PRICE_COLUMNS = ("ltp", "last_price", "close", "price")
+SYMBOL_COLUMNS = ("symbol", "tradingsymbol", "synth_symbol")
+
+DEFAULT_CHUNKSIZE = 200_000
+
+# At equal timestamps option prices are applied before the index tick that drives the strategy
+OPTION_PRIORITY = 0
+INDEX_PRIORITY = 1
+
+Event = Tuple[int, int, str, float]
+
+_SYMBOL_RE = re.compile(r"^(?P<prefix>[A-Z]+(?P<yy>\d{2})(?P<mon>[A-Z]{3}))(?P<strike>\d+)(?P<type>CE|PE)$")
+_MONTHS = {m: i for i, m in enumerate(("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), 1)}
+
+
+def _pick_column(columns: Iterable[str], candidates: Sequence[str], path: str, kind: str) -> str:
+    lookup = {c.strip().lower(): c for c in columns}
+    for name in candidates:
+        if name in lookup:
+            return lookup[name]
+    raise ValueError(f"{path}: no {kind} column (expected one of {', '.join(candidates)})")
+
+
+def _header(path: str) -> List[str]:
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def stream_file(
+    path: str,
+    symbol: Optional[str] = None,
+    priority: int = OPTION_PRIORITY,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[Event]:
+    """
+    Yield ``(ts_ns, priority, symbol, price)`` for each row of `path`, reading `chunksize`
+    rows at a time. With `symbol` set every row is attributed to it (index files);
+    otherwise the symbol column is used.
+    """
+    columns = _header(path)
+    ts_col = _pick_column(columns, TIMESTAMP_COLUMNS, path, "timestamp")
+    price_col = _pick_column(columns, PRICE_COLUMNS, path, "price")
+    usecols = [ts_col, price_col]
+    sym_col = None
+    if symbol is None:
+        sym_col = _pick_column(columns, SYMBOL_COLUMNS, path, "symbol")
+        usecols.append(sym_col)
+
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        ts = pd.to_datetime(chunk[ts_col]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        prices = pd.to_numeric(chunk[price_col], errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnan(prices)
+        ts = ts[valid].tolist()
+        prices = prices[valid].tolist()
+        if sym_col is None:
+            for t, p in zip(ts, prices):
+                yield (t, priority, symbol, p)
+        else:
+            symbols = chunk[sym_col].astype(str).str.strip().to_numpy()[valid].tolist()
+            for t, s, p in zip(ts, symbols, prices):
+                yield (t, priority, s, p)
+
+
+class TickReplayProvider:
+    """
+    Data source for BacktestDriver that replays intraday index and option prices.
+
+    Prices are not looked up on demand: the engine pushes every event into the
+    driver with ``set_price`` as it is replayed, so ``get_option_price`` only
+    reports "no data" for symbols that have not ticked yet.
+    """
+
+    def __init__(
+        self,
+        index_file: str,
+        option_files: Sequence[str],
+        index_symbol: str,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        lot_size: int = 50,
+        start=None,
+        end=None,
+    ) -> None:
+        self.index_file = index_file
+        self.option_files = list(option_files)
+        self.index_symbol = index_symbol
+        self.chunksize = chunksize
+        self.lot_size = lot_size
+        self._start_ns = None if start is None else pd.Timestamp(start).value
+        self._end_ns = None
+        if end is not None:
+            end = pd.Timestamp(end)
+            # A bare date means "through the end of that day"
+            if end == end.normalize():
+                end += pd.Timedelta(days=1)
+            self._end_ns = end.value
+        self.instruments = self._scan_instruments()
+        self._instrument_table = self.instruments[['symbol', 'strike', 'lot_size', 'instrument_type', 'segment']]
+        self._expiry_days, self._expiry_prefixes = self._series_expiries()
+        self._chains: Dict[str, dict] = {}
+
+    def events(self) -> Iterator[Event]:
+        """Every index and option event across all files, in timestamp order."""
+        streams = [stream_file(self.index_file, symbol=self.index_symbol, priority=INDEX_PRIORITY, chunksize=self.chunksize)]
+        streams += [stream_file(path, chunksize=self.chunksize) for path in self.option_files]
+        merged: Iterator[Event] = heapq.merge(*streams)
+        if self._start_ns is not None:
+            merged = itertools.dropwhile(lambda e: e[0] < self._start_ns, merged)
+        if self._end_ns is not None:
+            merged = itertools.takewhile(lambda e: e[0] < self._end_ns, merged)
+        return merged
+
+    def _scan_instruments(self) -> pd.DataFrame:
+        # One pass over the symbol and timestamp columns, so instruments exist before replay starts
+        last_seen: Dict[str, pd.Timestamp] = {}
+        for path in self.option_files:
+            columns = _header(path)
+            sym_col = _pick_column(columns, SYMBOL_COLUMNS, path, "symbol")
+            ts_col = _pick_column(columns, TIMESTAMP_COLUMNS, path, "timestamp")
+            for chunk in pd.read_csv(path, usecols=[sym_col, ts_col], chunksize=self.chunksize):
+                latest = pd.to_datetime(chunk[ts_col]).groupby(chunk[sym_col].astype(str).str.strip()).max()
+                for symbol, ts in latest.items():
+                    if symbol not in last_seen or ts > last_seen[symbol]:
+                        last_seen[symbol] = ts
+
+        rows = []
+        for symbol in sorted(last_seen):
+            match = _SYMBOL_RE.match(symbol)
+            if not match:
+                continue
+            rows.append({
+                'symbol': symbol,
+                'strike': int(match['strike']),
+                'lot_size': self.lot_size,
+                'instrument_type': match['type'],
+                'segment': 'NFO-OPT',
+                'prefix': match['prefix'],
+                'series': (2000 + int(match['yy'])) * 100 + _MONTHS.get(match['mon'], 0),
+                'last_seen': last_seen[symbol],
+            })
+        instruments = pd.DataFrame(rows, columns=['symbol', 'strike', 'lot_size', 'instrument_type', 'segment', 'prefix', 'series', 'last_seen'])
+        logger.info(f"Replay instruments: {len(instruments)} option symbols across {len(self.option_files)} files")
+        return instruments
+
+    def _series_expiries(self) -> Tuple[np.ndarray, List[str]]:
+        """Expiry day of every series, ascending, with the matching symbol prefixes."""
+        if self.instruments.empty:
+            return np.array([], dtype="datetime64[ns]"), []
+        # The files carry no expiry column; a series trades until its expiry, so its last day in the data stands in for it
+        expiries = (
+            self.instruments.groupby('prefix')
+            .agg(expiry=('last_seen', 'max'), series=('series', 'first'))
+            .assign(expiry=lambda df: df['expiry'].dt.normalize())
+            .sort_values(['expiry', 'series'])
+        )
+        return expiries['expiry'].to_numpy(dtype="datetime64[ns]"), expiries.index.tolist()
+
+    def near_prefix(self, timestamp) -> Optional[str]:
+        """Symbol prefix (e.g. NIFTY26FEB) of the nearest series expiring on or after `timestamp`'s day."""
+        if not self._expiry_prefixes:
+            return None
+        day = pd.Timestamp(timestamp).normalize().to_datetime64()
+        i = int(np.searchsorted(self._expiry_days, day, side="left"))
+        # Past the last expiry in the data, keep using the latest series
+        return self._expiry_prefixes[min(i, len(self._expiry_prefixes) - 1)]
+
+    # --- CSVDataProvider-compatible surface used by BacktestDriver/BacktestEngine ---
+
+    def get_index_price(self, timestamp):
+        return None
+
+    def get_option_price(self, symbol, timestamp):
+        return 0.0
+
+    def get_option_chain(self, timestamp):
+        prefix = self.near_prefix(timestamp)
+        if prefix is None:
+            return None
+        chain = self._chains.get(prefix)
+        if chain is None:
+            legs = self.instruments[self.instruments['prefix'] == prefix]
+            frames = {
+                opt_type: pd.DataFrame({
+                    'synth_symbol': legs.loc[legs['instrument_type'] == opt_type, 'symbol'],
+                    'Strike Price': legs.loc[legs['instrument_type'] == opt_type, 'strike'],
+                }).sort_values('Strike Price').reset_index(drop=True)
+                for opt_type in ("CE", "PE")
+            }
+            chain = {'CE': frames['CE'], 'PE': frames['PE'], 'prefix': prefix}
+            self._chains[prefix] = chain
+        return chain
+
+    def get_instruments(self, timestamp):
+        return self._instrument_table
@@ -0,0 +1,174 @@
+"""Read-only shared-memory copy of the backtest market data.
+
+A parent process publishes the index and option frames of a loaded
+``CSVDataProvider`` once; worker processes attach to the segments by name and
+rebuild zero-copy, read-only DataFrames on top of them. N workers then cost one
+copy of the chain data instead of N.
+
+Every column is stored as a flat NumPy buffer. Text columns are stored as
+categorical codes, with the (small) category lists carried in the handle.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import uuid
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_FRAMES = ("index_data", "ce_data", "pe_data")
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    name: str
+    shm_name: str
+    dtype: str
+    categories: Optional[Tuple] = None
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    nrows: int
+    columns: Tuple[SharedColumn, ...]
+    index_column: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SharedMarketDataHandle:
+    """Picklable description of published frames; pass this to workers."""
+
+    frames: Dict[str, Optional[SharedFrame]] = field(default_factory=dict)
+
+
+class SharedMarketData:
+    """
+    Owner of the shared-memory segments for one published provider.
+
+    Keep it alive while workers run, then call ``close()`` (or use it as a
+    context manager) to release and unlink the segments.
+    """
+
+    def __init__(self) -> None:
+        self._segments: List[shared_memory.SharedMemory] = []
+        self.handle = SharedMarketDataHandle()
+
+    @classmethod
+    def publish(cls, provider) -> "SharedMarketData":
+        owner = cls()
+        prefix = f"bt{uuid.uuid4().hex[:12]}"
+        frames: Dict[str, Optional[SharedFrame]] = {}
+        try:
+            for attr in _FRAMES:
+                df = getattr(provider, attr)
+                frames[attr] = None if df is None else owner._publish_frame(df, f"{prefix}{attr[0]}")
+        except Exception:
+            owner.close()
+            raise
+        owner.handle = SharedMarketDataHandle(frames=frames)
+        logger.info(f"Published backtest data to shared memory ({owner.nbytes / 1e6:.1f} MB)")
+        return owner
+
+    @property
+    def nbytes(self) -> int:
+        return sum(seg.size for seg in self._segments)
+
+    def _publish_frame(self, df: pd.DataFrame, prefix: str) -> SharedFrame:
+        index_column = None
+        if not isinstance(df.index, pd.RangeIndex):
+            index_column = df.index.name or "index"
+            df = df.reset_index()
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            values, categories = _column_buffer(df[name])
+            seg = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1), name=f"{prefix}{i}")
+            self._segments.append(seg)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=seg.buf)[:] = values
+            columns.append(SharedColumn(str(name), seg.name, values.dtype.str, categories))
+        return SharedFrame(nrows=len(df), columns=tuple(columns), index_column=index_column)
+
+    def close(self) -> None:
+        for seg in self._segments:
+            try:
+                seg.close()
+                seg.unlink()
+            except FileNotFoundError:
+                pass
+        self._segments = []
+
+    def __enter__(self) -> "SharedMarketData":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _column_buffer(series: pd.Series) -> Tuple[np.ndarray, Optional[Tuple]]:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cat = series.cat
+    elif series.dtype.kind in "biufM":
+        return np.ascontiguousarray(series.to_numpy()), None
+    else:
+        cat = series.astype("category").cat
+    return np.ascontiguousarray(cat.codes.to_numpy()), tuple(cat.categories.tolist())
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    # Only the publishing process owns (and unlinks) the segment. Before 3.13 attaching
+    # re-registers it with the resource tracker, which is harmless for child processes
+    # since they share the publisher's tracker.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def attach_frames(handle: SharedMarketDataHandle) -> Tuple[Dict[str, Optional[pd.DataFrame]], List[shared_memory.SharedMemory]]:
+    """
+    Rebuild the published frames as read-only views. The returned segments must be
+    kept referenced for as long as the frames are used.
+    """
+    segments: List[shared_memory.SharedMemory] = []
+    frames: Dict[str, Optional[pd.DataFrame]] = {}
+    for attr in _FRAMES:
+        spec = handle.frames.get(attr)
+        if spec is None:
+            frames[attr] = None
+            continue
+
+        data = {}
+        for col in spec.columns:
+            seg = _attach_segment(col.shm_name)
+            segments.append(seg)
+            values = np.ndarray((spec.nrows,), dtype=np.dtype(col.dtype), buffer=seg.buf)
+            values.flags.writeable = False
+            if col.categories is not None:
+                # Codes were produced by pandas on publish, so skip re-validating (and copying) them
+                data[col.name] = pd.Categorical.from_codes(
+                    values, dtype=pd.CategoricalDtype(list(col.categories)), validate=False
+                )
+            else:
+                data[col.name] = values
+
+        df = pd.DataFrame(data, copy=False)
+        if spec.index_column is not None:
+            df = df.set_index(spec.index_column)
+        frames[attr] = df
+    return frames, segments
+
+
+def attach_provider(handle: SharedMarketDataHandle):
+    """CSVDataProvider backed by the shared segments described by `handle`."""
+    from .csv_provider import CSVDataProvider
+
+    frames, segments = attach_frames(handle)
+    provider = CSVDataProvider.from_frames(frames["index_data"], frames["ce_data"], frames["pe_data"])
+    provider._shared_segments = segments
+    return provider
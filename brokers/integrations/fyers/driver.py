@@ -1,12 +1,12 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-import numpy as np
 import pandas as pd
-import requests
 
 from ...core.enums import Exchange, OrderType, ProductType, TransactionType, Validity
 from ...core.errors import AuthError, MarginUnavailableError, UnsupportedOperationError
@@ -20,10 +20,22 @@ from ...core.schemas import (
     Position,
     Quote,
 )
+from ...instruments import MasterContractCache, normalize_fyers
 from ...mappings import MappingRegistry as M
-from ...net.ratelimiter import rate_limited_fyers
+from ...net.http import get_session, post_json, timeout_for
+from ...net.ratelimiter import Priority, rate_limited_fyers
 from ...symbols.registry import SymbolRegistry
 
+logger = logging.getLogger(__name__)
+
+# Published master-contract files, one per segment
+FYERS_MASTER_SEGMENTS = ("NSE_FO", "BSE_FO", "NSE_CD", "NSE_COM", "NSE_CM", "BSE_CM", "MCX_COM")
+FYERS_MASTER_URL = "https://public.fyers.in/sym_details/{segment}.csv"
+FYERS_MASTER_DIR = os.path.join(".cache", "fyers")
+
+# The quotes endpoint accepts at most this many symbols per call
+FYERS_QUOTE_LIMIT = 50
+
 
 class FyersDriver(BrokerDriver):
     """Fyers driver using fyers_apiv3 SDK when available.
@@ -53,6 +65,8 @@ class FyersDriver(BrokerDriver):
             supports_cover_order=False,
             supports_multileg_order=True,
             supports_basket_orders=True,
+            supports_concurrent_orders=True,
+            max_quote_symbols=FYERS_QUOTE_LIMIT,
         )
         # Attempt to wire SDK if access token is provided
         self._client_id: Optional[str] = None
@@ -211,6 +225,7 @@ class FyersDriver(BrokerDriver):
             return tradingsymbol
 
     # --- Account ---
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_funds(self) -> Funds:
         if not self._fyers_model:
             return Funds(equity=0.0, available_cash=0.0, used_margin=0.0, net=0.0, raw={"s": "error", "message": "unauthenticated"})
@@ -227,6 +242,7 @@ class FyersDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return Funds(equity=0.0, available_cash=0.0, used_margin=0.0, net=0.0, raw={"s": "error", "message": str(e)})
 
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_positions(self) -> List[Position]:
         if not self._fyers_model:
             return []
@@ -283,6 +299,7 @@ class FyersDriver(BrokerDriver):
             return []
 
     # --- Orders ---
+    @rate_limited_fyers(Priority.ORDER)
     def place_order(self, request: OrderRequest) -> OrderResponse:
         if not self._fyers_model:
             return OrderResponse(status="error", order_id=None, message="unauthenticated")
@@ -330,6 +347,7 @@ class FyersDriver(BrokerDriver):
                     pass
             return OrderResponse(status="error", order_id=None, message=str(e))
 
+    @rate_limited_fyers(Priority.CANCEL)
     def cancel_order(self, order_id: str) -> OrderResponse:
         if not self._fyers_model:
             return OrderResponse(status="error", order_id=order_id, message="unauthenticated")
@@ -339,6 +357,7 @@ class FyersDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=order_id, message=str(e))
 
+    @rate_limited_fyers(Priority.ORDER)
     def modify_order(self, order_id: str, updates: Dict[str, Any]) -> OrderResponse:
         if not self._fyers_model:
             return OrderResponse(status="error", order_id=order_id, message="unauthenticated")
@@ -350,6 +369,7 @@ class FyersDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return OrderResponse(status="error", order_id=order_id, message=str(e))
 
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_orderbook(self) -> List[Dict[str, Any]]:
         if not self._fyers_model:
             return []
@@ -361,6 +381,7 @@ class FyersDriver(BrokerDriver):
         except Exception:
             return []
 
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_tradebook(self) -> List[Dict[str, Any]]:
         if not self._fyers_model:
             return []
@@ -373,6 +394,7 @@ class FyersDriver(BrokerDriver):
             return []
 
     # --- Market data ---
+    @rate_limited_fyers(Priority.QUOTE)
     def get_quote(self, symbol: str) -> Quote:
         if not self._fyers_model:
             return Quote(symbol=symbol.split(":", 1)[-1].replace("-EQ", ""), exchange=Exchange.NSE, last_price=0.0, raw={"s": "error", "message": "unauthenticated"})
@@ -393,6 +415,7 @@ class FyersDriver(BrokerDriver):
             resp = {"s": "error"}
         return Quote(symbol=full.split(":", 1)[1].replace("-EQ", ""), exchange=exchange, last_price=last_price, raw=resp if isinstance(resp, dict) else None)
 
+    @rate_limited_fyers(Priority.QUOTE)
     def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:  # type: ignore[override]
         if not self._fyers_model:
             return {}
@@ -421,6 +444,7 @@ class FyersDriver(BrokerDriver):
             return out
         return out
 
+    @rate_limited_fyers(Priority.QUOTE)
     def get_history(self, symbol: str, interval: str, start: str, end: str, oi: bool = False) -> List[Dict[str, Any]]:
         if not self._fyers_model:
             return []
@@ -487,38 +511,57 @@ class FyersDriver(BrokerDriver):
             return []
 
     # --- Instruments ---
-    def download_instruments(self) -> None:
-        self.master_contract_urls = [
-            "https://public.fyers.in/sym_details/NSE_FO.csv", 
-            "https://public.fyers.in/sym_details/BSE_FO.csv", 
-            "https://public.fyers.in/sym_details/NSE_CD.csv", 
-            "https://public.fyers.in/sym_details/NSE_COM.csv", 
-            "https://public.fyers.in/sym_details/NSE_CM.csv", 
-            "https://public.fyers.in/sym_details/BSE_CM.csv", 
-            "https://public.fyers.in/sym_details/MCX_COM.csv"
-            ]
-        self.master_contract_df = None
-        self.cache_file = ".cache/fyers_master_contract.csv"
-        
-        # Instrument type mapping
-        self.instrument_types = {
-            14: "INDEX",  # Index instruments
-            15: "STOCK"   # Stock instruments
-        }
-        response_text = ""
-        # Download the CSV file
-        for url in self.master_contract_urls:
-            response_temp = requests.get(url, timeout=30)
-            response_temp.raise_for_status()
-            response_text += response_temp.text
-
-        # Save to file
-        if not os.path.exists(os.path.dirname(self.cache_file)):
-            os.makedirs(os.path.dirname(self.cache_file))
-            
-        with open(self.cache_file, 'w') as f:
-            f.write(response_text)
-        
+    def download_instruments(self, force: bool = False, segments: Optional[Sequence[str]] = None) -> None:
+        """
+        Load the master contract for `segments` (default: all of FYERS_MASTER_SEGMENTS).
+
+        Each segment is cached separately for the trading day; the stale ones are
+        downloaded concurrently, streamed to disk and parsed in parallel.
+        """
+        wanted = [s.upper() for s in (segments or FYERS_MASTER_SEGMENTS)]
+        unknown = sorted(set(wanted) - set(FYERS_MASTER_SEGMENTS))
+        if unknown:
+            raise ValueError(f"Unknown Fyers master segments: {', '.join(unknown)}")
+        wanted = [s for s in FYERS_MASTER_SEGMENTS if s in wanted]
+
+        caches = {seg: MasterContractCache(f"fyers_{seg}") for seg in wanted}
+        frames: Dict[str, pd.DataFrame] = {}
+        if not force:
+            for seg, cache in caches.items():
+                df = cache.load()
+                if df is not None:
+                    frames[seg] = df
+        stale = [seg for seg in wanted if seg not in frames]
+        if stale:
+            downloaded = self._download_master_contract(stale)
+            for seg, df in downloaded.items():
+                caches[seg].save(df)
+            frames.update(downloaded)
+            logger.info(f"Downloaded Fyers master contract for {', '.join(stale)}")
+
+        self.master_contract_df = pd.concat([frames[seg] for seg in wanted], ignore_index=True)
+
+    def _download_master_contract(self, segments: Sequence[str]) -> Dict[str, pd.DataFrame]:
+        """Fetch and parse `segments` concurrently over the pooled Fyers session."""
+        os.makedirs(FYERS_MASTER_DIR, exist_ok=True)
+        session = get_session("fyers")
+        with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="fyers-master") as pool:
+            futures = {seg: pool.submit(self._fetch_segment, session, seg) for seg in segments}
+            return {seg: future.result() for seg, future in futures.items()}
+
+    def _fetch_segment(self, session: Any, segment: str) -> pd.DataFrame:
+        path = os.path.join(FYERS_MASTER_DIR, f"{segment}.csv")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with session.get(FYERS_MASTER_URL.format(segment=segment), stream=True, timeout=timeout_for("download")) as response:
+            response.raise_for_status()
+            with open(tmp, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+        os.replace(tmp, path)
+        return self._parse_master_contract(path)
+
+    @staticmethod
+    def _parse_master_contract(path: str) -> pd.DataFrame:
         # Define column headers
         headers = [
             "Fytoken", "Symbol Details", "Exchange Instrument type", "Minimum lot size",
@@ -547,40 +590,17 @@ class FyersDriver(BrokerDriver):
         }
 
         # Read as DataFrame with headers
-        df = pd.read_csv(self.cache_file, names=headers, header=None)
+        df = pd.read_csv(path, names=headers, header=None, usecols=list(header_mapping.keys()))
         df = df[header_mapping.keys()]
 
         df.columns = header_mapping.values()
-        df['instrument_type'] = df['instrument_type'].map(self.instrument_types) # MAPPING TO STOCK/INDEX TODO - NOT USED MAYBE
-        df['instrument_type'] = df['symbol'].apply(lambda x: 'FUT' if x.endswith("FUT") else 'CE' if x.endswith("CE") else 'PE' if x.endswith("PE") else 'EQ')
-        df['expiry'] = pd.to_datetime(df['expiry'], unit='s', errors='coerce')
-        df['expiry'] = df['expiry'].apply(lambda x: pd.to_datetime(x).date() if not pd.isna(x) else np.nan)
-        df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
-        # Updating Segment matching to match with what we have in the zerodha
-        def segment_mapping(x):
-            if x.endswith("FUT"):
-                if x.startswith("NSE"):
-                    return "NFO-FUT"
-                elif x.startswith("BSE"):
-                    return "BFO-FUT"
-            elif x.endswith("CE") or x.endswith("PE"):
-                if x.startswith("NSE"):
-                    return "NFO-OPT"
-                elif x.startswith("BSE"):
-                    return "BFO-OPT"
-            else:
-                if x.startswith("NSE"):
-                    return "NSE"
-                elif x.startswith("BSE"):
-                    return "BSE"
-        df['segment'] = df['symbol'].apply(segment_mapping)
-        df.to_csv(self.cache_file, index=False)
-        self.master_contract_df = df
+        return normalize_fyers(df)
 
     def get_instruments(self) -> List[Instrument]:
         return self.master_contract_df
 
     # --- Option chain ---
+    @rate_limited_fyers(Priority.QUOTE)
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:
         if not self._fyers_model:
             return []
@@ -685,6 +705,26 @@ class FyersDriver(BrokerDriver):
         except Exception:
             return
 
+    def normalize_ticks(self, message: Any) -> List[Dict[str, Any]]:  # type: ignore[override]
+        # SymbolUpdate messages arrive one dict per symbol, or as a list of them
+        items = message if isinstance(message, list) else [message]
+        out: List[Dict[str, Any]] = []
+        for item in items:
+            if not isinstance(item, dict) or "symbol" not in item or item.get("ltp") is None:
+                continue
+            try:
+                feed_time = item.get("exch_feed_time") or item.get("last_traded_time")
+                out.append({
+                    "symbol": item["symbol"],
+                    "price": float(item["ltp"]),
+                    "bid": item.get("bid_price"),
+                    "ask": item.get("ask_price"),
+                    "timestamp": datetime.fromtimestamp(feed_time) if feed_time else None,
+                })
+            except Exception:
+                continue
+        return out
+
     def connect_order_websocket(
         self,
         *,
@@ -759,6 +799,7 @@ class FyersDriver(BrokerDriver):
             return
 
     # --- Margins ---
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_margins_required(self, orders: List[Dict[str, Any]] | List[OrderRequest]) -> Any:
         # Policy: must fetch from broker; try HTTP endpoint if SDK lacks method
         # Sanitize payload to Fyers expected shape
@@ -807,14 +848,12 @@ class FyersDriver(BrokerDriver):
         # Prefer SDK method if present (not exposed in v3), then HTTP
         try:
             if getattr(self, "_access_token", None) and getattr(self, "_client_id", None):
-                from ...net.http import post_json
-
                 url = "https://api-t1.fyers.in/api/v3/multiorder/margin"
                 headers = {
                     "Authorization": f"{self._client_id}:{self._access_token}",
                     "Content-Type": "application/json",
                 }
-                resp = post_json(url, headers=headers, json={"data": sanitized})
+                resp = post_json(url, headers=headers, json={"data": sanitized}, broker="fyers", endpoint="margin")
                 return resp
         except Exception as e:  # noqa: BLE001
             raise MarginUnavailableError(f"Fyers margins failed: {e}") from e
@@ -870,13 +909,12 @@ class FyersDriver(BrokerDriver):
             if getattr(self, "_access_token", None) and getattr(self, "_client_id", None):
                 # Match legacy implementation payload formatting
                 import json as _json
-                import requests as _requests  # type: ignore
                 url = "https://api.fyers.in/api/v2/span_margin"
                 headers = {
                     "Authorization": f"{self._client_id}:{self._access_token}",
                     "Content-Type": "application/json",
                 }
-                resp = _requests.post(url, headers=headers, data=_json.dumps({"data": sanitized}), timeout=30)
+                resp = get_session("fyers").post(url, headers=headers, data=_json.dumps({"data": sanitized}), timeout=timeout_for("margin"))
                 try:
                     resp.raise_for_status()
                     return resp.json()
@@ -891,6 +929,7 @@ class FyersDriver(BrokerDriver):
         return self.get_margins_required(orders)
 
     # --- Profile ---
+    @rate_limited_fyers(Priority.DEFAULT)
     def get_profile(self) -> Dict[str, Any]:
         if not self._fyers_model:
             return {"s": "error", "message": "unauthenticated"}
@@ -906,6 +945,7 @@ class FyersDriver(BrokerDriver):
         raise UnsupportedOperationError("FyersDriver.convert_position not implemented yet in brokers2")
 
     # --- Basket orders ---
+    @rate_limited_fyers(Priority.ORDER)
     def place_basket_orders(self, requests: List[OrderRequest]) -> List[OrderResponse]:  # type: ignore[override]
         if not self._fyers_model:
             return [OrderResponse(status="error", order_id=None, message="unauthenticated")]
@@ -923,15 +963,16 @@ class FyersDriver(BrokerDriver):
                     "validity": M.validity["fyers"][r.validity],
                     "disclosedQty": 0,
                     "offlineOrder": False,
+                    "orderTag": r.tag,
+                    **(r.extras or {}),
                 }
             )
         try:
             # If SDK supports basket
             if hasattr(self._fyers_model, "place_basket_orders"):
                 resp = getattr(self._fyers_model, "place_basket_orders")(payloads)
-                if isinstance(resp, dict) and resp.get("s") == "ok":
-                    oid = str(resp.get("id") or resp.get("order_id"))
-                    return [OrderResponse(status="ok", order_id=oid, raw=resp) for _ in payloads]
+                if isinstance(resp, dict):
+                    return self._parse_basket_response(resp, len(payloads))
                 return [OrderResponse(status="error", order_id=None, message=str(resp))]
             # Fallback: individual placement
             results: List[OrderResponse] = []
@@ -945,4 +986,27 @@ class FyersDriver(BrokerDriver):
         except Exception as e:  # noqa: BLE001
             return [OrderResponse(status="error", order_id=None, message=str(e))]
 
+    @staticmethod
+    def _parse_basket_response(resp: Dict[str, Any], count: int) -> List[OrderResponse]:
+        """
+        One OrderResponse per basket leg. Fyers answers with a ``data`` list, in order,
+        of per-order results: ``{"statusCode": ..., "body": {"s": ..., "id": ..., "message": ...}}``.
+        """
+        legs = resp.get("data")
+        if not isinstance(legs, list) or len(legs) != count:
+            if resp.get("s") != "ok":
+                return [OrderResponse(status="error", order_id=None, message=str(resp.get("message") or resp), raw=resp)]
+            # Older single-id shape: the basket was accepted as a whole
+            oid = resp.get("id") or resp.get("order_id")
+            return [OrderResponse(status="ok", order_id=str(oid) if oid else None, raw=resp) for _ in range(count)]
+        results: List[OrderResponse] = []
+        for leg in legs:
+            body = leg.get("body", leg) if isinstance(leg, dict) else {}
+            oid = body.get("id") or body.get("order_id")
+            status = "ok" if body.get("s") == "ok" else "error"
+            results.append(
+                OrderResponse(status=status, order_id=str(oid) if oid else None, message=body.get("message"), raw=body)
+            )
+        return results
+
 
@@ -222,8 +222,8 @@ class FyrodhaDriver(BrokerDriver):
         return candles
 
     # --- Instruments ---
-    def download_instruments(self) -> None:
-        self._seed_fyers.download_instruments()
+    def download_instruments(self, **kwargs: Any) -> None:
+        self._seed_fyers.download_instruments(**kwargs)
 
     def get_instruments(self) -> List[Instrument]:
         return self._seed_fyers.get_instruments()
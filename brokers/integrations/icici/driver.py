@@ -1,10 +1,10 @@
 import logging
-import time
 from typing import Dict, Any, List
-import requests
 
 from ...core.interface import BrokerDriver
-from ...core.models import OrderRequest
+from ...core.schemas import OrderRequest, OrderResponse
+from ...net.http import get_session, timeout_for
+from ...net.ratelimiter import ICICI_LIMITS, Priority, get_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +14,13 @@ class ICICIDriver(BrokerDriver):
     Ensures zero analytic tracking and enforces internal rate limits.
     """
     def __init__(self, app_key: str = None, secret_key: str = None, session_token: str = None):
+        super().__init__()
+        self.capabilities.supports_concurrent_orders = True
         self.app_key = app_key
         self.secret_key = secret_key
         self.session_token = session_token
-        self.session = requests.Session()
+        # Pooled keep-alive session per app key (connection reuse, retries on idempotent calls)
+        self.session = get_session(f"icici:{app_key or 'default'}")
         
         # Strip telemetry
         self.session.headers.update({
@@ -26,16 +29,12 @@ class ICICIDriver(BrokerDriver):
         })
         
         self.base_url = "https://api.icicidirect.com/breezeapi/api/v1"
-        self.last_api_call = 0
-        self.RATE_LIMIT_DELAY = 0.5 # 2 calls per second max
+        # One budget per app key, shared by every endpoint and thread (2 calls per second max)
+        self._limiter = get_limiter(f"icici:{app_key or 'default'}", **ICICI_LIMITS)
 
-    def _rate_limit(self):
+    def _rate_limit(self, priority: Priority = Priority.DEFAULT):
         """Internal queue enforcement to prevent HTTP 429s"""
-        now = time.time()
-        elapsed = now - self.last_api_call
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self.last_api_call = time.time()
+        self._limiter.acquire(priority)
 
     def connect(self) -> bool:
         logger.info("Connecting to ICICIDirect (Zero Telemetry Mode)")
@@ -46,12 +45,12 @@ class ICICIDriver(BrokerDriver):
         return True
 
     def get_quote(self, symbol: str) -> Dict[str, Any]:
-        self._rate_limit()
+        self._rate_limit(Priority.QUOTE)
         try:
             # Requires mapping standard NFO symbol to ICICI convention
             url = f"{self.base_url}/quotes"
             payload = {"stock_code": symbol, "exchange_code": "NFO"}
-            response = self.session.get(url, json=payload)
+            response = self.session.get(url, json=payload, timeout=timeout_for("quote"))
             if response.status_code == 200:
                 data = response.json().get('Success', [{}])[0]
                 return {
@@ -64,8 +63,8 @@ class ICICIDriver(BrokerDriver):
             logger.error(f"ICICI Quote Error: {str(e)}")
             return {"symbol": symbol, "last_price": 0.0}
 
-    def place_order(self, request: OrderRequest) -> Dict[str, Any]:
-        self._rate_limit()
+    def place_order(self, request: OrderRequest) -> OrderResponse:
+        self._rate_limit(Priority.ORDER)
         url = f"{self.base_url}/order"
         payload = {
             "stock_code": request.symbol, # Mapping needed here
@@ -80,23 +79,26 @@ class ICICIDriver(BrokerDriver):
         }
         
         try:
-            response = self.session.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=timeout_for("order"))
             if response.status_code == 200:
                 data = response.json()
-                return {"status": "success", "order_id": data.get("Success", {}).get("order_id", -1)}
+                order_id = data.get("Success", {}).get("order_id")
+                return OrderResponse(status="ok", order_id=str(order_id) if order_id is not None else None, raw=data)
             else:
                 logger.error(f"ICICI Order Refused: {response.text}")
-                return {"status": "error", "order_id": -1, "message": response.text}
+                return OrderResponse(status="error", order_id=None, message=response.text)
         except Exception as e:
             logger.error(f"ICICI Order Exception: {str(e)}")
-            return {"status": "error", "order_id": -1, "message": str(e)}
+            return OrderResponse(status="error", order_id=None, message=str(e))
 
-    def cancel_order(self, order_id: str) -> bool:
-        self._rate_limit()
+    def cancel_order(self, order_id: str) -> OrderResponse:
+        self._rate_limit(Priority.CANCEL)
         url = f"{self.base_url}/order"
         payload = {"order_id": order_id}
-        response = self.session.delete(url, json=payload)
-        return response.status_code == 200
+        response = self.session.delete(url, json=payload, timeout=timeout_for("order"))
+        if response.status_code == 200:
+            return OrderResponse(status="ok", order_id=str(order_id))
+        return OrderResponse(status="error", order_id=str(order_id), message=response.text)
 
     def download_instruments(self) -> None:
         logger.info("Mock Downloading ICICIDirect Instruments locally.")
@@ -108,7 +110,7 @@ class ICICIDriver(BrokerDriver):
     def get_positions(self) -> List[Dict[str, Any]]:
         self._rate_limit()
         url = f"{self.base_url}/portfolio/positions"
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=timeout_for())
         if response.status_code == 200:
             data = response.json().get('Success', [])
             return [{"symbol": pos['stock_code'], "quantity_total": int(pos['quantity'])} for pos in data]
@@ -3,7 +3,8 @@ from typing import Dict, Any, List
 import requests
 
 from ...core.interface import BrokerDriver
-from ...core.models import OrderRequest
+from ...core.schemas import OrderRequest, OrderResponse
+from ...net.http import get_session, timeout_for
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +27,13 @@ class UpstoxDriver(BrokerDriver):
     Upstox integration ensuring pure execution without analytics APIs.
     """
     def __init__(self, api_key: str = None, api_secret: str = None, redirect_uri: str = None):
+        super().__init__()
+        self.capabilities.supports_concurrent_orders = True
         self.api_key = api_key
         self.api_secret = api_secret
         self.redirect_uri = redirect_uri
-        self.session = TelemetryStrippedSession()
+        # Pooled keep-alive session per API key (connection reuse, retries on idempotent calls)
+        self.session = get_session(f"upstox:{api_key or 'default'}", session_cls=TelemetryStrippedSession)
         self.access_token = None
         self.base_url = "https://api.upstox.com/v2"
 
@@ -45,7 +49,7 @@ class UpstoxDriver(BrokerDriver):
         """Fetch LTP and Best Bid/Ask without websocket tracking"""
         try:
             url = f"{self.base_url}/market-quote/quotes?instrumentKey={symbol}"
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=timeout_for("quote"))
             if response.status_code == 200:
                 data = response.json().get('data', {})
                 return {
@@ -58,7 +62,7 @@ class UpstoxDriver(BrokerDriver):
             logger.error(f"Upstox Quote Error: {str(e)}")
             return {"symbol": symbol, "last_price": 0.0}
 
-    def place_order(self, request: OrderRequest) -> Dict[str, Any]:
+    def place_order(self, request: OrderRequest) -> OrderResponse:
         """Places standard equity/FNO orders"""
         url = f"{self.base_url}/order/place"
         payload = {
@@ -76,21 +80,24 @@ class UpstoxDriver(BrokerDriver):
         }
         
         try:
-            response = self.session.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=timeout_for("order"))
             if response.status_code == 200:
                 data = response.json()
-                return {"status": "success", "order_id": data.get("data", {}).get("order_id", -1)}
+                order_id = data.get("data", {}).get("order_id")
+                return OrderResponse(status="ok", order_id=str(order_id) if order_id is not None else None, raw=data)
             else:
                 logger.error(f"Upstox Order Refused: {response.text}")
-                return {"status": "error", "order_id": -1, "message": response.text}
+                return OrderResponse(status="error", order_id=None, message=response.text)
         except Exception as e:
             logger.error(f"Upstox Order Exception: {str(e)}")
-            return {"status": "error", "order_id": -1, "message": str(e)}
+            return OrderResponse(status="error", order_id=None, message=str(e))
 
-    def cancel_order(self, order_id: str) -> bool:
+    def cancel_order(self, order_id: str) -> OrderResponse:
         url = f"{self.base_url}/order/cancel?order_id={order_id}"
-        response = self.session.delete(url)
-        return response.status_code == 200
+        response = self.session.delete(url, timeout=timeout_for("order"))
+        if response.status_code == 200:
+            return OrderResponse(status="ok", order_id=str(order_id))
+        return OrderResponse(status="error", order_id=str(order_id), message=response.text)
 
     def download_instruments(self) -> None:
         """Cached locally to avoid repeated remote fetches"""
@@ -102,7 +109,7 @@ class UpstoxDriver(BrokerDriver):
 
     def get_positions(self) -> List[Dict[str, Any]]:
         url = f"{self.base_url}/portfolio/short-term-positions"
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=timeout_for())
         if response.status_code == 200:
             data = response.json().get('data', [])
             # Map upstox specific syntax to uniform struct
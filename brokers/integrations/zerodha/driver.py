@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
-import os
+import logging
 from typing import Any, Dict, List, Optional
 from urllib import request
 
@@ -17,9 +16,15 @@ from ...core.schemas import (
     Position,
     Quote,
 )
+from ...instruments import InstrumentIndex, MasterContractCache, normalize_zerodha
 from ...mappings import MappingRegistry as M
+from ...net.http import pool_options
 import pandas as pd
-import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# kite.quote accepts at most this many instruments per call
+KITE_QUOTE_LIMIT = 500
 
 class ZerodhaDriver(BrokerDriver):
     """Zerodha driver using kiteconnect when available.
@@ -48,7 +53,9 @@ class ZerodhaDriver(BrokerDriver):
             supports_bracket_order=False,
             supports_cover_order=True,
             supports_multileg_order=False,
-            supports_basket_orders=True,
+            supports_basket_orders=False,  # Kite has no basket placement endpoint
+            supports_concurrent_orders=True,
+            max_quote_symbols=KITE_QUOTE_LIMIT,
         )
         self._kite = None  # kiteconnect client if available
         self._kite_ws = None
@@ -63,7 +70,7 @@ class ZerodhaDriver(BrokerDriver):
             try:  # pragma: no cover - external package
                 from kiteconnect import KiteConnect  # type: ignore
 
-                kite = KiteConnect(api_key=api_key)
+                kite = KiteConnect(api_key=api_key, pool=pool_options())
                 kite.set_access_token(access_token)
                 self._kite = kite
             except Exception:
@@ -88,7 +95,7 @@ class ZerodhaDriver(BrokerDriver):
                     api_key2 = api_key or os.getenv("KITE_API_KEY") or os.getenv("ZERODHA_API_KEY")
                     api_secret = os.getenv("BROKER_API_SECRET") or os.getenv("KITE_API_SECRET") or os.getenv("ZERODHA_API_SECRET")
                     if api_key2 and api_secret:
-                        kite2 = KiteConnect(api_key=api_key2)
+                        kite2 = KiteConnect(api_key=api_key2, pool=pool_options())
                         url = kite2.login_url()
                         request_token = manual_exchange_request_token(url)
                         sess = kite2.generate_session(request_token, api_secret)
@@ -157,7 +164,7 @@ class ZerodhaDriver(BrokerDriver):
                 return None
             request_token = connect_resp.url.split("request_token=")[1].split("&")[0]
 
-            kite = KiteConnect(api_key=api_key)
+            kite = KiteConnect(api_key=api_key, pool=pool_options())
             sess = kite.generate_session(request_token, api_secret)
             access_token = sess.get("access_token")
             if not access_token:
@@ -304,6 +311,31 @@ class ZerodhaDriver(BrokerDriver):
         exch, tradingsymbol = symbol.split(":", 1)
         return Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw=data)
 
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:  # type: ignore[override]
+        if not self._kite:
+            return {}
+        out: Dict[str, Quote] = {}
+        for i in range(0, len(symbols), KITE_QUOTE_LIMIT):
+            chunk = symbols[i:i + KITE_QUOTE_LIMIT]
+            try:
+                data = self._kite.quote(chunk)
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Kite quote batch of {len(chunk)} symbols failed, quoting them one by one: {e}")
+                for symbol in chunk:
+                    try:
+                        out[symbol] = self.get_quote(symbol)
+                    except Exception as e2:  # noqa: BLE001
+                        logger.error(f"Kite quote for {symbol} failed: {e2}")
+                continue
+            for key, payload in (data or {}).items():
+                try:
+                    exch, tradingsymbol = key.split(":", 1)
+                    last_price = float(payload.get("last_price", 0.0))
+                    out[key] = Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw={key: payload})
+                except Exception:
+                    continue
+        return out
+
     def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:
         if not self._kite:
             return []
@@ -325,20 +357,10 @@ class ZerodhaDriver(BrokerDriver):
         if interval_kite is None:
             raise Exception(f"Invalid interval: {interval}")
         try:
-            try:
-                instruments = self._kite.instruments(exch)
-            except Exception:
-                instruments = self._kite.instruments()
-            token = None
-            for inst in instruments:
-                if inst.get("exchange") == exch and inst.get("tradingsymbol") == tradingsymbol:
-                    token = inst.get("instrument_token")
-                    break
+            index = self._token_index()
+            token = index.token(symbol)
             if token is None and exch == "NSE":
-                for inst in self._kite.instruments("NFO"):
-                    if inst.get("tradingsymbol") == tradingsymbol:
-                        token = inst.get("instrument_token")
-                        break
+                token = index.token(f"NFO:{tradingsymbol}")
             if token is None:
                 return []
             data = self._kite.historical_data(token, from_date=start, to_date=end, interval=interval_kite)
@@ -367,7 +389,12 @@ class ZerodhaDriver(BrokerDriver):
             return []
 
     # --- Instruments ---
-    def download_instruments(self) -> None:
+    def download_instruments(self, force: bool = False) -> None:
+        """Load the master contract from today's cache, downloading only when it is stale (or `force`)."""
+        self.master_contract_df = MasterContractCache("zerodha").get_or_download(self._download_master_contract, force=force)
+        return self.master_contract_df
+
+    def _download_master_contract(self) -> pd.DataFrame:
         df = pd.DataFrame(self._kite.instruments())
         columns = ["instrument_token", "exchange_token", "tradingsymbol", "name", "last_price", "expiry", "strike", "tick_size", "lot_size", "instrument_type", "segment", "exchange"]
         header_mapping = {
@@ -386,18 +413,17 @@ class ZerodhaDriver(BrokerDriver):
         }
         df = df[columns]
         df.columns = list(header_mapping.values())
-        df['expiry'] = pd.to_datetime(df['expiry']).dt.date
-        df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
-        self.master_contract_df = df
-        self.cache_file = ".cache/zerodha_master_contract.csv"
-        if not os.path.exists(os.path.dirname(self.cache_file)):
-            os.makedirs(os.path.dirname(self.cache_file))
-        df.to_csv(self.cache_file, index=False)
-        return df
+        return normalize_zerodha(df)
 
     def get_instruments(self) -> List[Instrument]:
         return self.master_contract_df
 
+    def _token_index(self) -> InstrumentIndex:
+        # EXCH:SYMBOL <-> instrument_token, from the cached master (loaded on first use)
+        if getattr(self, "master_contract_df", None) is None:
+            self.download_instruments()
+        return self.get_instrument_index()
+
     # --- Option chain ---
     def get_option_chain(self, underlying: str, exchange: str, **kwargs: Any) -> List[Dict[str, Any]]:
         if not self._kite:
@@ -459,27 +485,17 @@ class ZerodhaDriver(BrokerDriver):
             return
 
     def symbols_to_subscribe(self, symbols: List[str]) -> None:  # type: ignore[override]
-        # Zerodha expects instrument tokens. We need to map EXCH:SYMBOL to tokens using instruments API.
+        # Zerodha expects instrument tokens; EXCH:SYMBOL is mapped through the master-contract index.
         if not self._kite_ws or not self._kite:
             return
         try:
-            instruments = []
-            try:
-                instruments = self._kite.instruments()
-            except Exception:
-                instruments = []
-            index: Dict[str, int] = {}
-            for inst in instruments:
-                key = f"{inst.get('exchange')}:{inst.get('tradingsymbol')}"
-                tok = inst.get("instrument_token")
-                if key and tok is not None:
-                    index[key] = int(tok)
+            index = self._token_index()
             tokens: List[int] = []
             for s in symbols:
                 if isinstance(s, int):
                     tokens.append(int(s))
                 elif isinstance(s, str) and ":" in s:
-                    tok = index.get(s)
+                    tok = index.token(s)
                     if tok is not None:
                         tokens.append(int(tok))
             if tokens:
@@ -489,6 +505,30 @@ class ZerodhaDriver(BrokerDriver):
         except Exception:
             return
 
+    def normalize_ticks(self, message: Any) -> List[Dict[str, Any]]:  # type: ignore[override]
+        if getattr(self, "master_contract_df", None) is None:
+            return []
+        index = self.get_instrument_index()
+        out: List[Dict[str, Any]] = []
+        for tick in message or []:
+            try:
+                instrument = index.by_token(tick.get("instrument_token"))
+                if instrument is None or tick.get("last_price") is None:
+                    continue
+                depth = tick.get("depth") or {}
+                buy = depth.get("buy") or [{}]
+                sell = depth.get("sell") or [{}]
+                out.append({
+                    "symbol": f"{instrument['exchange']}:{instrument['symbol']}",
+                    "price": float(tick["last_price"]),
+                    "bid": buy[0].get("price"),
+                    "ask": sell[0].get("price"),
+                    "timestamp": tick.get("exchange_timestamp") or tick.get("last_trade_time"),
+                })
+            except Exception:
+                continue
+        return out
+
     def connect_order_websocket(
         self,
         *,
@@ -1,7 +1,16 @@
 """Networking helpers: rate limiter and HTTP client wrappers."""
 
-from .ratelimiter import rate_limited, rate_limited_fyers
+from .ratelimiter import Priority, RateLimiter, get_limiter, limiter_stats, rate_limited, rate_limited_fyers
+from .async_http import AsyncHTTPClient
 
-__all__ = ["rate_limited", "rate_limited_fyers"]
+__all__ = [
+    "Priority",
+    "RateLimiter",
+    "get_limiter",
+    "limiter_stats",
+    "rate_limited",
+    "rate_limited_fyers",
+    "AsyncHTTPClient",
+]
 
 
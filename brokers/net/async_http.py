@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from ..core.errors import HTTPError
+from .http import DEFAULT_TIMEOUT, POOL_SIZE
+
+
+def _aiohttp():  # lazy import to avoid hard dependency if unused
+    try:  # pragma: no cover - optional dependency
+        import aiohttp  # type: ignore
+
+        return aiohttp
+    except Exception as e:  # pragma: no cover
+        raise HTTPError("'aiohttp' is required for async HTTP operations") from e
+
+
+class AsyncHTTPClient:
+    """
+    Keep-alive aiohttp session shared by a driver's awaitable calls.
+
+    The session is created on first use inside the running event loop and reused
+    for every request, so connections (and TLS sessions) are pooled.
+    """
+
+    def __init__(
+        self,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        pool_size: int = POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session: Any = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _get_session(self) -> Any:
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                aiohttp = _aiohttp()
+                self._session = aiohttp.ClientSession(
+                    headers=self.headers,
+                    connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+        return self._session
+
+    async def request_json(self, method: str, url: str, *, timeout: Optional[float] = None, **kwargs: Any) -> Dict[str, Any]:
+        session = await self._get_session()
+        if timeout is not None:
+            kwargs["timeout"] = _aiohttp().ClientTimeout(total=timeout)
+        try:
+            async with session.request(method, url, **kwargs) as r:
+                r.raise_for_status()
+                return await r.json(content_type=None)
+        except Exception as e:  # noqa: BLE001
+            raise HTTPError(f"{method} {url} failed: {e}") from e
+
+    async def get_json(self, url: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self.request_json("GET", url, headers=headers, params=params, timeout=timeout)
+
+    async def post_json(self, url: str, *, headers: Optional[Dict[str, str]] = None, json: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self.request_json("POST", url, headers=headers, json=json, timeout=timeout)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import os
+import random
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
 
 from ..core.errors import HTTPError
 
 
 DEFAULT_TIMEOUT = 15
 
+# (connect, read) timeouts in seconds per kind of endpoint
+ENDPOINT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "default": (5.0, DEFAULT_TIMEOUT),
+    "order": (3.05, 10.0),
+    "quote": (3.05, 5.0),
+    "margin": (5.0, 30.0),
+    "download": (5.0, 60.0),
+}
+
+# Keep-alive connections kept per host in each broker session
+POOL_SIZE = int(os.getenv("BROKERS_HTTP_POOL_SIZE", "20") or 20)
+# Every request is retried on connection errors (nothing reached the broker yet).
+# Read timeouts and 429/5xx are retried only for reads: an order call (POST, or
+# Kite's PUT modify / DELETE cancel) may have been executed when they happen.
+RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+Timeout = Union[float, Tuple[float, float]]
+
 
 def _requests():  # lazy import to avoid hard dependency if unused
     try:  # pragma: no cover - optional dependency
@@ -17,23 +41,114 @@ def _requests():  # lazy import to avoid hard dependency if unused
         raise HTTPError("'requests' is required for HTTP operations") from e
 
 
-def get_json(url: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    requests = _requests()
+def timeout_for(endpoint: str = "default") -> Tuple[float, float]:
+    return ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["default"])
+
+
+def _retry() -> Any:
+    from urllib3.util.retry import Retry  # type: ignore
+
+    class JitteredRetry(Retry):
+        """Exponential backoff plus up to one backoff step of random jitter, so clients do not retry in lockstep."""
+
+        def get_backoff_time(self) -> float:
+            base = super().get_backoff_time()
+            return base + random.uniform(0, self.backoff_factor) if self.history else base
+
+    return JitteredRetry(
+        total=RETRIES,
+        connect=RETRIES,
+        read=RETRIES,
+        status=RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=READ_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def pool_options(pool_size: int = POOL_SIZE) -> Dict[str, Any]:
+    """HTTPAdapter keyword arguments for a tuned pool (also accepted by KiteConnect's `pool`)."""
+    return {"pool_connections": 4, "pool_maxsize": pool_size, "max_retries": _retry(), "pool_block": False}
+
+
+def mount_pool(session: Any, pool_size: int = POOL_SIZE) -> Any:
+    """Mount pooled, retrying adapters on `session` and return it."""
+    HTTPAdapter = _requests().adapters.HTTPAdapter
+    adapter = HTTPAdapter(**pool_options(pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_sessions: Dict[str, Any] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name: str = "default", *, session_cls: Any = None, pool_size: int = POOL_SIZE) -> Any:
+    """
+    Keep-alive session shared by every caller using `name` (a broker, or broker
+    and account), so repeated calls reuse pooled TCP/TLS connections.
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            cls = session_cls or _requests().Session
+            session = _sessions[name] = mount_pool(cls(), pool_size)
+        return session
+
+
+def close_sessions() -> None:
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    broker: str = "default",
+    endpoint: str = "default",
+    timeout: Optional[Timeout] = None,
+    **kwargs: Any,
+) -> Any:
+    """`method` `url` over the broker's pooled session; returns the raw response."""
+    return get_session(broker).request(method, url, timeout=timeout or timeout_for(endpoint), **kwargs)
+
+
+def get_json(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[Timeout] = None,
+    broker: str = "default",
+    endpoint: str = "default",
+) -> Dict[str, Any]:
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=timeout)
+        r = request("GET", url, broker=broker, endpoint=endpoint, timeout=timeout, headers=headers, params=params)
         r.raise_for_status()
         return r.json()
     except Exception as e:  # noqa: BLE001
         raise HTTPError(f"GET {url} failed: {e}") from e
 
 
-def post_json(url: str, *, headers: Optional[Dict[str, str]] = None, json: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    requests = _requests()
+def post_json(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    timeout: Optional[Timeout] = None,
+    broker: str = "default",
+    endpoint: str = "default",
+) -> Dict[str, Any]:
     try:
-        r = requests.post(url, headers=headers, json=json, timeout=timeout)
+        r = request("POST", url, broker=broker, endpoint=endpoint, timeout=timeout, headers=headers, json=json)
         r.raise_for_status()
         return r.json()
     except Exception as e:  # noqa: BLE001
         raise HTTPError(f"POST {url} failed: {e}") from e
-
-
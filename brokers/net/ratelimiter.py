@@ -1,44 +1,268 @@
+"""Token-bucket rate limiting shared per broker account.
+
+A ``RateLimiter`` holds one token bucket per tier (second / minute / day); a call
+goes through only when every tier has a token. Limiters are looked up by key (for
+example ``"fyers:<client id>"``) with ``get_limiter``, so every endpoint and
+thread talking to the same account draws on one budget.
+
+Callers waiting for a token queue in priority lanes: while a more urgent caller
+(a cancel, then an order) is waiting, less urgent ones (quotes) do not take
+tokens, so a burst of market-data calls cannot delay a cancel.
+"""
+
 from __future__ import annotations
 
-from typing import Any, Callable, Optional, TypeVar, cast
+import asyncio
+import functools
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union, cast
 
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
+class Priority(IntEnum):
+    """Lanes in which callers wait for tokens; lower values go first."""
+
+    CANCEL = 0
+    ORDER = 1
+    DEFAULT = 2
+    QUOTE = 3
+
+
+# Published API limits per broker
+FYERS_LIMITS = {"calls_per_second": 9, "calls_per_minute": 195, "calls_per_day": 99900}
+ICICI_LIMITS = {"calls_per_second": 2}
+
+
+class TokenBucket:
+    """`capacity` tokens, refilled continuously at `capacity` per `period` seconds. Not thread-safe."""
+
+    def __init__(self, capacity: int, period: float) -> None:
+        self.capacity = float(capacity)
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` are available (0 if they already are)."""
+        missing = tokens - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+class RateLimiter:
+    """Multi-tier token bucket with priority lanes and throttling metrics. Thread-safe."""
+
+    def __init__(
+        self,
+        name: str = "",
+        *,
+        calls_per_second: Optional[int] = None,
+        calls_per_minute: Optional[int] = None,
+        calls_per_day: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self._buckets: List[TokenBucket] = []
+        for calls, period in ((calls_per_second, 1.0), (calls_per_minute, 60.0), (calls_per_day, 86400.0)):
+            if calls is not None:
+                self._buckets.append(TokenBucket(calls, period))
+        self._cond = threading.Condition()
+        self._waiting: Dict[Priority, int] = {p: 0 for p in Priority}
+        # Metrics
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self._throttled_by_priority: Dict[Priority, float] = {p: 0.0 for p in Priority}
+
+    # --- Token accounting (caller holds self._cond) ---
+    def _wait_time(self, priority: Priority) -> Optional[float]:
+        """Seconds until every tier has a token, or None if a more urgent lane is waiting."""
+        if any(self._waiting[p] for p in Priority if p < priority):
+            return None
+        now = time.monotonic()
+        wait = 0.0
+        for bucket in self._buckets:
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time())
+        return wait
+
+    def _take(self) -> None:
+        for bucket in self._buckets:
+            bucket.tokens -= 1
+        self.acquired += 1
+
+    def _record_throttle(self, priority: Priority, waited: float) -> None:
+        self.throttled += 1
+        self.throttled_seconds += waited
+        self._throttled_by_priority[priority] += waited
+
+    def _leave_lane(self, priority: Priority) -> None:
+        self._waiting[priority] -= 1
+        if self._waiting[priority] == 0:
+            # Less urgent lanes may proceed now
+            self._cond.notify_all()
+
+    # --- Public API ---
+    def try_acquire(self, priority: Priority = Priority.DEFAULT) -> bool:
+        """Take a token if one is available right now; never blocks."""
+        with self._cond:
+            if self._wait_time(priority) == 0.0:
+                self._take()
+                return True
+            self.rejected += 1
+            return False
+
+    def acquire(self, priority: Priority = Priority.DEFAULT, timeout: Optional[float] = None) -> bool:
+        """Block until a token is taken. Returns False if `timeout` seconds pass first."""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            wait = self._wait_time(priority)
+            if wait == 0.0:
+                self._take()
+                return True
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.rejected += 1
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+                    # Our own lane entry must not block us
+                    self._waiting[priority] -= 1
+                    wait = self._wait_time(priority)
+                    self._waiting[priority] += 1
+                    if wait == 0.0:
+                        self._take()
+                        self._record_throttle(priority, time.monotonic() - start)
+                        return True
+            finally:
+                self._leave_lane(priority)
+
+    async def acquire_async(self, priority: Priority = Priority.DEFAULT) -> None:
+        """Wait for a token without blocking the event loop."""
+        start = time.monotonic()
+        queued = waited = False
+        try:
+            while True:
+                with self._cond:
+                    if queued:
+                        # Our own lane entry must not block us
+                        self._leave_lane(priority)
+                        queued = False
+                    wait = self._wait_time(priority)
+                    if wait == 0.0:
+                        self._take()
+                        if waited:
+                            self._record_throttle(priority, time.monotonic() - start)
+                        return
+                    self._waiting[priority] += 1
+                    queued = waited = True
+                # While a more urgent lane is busy, poll at a fine interval until it drains
+                await asyncio.sleep(0.005 if wait is None else wait)
+        finally:
+            if queued:
+                with self._cond:
+                    self._leave_lane(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """Throttling metrics since creation."""
+        with self._cond:
+            return {
+                "name": self.name,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "throttled": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 6),
+                "throttled_seconds_by_priority": {p.name.lower(): round(s, 6) for p, s in self._throttled_by_priority.items()},
+                "waiting": {p.name.lower(): n for p, n in self._waiting.items() if n},
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str, **limits: Optional[int]) -> RateLimiter:
+    """
+    The limiter registered under `key`, created with `limits` on first use. Later
+    callers share it (and its budget) regardless of the limits they pass.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(key, **limits)
+        return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every registered limiter, by key."""
+    with _limiters_lock:
+        limiters = list(_limiters.items())
+    return {key: limiter.stats() for key, limiter in limiters}
+
+
 def rate_limited(
     *,
     calls_per_second: Optional[int] = None,
     calls_per_minute: Optional[int] = None,
     calls_per_day: Optional[int] = None,
+    key: Union[str, Callable[..., str], None] = None,
+    priority: Priority = Priority.DEFAULT,
 ) -> Callable[[F], F]:
-    """Generic rate-limiting decorator builder using ratelimit.sleep_and_retry."""
-
-    try:  # pragma: no cover - optional dependency
-        from ratelimit import limits, sleep_and_retry  # type: ignore
-    except Exception as e:  # pragma: no cover
-        # If ratelimit isn't installed, return identity decorator
-        def identity(func: F) -> F:
-            return func
+    """
+    Rate-limiting decorator builder; waits for a token before each call.
 
-        return identity
+    `key` selects a shared limiter: a string, or a callable given the call's
+    arguments (e.g. ``lambda self, *a, **k: self.account_key``). Without a key each
+    decorated function gets its own budget. Coroutine functions wait asynchronously.
+    """
+    limits = {"calls_per_second": calls_per_second, "calls_per_minute": calls_per_minute, "calls_per_day": calls_per_day}
 
     def decorator(func: F) -> F:
-        wrapped: Callable[..., Any] = func
-        if calls_per_second is not None:
-            wrapped = sleep_and_retry(limits(calls=calls_per_second, period=1))(wrapped)  # type: ignore[assignment]
-        if calls_per_minute is not None:
-            wrapped = sleep_and_retry(limits(calls=calls_per_minute, period=60))(wrapped)  # type: ignore[assignment]
-        if calls_per_day is not None:
-            wrapped = sleep_and_retry(limits(calls=calls_per_day, period=86400))(wrapped)  # type: ignore[assignment]
-        return cast(F, wrapped)
+        own = RateLimiter(func.__qualname__, **limits) if key is None else None
+
+        def limiter_for(args: Any, kwargs: Any) -> RateLimiter:
+            if own is not None:
+                return own
+            name = key(*args, **kwargs) if callable(key) else key
+            return get_limiter(cast(str, name), **limits)
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await limiter_for(args, kwargs).acquire_async(priority)
+                return await func(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            limiter_for(args, kwargs).acquire(priority)
+            return func(*args, **kwargs)
+
+        return cast(F, wrapper)
 
     return decorator
 
 
-def rate_limited_fyers() -> Callable[[F], F]:
-    """Preconfigured rate limiter for Fyers API calls."""
+def _fyers_account(driver: Any, *args: Any, **kwargs: Any) -> str:
+    return f"fyers:{getattr(driver, '_client_id', None) or 'default'}"
 
-    return rate_limited(calls_per_second=9, calls_per_minute=195, calls_per_day=99900)
 
+def rate_limited_fyers(priority: Priority = Priority.DEFAULT) -> Callable[[F], F]:
+    """Preconfigured rate limiter for FyersDriver methods, shared per Fyers client id."""
 
+    return rate_limited(**FYERS_LIMITS, key=_fyers_account, priority=priority)
@@ -1,9 +1,11 @@
 import logging
+import threading
 import time
 from typing import Dict, Any, List
 
+from .core.gateway import place_leg, rollback_unpaired
 from .core.interface import BrokerDriver
-from .core.models import OrderRequest
+from .core.schemas import OrderRequest, OrderResponse
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +26,22 @@ class MasterRiskController:
         self.global_pnl = 0.0
         self.is_halted = False
         self._order_timestamps = []
+        # Strategies on a thread-safe driver place orders from several threads at once
+        self._velocity_lock = threading.Lock()
 
     def _check_velocity(self) -> bool:
         """Prevent logic loops from spamming the broker"""
-        now = time.time()
-        # Clean old timestamps
-        self._order_timestamps = [t for t in self._order_timestamps if now - t < 60]
-        
-        if len(self._order_timestamps) >= self.max_orders_per_minute:
-            logger.error("RISK HALT: Order velocity exceeded.")
-            return False
-            
-        self._order_timestamps.append(now)
-        return True
+        with self._velocity_lock:
+            now = time.time()
+            # Clean old timestamps
+            self._order_timestamps = [t for t in self._order_timestamps if now - t < 60]
+
+            if len(self._order_timestamps) >= self.max_orders_per_minute:
+                logger.error("RISK HALT: Order velocity exceeded.")
+                return False
+
+            self._order_timestamps.append(now)
+            return True
 
     def update_global_pnl(self, realized: float, unrealized: float):
         """Called by the Engine continually"""
@@ -47,18 +52,40 @@ class MasterRiskController:
 
     # ----- Wrapped Broker Methods -----
 
+    def get_capabilities(self):
+        return self.broker.get_capabilities()
+
     def get_quote(self, symbol: str) -> Dict[str, Any]:
         return self.broker.get_quote(symbol)
 
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        return self.broker.get_quotes(symbols)
+
+    def get_cached_quote(self, symbol: str, max_age: float = None):
+        get_cached = getattr(self.broker, "get_cached_quote", None)
+        return get_cached(symbol, max_age) if get_cached is not None else None
+
+    def symbols_to_subscribe(self, symbols: List[str]) -> None:
+        subscribe = getattr(self.broker, "symbols_to_subscribe", None)
+        if subscribe is not None:
+            subscribe(symbols)
+
     def get_positions(self) -> List[Dict[str, Any]]:
         return self.broker.get_positions()
         
-    def download_instruments(self):
-         return self.broker.download_instruments()
+    def download_instruments(self, **kwargs):
+         return self.broker.download_instruments(**kwargs)
          
     def get_instruments(self):
          return self.broker.get_instruments()
 
+    @property
+    def share_instruments(self):
+         return getattr(self.broker, "share_instruments", True)
+
+    def get_instrument_index(self):
+         return self.broker.get_instrument_index()
+
     def place_order(self, request: OrderRequest) -> Dict[str, Any]:
         if self.is_halted:
             logger.warning(f"Risk Controller: Order Rejected (System Halted) - {request.symbol}")
@@ -71,6 +98,31 @@ class MasterRiskController:
         
         return self.broker.place_order(request)
 
+    def place_order_pair(self, first: OrderRequest, second: OrderRequest, rollback: bool = True):
+        if self.is_halted:
+            logger.warning(f"Risk Controller: Order Pair Rejected (System Halted) - {first.symbol}")
+            return self._rejected_pair("Risk System Halted")
+
+        if not (self._check_velocity() and self._check_velocity()):
+            return self._rejected_pair("Velocity Limit Exceeded")
+
+        place_pair = getattr(self.broker, "place_order_pair", None)
+        if place_pair is not None:
+            return place_pair(first, second, rollback=rollback)
+        # Raw driver: place the legs one after the other under the same rollback policy
+        first_resp = place_leg(self.broker, first)
+        second_resp = place_leg(self.broker, second)
+        if rollback:
+            return rollback_unpaired(self.broker, first_resp, second_resp)
+        return first_resp, second_resp
+
+    @staticmethod
+    def _rejected_pair(message: str):
+        return (
+            OrderResponse(status="error", order_id=None, message=message),
+            OrderResponse(status="error", order_id=None, message=message),
+        )
+
     def cancel_order(self, order_id: str) -> bool:
         # We always want to allow cancellations even if halted to reduce risk
         return self.broker.cancel_order(order_id)
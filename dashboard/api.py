@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import os
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -84,6 +85,24 @@ async def get_status():
          "brokers": {"upstox": "Connected", "icici": "Disconnected"} # Simulated state
     }
 
+# -------- Backtest Results -------- #
+
+BACKTEST_RESULTS_DIR = "backtest_results"
+
+@app.get("/api/backtest/equity")
+async def get_backtest_equity(every: int = 1, limit: int = 5000):
+    """Equity/drawdown curve streamed by `backtest_engine.py --stream` (every Nth point)"""
+    from backtest_writer import EQUITY_FILE, read_jsonl
+    points = await asyncio.to_thread(read_jsonl, os.path.join(BACKTEST_RESULTS_DIR, EQUITY_FILE), every=every, limit=limit)
+    return {"points": points}
+
+@app.get("/api/backtest/trades")
+async def get_backtest_trades(limit: int = 1000):
+    """Fills streamed by `backtest_engine.py --stream`"""
+    from backtest_writer import TRADES_FILE, read_jsonl
+    trades = await asyncio.to_thread(read_jsonl, os.path.join(BACKTEST_RESULTS_DIR, TRADES_FILE), limit=limit)
+    return {"trades": trades}
+
 # -------- WEBSOCKETS -------- #
 
 class ConnectionManager:
@@ -1,17 +1,132 @@
+import queue
+import threading
+from collections import deque
+from types import MappingProxyType
+
 from logger import logger
 
+QUEUE_MODE = "queue"
+CONFLATE_MODE = "conflate"
+FANOUT_MODE = "fanout"
+
+_STOP = object()
+
+
+def _tick_symbol(tick):
+    return tick.get("symbol", tick.get("instrument_token")) if isinstance(tick, dict) else None
+
+
+class Subscription:
+    """
+    One consumer's view of a fan-out dispatcher: the ticks for its symbols, in a
+    bounded queue. When the consumer falls behind the oldest tick is dropped, so
+    it always catches up to current prices.
+
+    Ticks are read-only mappings shared by every subscriber.
+    """
+
+    def __init__(self, dispatcher, symbols, maxsize):
+        self.dispatcher = dispatcher
+        self.symbols = frozenset(symbols) if symbols is not None else None
+        self.dropped = 0
+        self.delivered = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def _offer(self, tick):
+        # Only the ingest thread puts, so a freed slot cannot be taken by another producer
+        try:
+            self._queue.put_nowait(tick)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(tick)
+        self.delivered += 1
+
+    def get(self, timeout=None):
+        """Next tick, or None if nothing arrives within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_batch(self, timeout=None, max_items=None):
+        """Every queued tick (up to `max_items`), waiting up to `timeout` for the first."""
+        first = self.get(timeout)
+        if first is None:
+            return []
+        batch = [first]
+        while max_items is None or len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def close(self):
+        self.dispatcher.unsubscribe(self)
+
+
 class DataDispatcher:
     """
-    Routes incoming market data to a single main worker queue.
+    Routes incoming market data to the strategy.
+
+    In "queue" mode (the default) every item is put on a single main worker queue.
+    In "conflate" mode each symbol gets a small bounded ring buffer instead: a
+    newer tick replaces any tick of the same symbol that has not been consumed
+    yet, and the consumer drains the latest tick of every updated symbol in one
+    batch, so a burst never leaves it working through stale prices.
+    In "fanout" mode any number of consumers `subscribe()` to symbol sets; one
+    ingest thread routes each tick to the bounded queue of every interested
+    subscriber, so a single websocket connection can feed several strategies.
+    The ingest queue is bounded too: if routing falls behind, the oldest
+    undispatched items are dropped rather than letting latency grow.
     """
 
-    def __init__(self):
+    def __init__(self, mode=QUEUE_MODE, ring_size=1, ingest_size=10000):
         """
         Initializes the DataDispatcher.
-        It expects a single main queue to be registered.
+
+        Args:
+            mode (str): "queue" to forward everything to a registered main queue,
+                "conflate" for per-symbol ring buffers drained with `drain()`,
+                "fanout" for per-subscriber queues (see `subscribe()`).
+            ring_size (int): Recent ticks kept per symbol in conflate mode.
+            ingest_size (int): Items waiting to be routed in fanout mode before
+                the oldest is dropped.
         """
-        self._main_queue = None  # The single queue for all dispatches
-        logger.debug(f"DataDispatcher initialized, awaiting main queue registration.")
+        if mode not in (QUEUE_MODE, CONFLATE_MODE, FANOUT_MODE):
+            raise ValueError(f"Unknown dispatcher mode: {mode}")
+        self.mode = mode
+        self._main_queue = None  # The single queue for all dispatches (queue mode)
+
+        # Conflate mode state
+        self._rings = {}
+        self._ring_size = max(1, int(ring_size))
+        self._pending = {}   # symbol -> None, insertion ordered; symbols with an unconsumed tick
+        self._ready = threading.Condition()
+        self.received = 0
+        self.delivered = 0
+        self.conflated = 0
+        self.dropped = 0
+
+        # Fan-out mode state
+        self._subscribers = {}     # symbol -> [Subscription]
+        self._wildcards = []       # subscriptions to every symbol
+        self._subs_lock = threading.Lock()
+        self._ingest = queue.Queue(maxsize=max(1, int(ingest_size)))
+        self._ingest_thread = None
+        self.ingest_dropped = 0
+
+        if mode == QUEUE_MODE:
+            logger.debug(f"DataDispatcher initialized, awaiting main queue registration.")
+        else:
+            logger.debug(f"DataDispatcher initialized in {mode} mode.")
 
     def register_main_queue(self, q):
         """
@@ -27,11 +142,21 @@ class DataDispatcher:
 
     def dispatch(self, data):
         """
-        Dispatch a data item to the main queue.
+        Dispatch a data item to the main queue, the per-symbol buffers (conflate mode)
+        or the subscribers (fanout mode).
 
         Args:
-            data (dict): The data item (e.g., market data bar) to be dispatched.
+            data (dict or list): The data item (e.g., market data bar), or a list of ticks.
         """
+        if self.mode == CONFLATE_MODE:
+            self._conflate(data if isinstance(data, list) else [data])
+            return
+        if self.mode == FANOUT_MODE:
+            # Never blocks the websocket thread; routing happens on the ingest thread
+            self._ensure_ingest_thread()
+            self._enqueue_ingest(data)
+            return
+
         if self._main_queue is None:
             logger.error("Attempted to dispatch data, but no main queue has been registered.")
             return
@@ -42,3 +167,156 @@ class DataDispatcher:
         except Exception as e:
             logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
 
+    def _conflate(self, ticks):
+        with self._ready:
+            for tick in ticks:
+                self.received += 1
+                symbol = _tick_symbol(tick)
+                if symbol is None:
+                    self.dropped += 1
+                    continue
+                ring = self._rings.get(symbol)
+                if ring is None:
+                    ring = self._rings[symbol] = deque(maxlen=self._ring_size)
+                ring.append(tick)
+                if symbol in self._pending:
+                    self.conflated += 1
+                else:
+                    self._pending[symbol] = None
+            if self._pending:
+                self._ready.notify()
+
+    def drain(self, timeout=None):
+        """
+        Latest unconsumed tick of every symbol updated since the last drain.
+
+        Args:
+            timeout (float): Seconds to wait for data; None waits indefinitely.
+
+        Returns:
+            list: One tick per symbol, in the order the symbols were first updated
+            (empty on timeout).
+        """
+        if self.mode != CONFLATE_MODE:
+            raise RuntimeError("drain() is only available in conflate mode")
+        with self._ready:
+            if not self._pending and not self._ready.wait_for(lambda: self._pending, timeout):
+                return []
+            batch = [self._rings[symbol][-1] for symbol in self._pending]
+            self._pending = {}
+            self.delivered += len(batch)
+        return batch
+
+    def history(self, symbol):
+        """Most recent ticks kept for `symbol` (at most `ring_size`), oldest first."""
+        with self._ready:
+            return list(self._rings.get(symbol, ()))
+
+    def stats(self):
+        """Tick counters for monitoring conflation and fan-out under load."""
+        with self._ready:
+            return {
+                "received": self.received,
+                "delivered": self.delivered,
+                "conflated": self.conflated,
+                "dropped": self.dropped,
+                "pending_symbols": len(self._pending),
+                "ingest_dropped": self.ingest_dropped,
+                "ingest_backlog": self._ingest.qsize(),
+            }
+
+    def subscribe(self, symbols=None, maxsize=1000):
+        """
+        Register a consumer for `symbols` (None for every symbol) in fanout mode.
+
+        Args:
+            symbols (iterable): Symbols (or instrument tokens) to receive.
+            maxsize (int): Ticks buffered for this subscriber before the oldest is dropped.
+
+        Returns:
+            Subscription: Read ticks with `get()` / `get_batch()`; `close()` to unsubscribe.
+        """
+        if self.mode != FANOUT_MODE:
+            raise RuntimeError("subscribe() is only available in fanout mode")
+        subscription = Subscription(self, symbols, maxsize)
+        with self._subs_lock:
+            # Routing tables are replaced, never mutated, so the ingest thread reads them without locking
+            if subscription.symbols is None:
+                self._wildcards = self._wildcards + [subscription]
+            else:
+                subscribers = dict(self._subscribers)
+                for symbol in subscription.symbols:
+                    subscribers[symbol] = subscribers.get(symbol, []) + [subscription]
+                self._subscribers = subscribers
+        self._ensure_ingest_thread()
+        scope = "all symbols" if subscription.symbols is None else f"{len(subscription.symbols)} symbols"
+        logger.info(f"Dispatcher subscriber added for {scope}")
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._subs_lock:
+            self._wildcards = [s for s in self._wildcards if s is not subscription]
+            self._subscribers = {
+                symbol: [s for s in subs if s is not subscription]
+                for symbol, subs in self._subscribers.items()
+                if any(s is not subscription for s in subs)
+            }
+
+    def _ensure_ingest_thread(self):
+        if self._ingest_thread is not None and self._ingest_thread.is_alive():
+            return
+        with self._subs_lock:
+            if self._ingest_thread is None or not self._ingest_thread.is_alive():
+                self._ingest_thread = threading.Thread(target=self._run_ingest, name="dispatcher-ingest", daemon=True)
+                self._ingest_thread.start()
+
+    def _enqueue_ingest(self, data):
+        while True:
+            try:
+                self._ingest.put_nowait(data)
+                return
+            except queue.Full:
+                try:
+                    stale = self._ingest.get_nowait()
+                except queue.Empty:
+                    continue
+                # Any dispatching thread may get here
+                with self._ready:
+                    self.ingest_dropped += len(stale) if isinstance(stale, list) else 1
+
+    def _run_ingest(self):
+        while True:
+            data = self._ingest.get()
+            if data is _STOP:
+                return
+            ticks = data if isinstance(data, list) else [data]
+            dropped = delivered = 0
+            for tick in ticks:
+                symbol = _tick_symbol(tick)
+                if symbol is None:
+                    dropped += 1
+                    continue
+                targets = self._subscribers.get(symbol, ())
+                wildcards = self._wildcards
+                if not targets and not wildcards:
+                    continue
+                # One read-only copy per tick, shared by every subscriber
+                shared = MappingProxyType(dict(tick))
+                for subscription in targets:
+                    subscription._offer(shared)
+                for subscription in wildcards:
+                    subscription._offer(shared)
+                delivered += 1
+            # Counted once per batch under the lock stats() reads with, so a snapshot never
+            # shows a batch half done
+            with self._ready:
+                self.received += len(ticks)
+                self.dropped += dropped
+                self.delivered += delivered
+
+    def close(self):
+        """Stop the fan-out ingest thread."""
+        if self._ingest_thread is not None and self._ingest_thread.is_alive():
+            # Same drop-oldest push as dispatch(): a saturated backlog must not block or fail shutdown
+            self._enqueue_ingest(_STOP)
+            self._ingest_thread.join(timeout=5)
@@ -11,6 +11,7 @@ from strategy.survivor import SurvivorStrategy
 from strategy.wave import WaveStrategy
 from strategy.saviour import SaviourComboStrategy
 from brokers.registry import BrokerRegistry
+from brokers.core.gateway import BrokerGateway
 from brokers.risk import MasterRiskController
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -34,16 +35,22 @@ def main():
     # 1. Initialize Primary Broker or Sandbox
     broker_name = "backtest" if args.paper else os.getenv("ACTIVE_BROKER", "upstox")
     raw_broker = BrokerRegistry.create(broker_name)
+
+    # 2. Gateway: symbol mapping, paired orders and the tick-fed quote cache.
+    # Strategies subscribe their instruments; every tick refreshes the cache.
+    gateway = BrokerGateway(raw_broker, broker_name)
+    if not args.paper:
+        gateway.connect_websocket()
+
+    # 3. Wrap in Master Risk Controller
+    safe_broker = MasterRiskController(gateway)
     
-    # 2. Wrap in Master Risk Controller
-    safe_broker = MasterRiskController(raw_broker)
-    
-    # 3. Instantiate Strategies
+    # 4. Instantiate Strategies
     survivor = SurvivorStrategy(safe_broker, survivor_config)
     wave = WaveStrategy(safe_broker, wave_config)
     saviour = SaviourComboStrategy(safe_broker, {"max_drawdown_percent": 5.0, "check_frequency": 5})
 
-    # 4. Register with Manager
+    # 5. Register with Manager
     manager.register(survivor)
     manager.register(wave)
     manager.register(saviour)
@@ -51,15 +58,15 @@ def main():
     # Pass the risk controller to the manager so it can feed the global PNL for halting
     manager.set_risk_controller(safe_broker)
 
-    # 5. Handle Autonomous Starting
+    # 6. Handle Autonomous Starting
     if args.auto_start:
          logger.info("Autonomous Start Triggered. Strategies will arm automatically once event loop initializes.")
          manager.set_auto_start_flags(["Survivor", "Wave Extractor", "Saviour Combo"])
 
-    # 6. Mount Static Frontend (Dashboard UI)
+    # 7. Mount Static Frontend (Dashboard UI)
     app.mount("/", StaticFiles(directory="dashboard", html=True), name="dashboard")
 
-    # 7. Start ASGI Server
+    # 8. Start ASGI Server
     logger.info("Starting local Dashboard at http://localhost:8000")
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 import datetime
 
 from ..brokers.core.interface import BrokerDriver
+from ..brokers.core.async_interface import as_async
+from ..brokers.instruments import instrument_store
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +96,47 @@ class BaseStrategy:
             await self._run_task
             
         self.on_stop()
+        self.release_instruments()
+
+    @property
+    def async_broker(self):
+        """Awaitable view of `self.broker`; blocking calls run on the broker's I/O pool."""
+        return as_async(self.broker)
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """
+        Run a blocking call (broker round-trips, order loops) off the event loop.
+
+        The call runs on the broker's shared adapter pool. On thread-safe live
+        drivers strategies run side by side; on drivers that are not (paper and
+        backtest), calls from every strategy take turns on one lock.
+        """
+        return await self.async_broker.run(fn, *args, **kwargs)
+
+    def load_instruments(self):
+        """
+        Master contract for this strategy's broker. Strategies on the same broker share
+        one download and one copy in memory, each holding a view until it stops.
+        """
+        if not getattr(self.broker, "share_instruments", True):
+            return self._download_instruments()
+        return instrument_store.acquire(self.broker, self, self._download_instruments)
+
+    def reload_instruments(self):
+        """
+        Fresh master contract for this strategy's broker. Strategies reloading at the
+        same time share one download.
+        """
+        if not getattr(self.broker, "share_instruments", True):
+            return self._download_instruments()
+        return instrument_store.refresh(self.broker, self, self._download_instruments)
+
+    def _download_instruments(self):
+        self.broker.download_instruments()
+        return self.broker.get_instruments()
+
+    def release_instruments(self):
+        instrument_store.release(self.broker, self)
 
     def get_state(self) -> dict:
         """Returns normalized structured state dict to be broadcast via WebSockets"""
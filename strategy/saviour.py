@@ -17,7 +17,7 @@ class SaviourComboStrategy(BaseStrategy):
 
     def on_start(self):
         logger.info("Initializing Saviour Combo protection network...")
-        self.broker.download_instruments()
+        self.load_instruments()
         self.state.last_signal = f"Armed with {self.max_drawdown}% drawdown cap."
         self._loop_sleep_delay = float(self.check_frequency)
 
@@ -25,7 +25,7 @@ class SaviourComboStrategy(BaseStrategy):
          """Routinely checks total account liquidity and open MTM loss."""
          try:
              # Assume fetching MTM from all combined portfolios natively
-             positions = self.broker.get_positions()
+             positions = await self.async_broker.get_positions()
              total_mtm = 0.0
              # (Mock calculation)
              for pos in positions:
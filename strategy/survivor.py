@@ -5,6 +5,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import yaml
 from logger import logger
 from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
+from brokers.core.quotes import match_quote
 from .base import BaseStrategy
 
 class SurvivorStrategy(BaseStrategy):
@@ -12,9 +13,10 @@ class SurvivorStrategy(BaseStrategy):
     Survivor Options Trading Strategy (Refactored for Unified Hub)
     """
     
-    def __init__(self, broker, config):
+    def __init__(self, broker, config, order_tracker=None):
         # Pass to the unified base
         super().__init__("Survivor", broker, config)
+        self.order_tracker = order_tracker
         
         # Assign config values as instance variables with 'strat_var_' prefix
         for k, v in config.items():
@@ -32,35 +34,38 @@ class SurvivorStrategy(BaseStrategy):
     def on_start(self):
         """Called automatically by start() in the base class"""
         self._update_signal("Connecting broker & pre-fetching instruments...")
-        self.broker.download_instruments()
-        self.instruments = self.broker.get_instruments()
+        self.instruments = self.load_instruments()
         if type(self.instruments) == list:
              # handle if broker returns plain dicts instead of pandas (eg our naked integration)
              self.instruments = [i for i in self.instruments if self.symbol_initials in str(i)]
         else:
              self.instruments = self.instruments[self.instruments['symbol'].str.contains(self.symbol_initials)]
+        self.instrument_index = self.broker.get_instrument_index()
 
         self._initialize_state()
         self.strike_difference = self._get_strike_difference(self.symbol_initials)
 
     async def on_tick(self):
         """Asynchronous execution block called rapidly by the base class manager"""
-        # Fetch current price natively via broker wrapper
-        current_quote = self._nifty_quote()
+        # Fetch current price without blocking the event loop
+        current_quote = await self.async_broker.get_quote(self.strat_var_index_symbol)
         current_price = getattr(current_quote, 'last_price', current_quote.get('last_price', 0)) if isinstance(current_quote, dict) else current_quote.last_price
         
         if current_price <= 0:
             return
 
-        # Core logic execution
-        self._check_sl_tp(current_price)
-        self._handle_pe_trade(current_price) 
-        self._handle_ce_trade(current_price)
-        self._reset_reference_values(current_price)
+        # Core logic execution (quote walks and order placement block, so run them on the broker pool)
+        await self.run_blocking(self._evaluate, current_price)
         
         # Publish update state metrics to dashboard
         self._update_metrics(current_price)
 
+    def _evaluate(self, current_price):
+        self._check_sl_tp(current_price)
+        self._handle_pe_trade(current_price)
+        self._handle_ce_trade(current_price)
+        self._reset_reference_values(current_price)
+
     def _update_metrics(self, price):
         self.state.unrealized_pnl = 0.0 # Calculate from active positions
         self.state.realized_pnl = 0.0
@@ -116,9 +121,9 @@ class SurvivorStrategy(BaseStrategy):
         Refreshes the instrument list and strike difference.
         Useful for backtesting across multiple expiries.
         """
-        self.broker.download_instruments()
-        self.instruments = self.broker.get_instruments()
+        self.instruments = self.reload_instruments()
         self.instruments = self.instruments[self.instruments['symbol'].str.contains(self.symbol_initials)]
+        self.instrument_index = self.broker.get_instrument_index()
         self.strike_difference = self._get_strike_difference(self.symbol_initials)
         logger.info(f"Refreshed instruments for {self.symbol_initials}. Strike diff: {self.strike_difference}")
 
@@ -234,6 +239,7 @@ class SurvivorStrategy(BaseStrategy):
             max_iterations = 10
             iterations = 0
             instrument = None # Initialize instrument to None
+            quotes = self._prefetch_walk_quotes("PE", current_price, temp_gap, max_iterations)
             while iterations < max_iterations:
                 iterations += 1
                 # Find PE instrument at specified gap from current price
@@ -244,7 +250,7 @@ class SurvivorStrategy(BaseStrategy):
                 
                 # Get current quote for the selected instrument
                 symbol_code = instrument['symbol']
-                quote = self.broker.get_quote(symbol_code)
+                quote = quotes.get(symbol_code) or self.broker.get_quote(symbol_code)
                 
                 # Check if premium meets minimum threshold
                 if quote.last_price < self.strat_var_min_price_to_sell:
@@ -322,6 +328,7 @@ class SurvivorStrategy(BaseStrategy):
             max_iterations = 10
             iterations = 0
             instrument = None # Initialize instrument to None
+            quotes = self._prefetch_walk_quotes("CE", current_price, temp_gap, max_iterations)
             while iterations < max_iterations:
                 iterations += 1
                 # Find CE instrument at specified gap from current price
@@ -332,7 +339,7 @@ class SurvivorStrategy(BaseStrategy):
                     
                 # Get current quote for the selected instrument
                 symbol_code = instrument['symbol']
-                quote = self.broker.get_quote(symbol_code)
+                quote = quotes.get(symbol_code) or self.broker.get_quote(symbol_code)
                 # Check if premium meets minimum threshold
                 if quote.last_price < self.strat_var_min_price_to_sell:
                     logger.info(f"Last price {quote.last_price} is less than min price to sell {self.strat_var_min_price_to_sell}, trying next strike")
@@ -392,6 +399,39 @@ class SurvivorStrategy(BaseStrategy):
             # Reset CE reference to current price minus reset gap
             self.nifty_ce_last_value = current_price - self.strat_var_ce_reset_gap
 
+    def _prefetch_walk_quotes(self, option_type, ltp, start_gap, max_iterations):
+        """
+        Quote every strike the PE/CE strike walk may visit in one batched call,
+        stepping the gap down by the strike difference as the walk does. Only for
+        brokers with a batch quote endpoint; elsewhere a batch costs one REST call per
+        strike while the walk usually stops at the first, so it quotes lazily.
+        """
+        get_capabilities = getattr(self.broker, "get_capabilities", None)
+        if get_capabilities is None or not get_capabilities().max_quote_symbols:
+            return {}
+        step = self._get_strike_difference(self.symbol_initials)
+        symbols = []
+        gap = start_gap
+        for _ in range(max_iterations):
+            instrument = self._find_nifty_symbol_from_gap(option_type, ltp, gap=gap)
+            if not instrument:
+                break
+            if instrument['symbol'] not in symbols:
+                symbols.append(instrument['symbol'])
+            gap -= step
+            if gap < 0 or not step:
+                break
+        if not symbols:
+            return {}
+        try:
+            quotes = self.broker.get_quotes(symbols)
+        except Exception as e:
+            logger.warning(f"Batched quote prefetch failed, falling back to single quotes: {e}")
+            return {}
+        # Brokers key results by exchange-qualified symbol; the walk looks up bare symbols
+        matched = {symbol: match_quote(quotes, symbol) for symbol in symbols}
+        return {symbol: quote for symbol, quote in matched.items() if quote is not None}
+
     def _find_nifty_symbol_from_gap(self, option_type, ltp, gap):
         """
         Find the most suitable option instrument based on strike distance from current price
@@ -430,31 +470,23 @@ class SurvivorStrategy(BaseStrategy):
         # Calculate target strike price
         target_strike = ltp + symbol_gap
         
-        # Filter instruments for matching criteria
-        df = self.instruments[
-            (self.instruments['symbol'].str.contains(self.symbol_initials)) &
-            (self.instruments['instrument_type'] == option_type) &
-            (self.instruments['segment'] == "NFO-OPT")
-        ]
+        # Strike ladder for matching criteria (built once per instrument refresh)
+        ladder = self.instrument_index.series(self.symbol_initials, option_type, segment="NFO-OPT")
         
-        if df.empty:
+        if not len(ladder):
             return None
             
-        # Find closest strike within acceptable tolerance
-        df['target_strike_diff'] = (df['strike'] - target_strike).abs()
-        
-        # Filter to strikes within half strike difference (tolerance for rounding)
+        # Closest strike within half strike difference (tolerance for rounding)
         tolerance = self._get_strike_difference(self.symbol_initials) / 2
-        df = df[df['target_strike_diff'] <= tolerance]
+        best = self.instrument_index.nearest(ladder, target_strike, tolerance)
         
-        if df.empty:
+        if best is None:
             logger.error(f"No instrument found for {self.symbol_initials} {option_type} "
                         f"within {tolerance} of {target_strike}")
             return None
             
-        # Return the closest match
-        best = df.sort_values('target_strike_diff').iloc[0]
-        return best.to_dict()
+        best['target_strike_diff'] = abs(best['strike'] - target_strike)
+        return best
 
     def _find_price_eligible_symbol(self, option_type):
         """
@@ -632,7 +664,6 @@ if __name__ == "__main__":
     from strategy.survivor import SurvivorStrategy
     # from brokers.zerodha import ZerodhaBroker
     from logger import logger
-    from queue import Queue
     import random
     import traceback
     import warnings
@@ -1085,9 +1116,9 @@ PARAMETER GROUPS:
         sys.exit(1)
 
     # Initialize data dispatcher for handling real-time market data
-    # The dispatcher manages queues and routes market data to strategy
-    dispatcher = DataDispatcher()
-    dispatcher.register_main_queue(Queue())
+    # Conflate mode keeps only the latest unprocessed tick per symbol, so bursts
+    # never leave the strategy acting on stale prices
+    dispatcher = DataDispatcher(mode="conflate")
 
     # ==========================================================================
     # SECTION 5: WEBSOCKET CALLBACK CONFIGURATION  
@@ -1141,18 +1172,18 @@ PARAMETER GROUPS:
     try:
         while True:
             try:
-                # STEP 1: Get market data from dispatcher queue
-                # This call blocks until new tick data arrives from websocket
-                tick_data = dispatcher._main_queue.get()
+                # STEP 1: Get market data from dispatcher
+                # This call blocks until new tick data arrives from websocket and
+                # returns the latest tick of every symbol updated since the last call
+                tick_data = dispatcher.drain(timeout=1.0)
+                if not tick_data:
+                    continue
                 
                 # STEP 2: Extract the primary instrument data
-                # tick_data is a list, we process the first instrument
-                if isinstance(tick_data, list):
-                    symbol_data = tick_data[0]
-                else:
-                    symbol_data = tick_data
+                # Only the underlying index is subscribed, so take its latest tick
+                symbol_data = tick_data[-1]
                 # STEP 3: Optional data simulation for testing
-                # You also need to move `tick_data = dispatcher._main_queue.get()` above 
+                # You also need to move `tick_data = dispatcher.drain()` above 
                 # outside of the while loop for this to work
                 # if isinstance(symbol_data, dict) and ('last_price' in symbol_data or 'ltp' in symbol_data) :
                 #     if 'last_price' in symbol_data: 
@@ -4,14 +4,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import yaml
 from logger import logger
+# Importing brokers loads .env, before anything here reads the environment
 from brokers import BrokerGateway, OrderRequest, Exchange, OrderType, TransactionType, ProductType
+import asyncio
 import datetime
 import time
 import logging
 from typing import Dict, List, Tuple
-from dotenv import load_dotenv
-load_dotenv()
-import mibian 
 from .base import BaseStrategy
 
 class WaveStrategy(BaseStrategy):
@@ -45,15 +44,21 @@ class WaveStrategy(BaseStrategy):
         # System state
         self.scraper_last_price = 0
         self.already_executing_order = 0
+        self._begin_task = None
+        self._cool_off_handle = None
+        self._wave_task = None
+        self._stopped = False
         self.initial_positions = {}
         self.orders = {}
         self.multiplier_scale = self._generate_multiplier_scale()
 
     def on_start(self):
         logger.info("Initializing Wave Extractor dependencies...")
-        self.broker.download_instruments() 
-        self.all_instruments = self.broker.get_instruments() 
+        self._stopped = False
+        self.all_instruments = self.load_instruments()
+        self.instrument_index = self.broker.get_instrument_index()
         self.initial_positions['position'] = self._get_position_for_symbol()
+        self._subscribe_ticks()
         
         quote = self.broker.get_quote(self.symbol_name)
         self.scraper_last_price = getattr(quote, 'last_price', quote.get('last_price', 0)) if isinstance(quote, dict) else quote.last_price
@@ -63,6 +68,15 @@ class WaveStrategy(BaseStrategy):
         self.prev_quote_price = None
         self.state.last_signal = "Initialized, awaiting market entry."
 
+    def on_stop(self):
+        # Drop a wave cycle in whatever phase it is; orders already sent stay with the broker
+        self._stopped = True
+        for pending in (self._begin_task, self._cool_off_handle, self._wave_task):
+            if pending is not None:
+                pending.cancel()
+        self._begin_task = self._cool_off_handle = self._wave_task = None
+        self.already_executing_order = 0
+
     async def on_tick(self):
          """Main asynchronous execution bound to BaseStrategy interval"""
          if self.already_executing_order > 0:
@@ -70,13 +84,11 @@ class WaveStrategy(BaseStrategy):
              
          try:
              # Validate Delta limits explicitly and queue cycle execution
-             self.check_and_enforce_restrictions_on_active_orders()
+             await self.run_blocking(self.check_and_enforce_restrictions_on_active_orders)
              
-             if not self.check_is_any_order_active():
-                  # Execute logic synchronosly in the loop for this strategy 
-                  # (Can be threaded heavily as needed later)
-                  self.place_wave_order()
-                  self._update_signal("Wave bounds recalculated & orders rotated.")
+             if not await self.run_blocking(self.check_is_any_order_active):
+                  # Runs as timer-driven continuations; the cool-off never blocks the loop
+                  self._schedule_wave_cycle(asyncio.get_running_loop())
                   
          except Exception as e:
              logger.error(f"Wave Executor fault bounds: {e}")
@@ -149,6 +161,8 @@ class WaveStrategy(BaseStrategy):
         Returns:
             Dict: A dictionary containing detailed greek values.
         """
+        import mibian  # only needed for option deltas
+
         net_positions = self.broker.get_positions()
         
         # Initialize trackers
@@ -177,7 +191,10 @@ class WaveStrategy(BaseStrategy):
             if not pos.symbol.startswith(index_name):
                 continue
 
-            instrument = self.all_instruments[self.all_instruments["symbol"] == pos.symbol].to_dict(orient="records")[0]
+            instrument = self.instrument_index.get(pos.symbol)
+            if instrument is None:
+                logger.warning(f"{pos.symbol} not found in master contract, skipping for delta")
+                continue
             quantity = pos.quantity_total
 
             # --- Futures Delta Calculation ---
@@ -332,20 +349,42 @@ class WaveStrategy(BaseStrategy):
         """Get the best prices for buy (lower) and sell (higher) orders"""
         return {'buy': min(buy_price_1, buy_price_2), 'sell': max(sell_price_1, sell_price_2)}
 
-    def _prepare_final_prices(self, scaled_buy_gap: float, scaled_sell_gap: float) -> Dict[str, float]:
-        """Prepare final order prices with cool-off period"""
+    def _initial_prices(self, scaled_buy_gap: float, scaled_sell_gap: float) -> Dict[str, float]:
+        """Order prices from the current quote, before the cool-off period"""
         price = self.broker.get_quote(self.symbol_name).last_price
         self.prev_quote_price = price
-        best_prices = self._get_best_buy_sell_price(
+        return self._get_best_buy_sell_price(
             price - scaled_buy_gap, self.scraper_last_price - scaled_buy_gap,
             price + scaled_sell_gap, self.scraper_last_price + scaled_sell_gap
         )
-        time.sleep(self.cool_off_time)
-        price_after_wait = self.broker.get_quote(self.symbol_name).last_price
+
+    def _subscribe_ticks(self) -> None:
+        """Stream the traded symbol so the post cool-off quote can come from the tick cache"""
+        subscribe = getattr(self.broker, "symbols_to_subscribe", None)
+        if subscribe is not None:
+            subscribe([self.symbol_name])
+
+    def _quote_after_cool_off(self) -> float:
+        """Price at the end of the cool-off period: the tick cache if it is fresh, else REST"""
+        get_cached = getattr(self.broker, "get_cached_quote", None)
+        quote = get_cached(self.symbol_name) if get_cached is not None else None
+        if quote is None:
+            quote = self.broker.get_quote(self.symbol_name)
+        return quote.last_price
+
+    def _final_prices(self, best_prices: Dict[str, float], scaled_buy_gap: float, scaled_sell_gap: float) -> Dict[str, float]:
+        """Order prices after the cool-off period"""
+        price_after_wait = self._quote_after_cool_off()
         return self._get_best_buy_sell_price(
             best_prices['buy'], price_after_wait - scaled_buy_gap,
             best_prices['sell'], price_after_wait + scaled_sell_gap
         )
+
+    def _prepare_final_prices(self, scaled_buy_gap: float, scaled_sell_gap: float) -> Dict[str, float]:
+        """Prepare final order prices with cool-off period (blocking; standalone runner only)"""
+        best_prices = self._initial_prices(scaled_buy_gap, scaled_sell_gap)
+        time.sleep(self.cool_off_time)
+        return self._final_prices(best_prices, scaled_buy_gap, scaled_sell_gap)
     
 
     def _execute_orders(self, symbol: str, final_buy_price: float, final_sell_price: float,
@@ -353,54 +392,71 @@ class WaveStrategy(BaseStrategy):
         """Execute buy and sell orders based on restrictions"""
         sell_order_id = -1
         logger.info(f"Executing orders for {symbol} | Restrictions - Buy: {restrict_buy_order}, Sell: {restrict_sell_order}")
-        if restrict_sell_order == 0:
-            req = OrderRequest(
-                symbol=symbol, exchange=Exchange.NFO, transaction_type=TransactionType.SELL,
-                quantity=self.sell_quantity, product_type=ProductType.MARGIN, order_type=OrderType.LIMIT,
-                price=final_sell_price, tag=self.tag
-            ) # TODO: Variety Supported is only Regular for now
-            sell_order_resp = self.broker.place_order(req)
-
-            logger.info("Sell Order Response - {}".format(sell_order_resp))
-
-            sell_order_id = sell_order_resp.order_id
-            if sell_order_id not in self.orders:
-                self.handle_order_update_call_tracker[sell_order_id] = False
+        sell_req = self._wave_order_request(symbol, TransactionType.SELL, self.sell_quantity, final_sell_price)
+        buy_req = self._wave_order_request(symbol, TransactionType.BUY, self.buy_quantity, final_buy_price)
+
+        if restrict_sell_order == 0 and restrict_buy_order == 0 and hasattr(self.broker, "place_order_pair"):
+            # Both legs in one round-trip; if either is rejected the other is cancelled
+            sell_order_resp, buy_order_resp = self.broker.place_order_pair(sell_req, buy_req)
+            if sell_order_resp.status == "ok":
+                sell_order_id = self._record_sell_order(sell_order_resp, symbol, final_sell_price)
+            else:
+                logger.warning(f"Sell order not placed: {sell_order_resp.message}")
+            if buy_order_resp.status == "ok":
+                self._record_buy_order(buy_order_resp, symbol, final_buy_price, final_sell_price, sell_order_id)
+            else:
+                logger.warning(f"Buy order not placed: {buy_order_resp.message}")
+            return
 
-            if sell_order_id != -1:
-                logger.info(f"Placed SELL order {sell_order_id} for {self.sell_quantity} @ {final_sell_price}")
-                self.add_order_to_list(sell_order_id, final_sell_price, self.sell_quantity, "SELL", symbol, -1)
-                logger.info(f"handle_order_update_call_tracker: {self.handle_order_update_call_tracker}")
-                if not self.handle_order_update_call_tracker[sell_order_id]:
-                    self.handle_order_update(self.handle_order_update_call_tracker_response_dict[sell_order_id])
+        if restrict_sell_order == 0:
+            sell_order_id = self._record_sell_order(self.broker.place_order(sell_req), symbol, final_sell_price)
 
         # only when the sell order has been placed or sell order was restricred and buy order was not restricted
         if (restrict_sell_order == 1 or sell_order_id != -1) and restrict_buy_order == 0:
-            req = OrderRequest(
-                symbol=symbol, exchange=Exchange.NFO, transaction_type=TransactionType.BUY,
-                quantity=self.buy_quantity, product_type=ProductType.MARGIN, order_type=OrderType.LIMIT,
-                price=final_buy_price, tag=self.tag
-            ) # TODO: Variety Supported is only Regular for now
-            buy_order_resp = self.broker.place_order(req)
-            logger.info("Buy Order Response - {}".format(buy_order_resp))
-            buy_order_id = buy_order_resp.order_id
-            self.handle_order_update_call_tracker[buy_order_id] = False
-            if buy_order_id != -1:
-                logger.info(f"Placed BUY order {buy_order_id} for {self.buy_quantity} @ {final_buy_price}")
-                if sell_order_id != -1:
-                    # Only if sell order is present in the orders list, then add buy order id as associated order id
-                    # if sell order is rejected or cancelled - this is not done
-                    if sell_order_id in self.orders:
-                        self.add_order_to_list(sell_order_id, final_sell_price, self.sell_quantity, "SELL", symbol, buy_order_id)
-                self.add_order_to_list(buy_order_id, final_buy_price, self.buy_quantity, "BUY", symbol, sell_order_id)
-                logger.info(f"handle_order_update_call_tracker: {self.handle_order_update_call_tracker}")
-                if not self.handle_order_update_call_tracker[buy_order_id]:
-                    self.handle_order_update(self.handle_order_update_call_tracker_response_dict[buy_order_id])
-            else:
-                logger.warning(f"Buy order failed, cancelling associated sell order {sell_order_id}")
-                self._remove_order(sell_order_id)
-                del self.handle_order_update_call_tracker[sell_order_id]
-                del self.handle_order_update_call_tracker_response_dict[sell_order_id]
+            self._record_buy_order(self.broker.place_order(buy_req), symbol, final_buy_price, final_sell_price, sell_order_id)
+
+    def _wave_order_request(self, symbol: str, transaction_type: TransactionType, quantity: int, price: float) -> OrderRequest:
+        return OrderRequest(
+            symbol=symbol, exchange=Exchange.NFO, transaction_type=transaction_type,
+            quantity=quantity, product_type=ProductType.MARGIN, order_type=OrderType.LIMIT,
+            price=price, tag=self.tag
+        ) # TODO: Variety Supported is only Regular for now
+
+    def _record_sell_order(self, sell_order_resp, symbol: str, final_sell_price: float):
+        logger.info("Sell Order Response - {}".format(sell_order_resp))
+
+        sell_order_id = sell_order_resp.order_id
+        if sell_order_id not in self.orders:
+            self.handle_order_update_call_tracker[sell_order_id] = False
+
+        if sell_order_id != -1:
+            logger.info(f"Placed SELL order {sell_order_id} for {self.sell_quantity} @ {final_sell_price}")
+            self.add_order_to_list(sell_order_id, final_sell_price, self.sell_quantity, "SELL", symbol, -1)
+            logger.info(f"handle_order_update_call_tracker: {self.handle_order_update_call_tracker}")
+            if not self.handle_order_update_call_tracker[sell_order_id]:
+                self.handle_order_update(self.handle_order_update_call_tracker_response_dict[sell_order_id])
+        return sell_order_id
+
+    def _record_buy_order(self, buy_order_resp, symbol: str, final_buy_price: float, final_sell_price: float, sell_order_id) -> None:
+        logger.info("Buy Order Response - {}".format(buy_order_resp))
+        buy_order_id = buy_order_resp.order_id
+        self.handle_order_update_call_tracker[buy_order_id] = False
+        if buy_order_id != -1:
+            logger.info(f"Placed BUY order {buy_order_id} for {self.buy_quantity} @ {final_buy_price}")
+            if sell_order_id != -1:
+                # Only if sell order is present in the orders list, then add buy order id as associated order id
+                # if sell order is rejected or cancelled - this is not done
+                if sell_order_id in self.orders:
+                    self.add_order_to_list(sell_order_id, final_sell_price, self.sell_quantity, "SELL", symbol, buy_order_id)
+            self.add_order_to_list(buy_order_id, final_buy_price, self.buy_quantity, "BUY", symbol, sell_order_id)
+            logger.info(f"handle_order_update_call_tracker: {self.handle_order_update_call_tracker}")
+            if not self.handle_order_update_call_tracker[buy_order_id]:
+                self.handle_order_update(self.handle_order_update_call_tracker_response_dict[buy_order_id])
+        else:
+            logger.warning(f"Buy order failed, cancelling associated sell order {sell_order_id}")
+            self._remove_order(sell_order_id)
+            del self.handle_order_update_call_tracker[sell_order_id]
+            del self.handle_order_update_call_tracker_response_dict[sell_order_id]
 
     def add_order_to_list(self, order_id, price, quantity, transaction_type, symbol, associated_order_id):
         now = datetime.datetime.now()
@@ -429,12 +485,66 @@ class WaveStrategy(BaseStrategy):
         self.print_current_status()
 
     def place_wave_order(self) -> None:
-        """Main function to execute wave trading strategy"""
+        """Main function to execute wave trading strategy (blocking; standalone runner)"""
         if self.already_executing_order > 0:
             logger.info("Order execution already in progress.")
             return
         
         self.already_executing_order = 1
+        try:
+            cycle = self._begin_wave_cycle()
+            time.sleep(self.cool_off_time)
+            self._finish_wave_cycle(cycle)
+            time.sleep(3)
+        except Exception as e:
+            logger.error(f"Error in wave order execution: {e}", exc_info=True)
+        finally:
+            self.already_executing_order = 0
+
+    def _schedule_wave_cycle(self, loop) -> None:
+        """
+        Start a wave cycle from the event loop. The first quote is taken now; the rest
+        of the cycle runs as a continuation once the cool-off timer fires, so the wait
+        costs no loop time. `already_executing_order` stays set until it completes.
+        """
+        self.already_executing_order = 1
+        self._begin_task = loop.create_task(self.run_blocking(self._begin_wave_cycle))
+        self._begin_task.add_done_callback(lambda t: self._on_wave_cycle_begun(loop, t))
+
+    def _on_wave_cycle_begun(self, loop, task) -> None:
+        if task is not self._begin_task:
+            return  # dropped by on_stop
+        self._begin_task = None
+        if task.cancelled() or task.exception() is not None:
+            if not task.cancelled():
+                logger.error(f"Error in wave order execution: {task.exception()}")
+            self.already_executing_order = 0
+            return
+        if not self._is_running:
+            self.already_executing_order = 0
+            return
+        cycle = task.result()
+        self._cool_off_handle = loop.call_later(self.cool_off_time, self._on_cool_off_elapsed, loop, cycle)
+
+    def _on_cool_off_elapsed(self, loop, cycle) -> None:
+        self._cool_off_handle = None
+        if not self._is_running:
+            self.already_executing_order = 0
+            return
+        self._wave_task = loop.create_task(self._complete_wave_cycle(cycle))
+
+    async def _complete_wave_cycle(self, cycle) -> None:
+        try:
+            await self.run_blocking(self._finish_wave_cycle, cycle)
+            self._update_signal("Wave bounds recalculated & orders rotated.")
+        except Exception as e:
+            logger.error(f"Error in wave order execution: {e}", exc_info=True)
+            self._update_signal(f"Exception Caught: {e}")
+        finally:
+            self.already_executing_order = 0
+
+    def _begin_wave_cycle(self) -> Dict:
+        """Restrictions, scaled gaps and pre-cool-off prices for a new wave cycle"""
         symbol = self.symbol_name.split(':')[1]
 
         if 'nifty' in symbol.lower() and 'bank' not in symbol.lower():
@@ -444,88 +554,103 @@ class WaveStrategy(BaseStrategy):
         else:
             raise ValueError(f"Invalid symbol: {symbol}")
         
-        try:
-            logger.info("--- Starting New Wave Order Cycle ---")
-            
-            symbol_restrictions, _ = self._get_symbol_restrictions(symbol)
-            restrict_buy_order, restrict_sell_order = 0, 0
-            
-            current_net = self._get_position_for_symbol()
-            # If new current_diff_scale > 0 it is more BUY, If it is < 0 it is SELL which has happened.
-            # TODO - TO BE FIXED BASED on the number of buy order and sell orders
-            # if a buy happens, next buy should happen with a factor of 1.3 , 
-            # if a buy and sell happens, ntext ubuy or sell can happen with a factor of 1
-            # Quantity should be removed and not used
-            # current_diff_scale = (current_net - self.initial_positions['position']) / self.quantity if self.quantity != 0 else 0 # TODO: Check this with Vibhu - We are setting quantity to sell_quantity in initilise function
-            current_diff_scale = self.get_current_position_difference()
-            symbol_type = self._get_symbol_type(symbol)
-            
-            if (symbol_type == "ce" or symbol_type == "pe") and current_net == 0:
-                logger.warning("No position, Order pushing for positive buy, will be allowed only once.")
-            
-            elif symbol_type in ("ce", "pe") and current_net > 0:
-                restrict_buy_order = 1
-                logger.info("Option already long, restricting further buys.")
+        logger.info("--- Starting New Wave Order Cycle ---")
+        
+        symbol_restrictions, _ = self._get_symbol_restrictions(symbol)
+        restrict_buy_order, restrict_sell_order = 0, 0
+        
+        current_net = self._get_position_for_symbol()
+        # If new current_diff_scale > 0 it is more BUY, If it is < 0 it is SELL which has happened.
+        # TODO - TO BE FIXED BASED on the number of buy order and sell orders
+        # if a buy happens, next buy should happen with a factor of 1.3 , 
+        # if a buy and sell happens, ntext ubuy or sell can happen with a factor of 1
+        # Quantity should be removed and not used
+        # current_diff_scale = (current_net - self.initial_positions['position']) / self.quantity if self.quantity != 0 else 0 # TODO: Check this with Vibhu - We are setting quantity to sell_quantity in initilise function
+        current_diff_scale = self.get_current_position_difference()
+        symbol_type = self._get_symbol_type(symbol)
+        
+        if (symbol_type == "ce" or symbol_type == "pe") and current_net == 0:
+            logger.warning("No position, Order pushing for positive buy, will be allowed only once.")
+        
+        elif symbol_type in ("ce", "pe") and current_net > 0:
+            restrict_buy_order = 1
+            logger.info("Option already long, restricting further buys.")
 
-            if symbol_restrictions.get(symbol_type, {}).get("buy") == "no":
-                restrict_buy_order = 1
-            if symbol_restrictions.get(symbol_type, {}).get("sell") == "no":
-                restrict_sell_order = 1
+        if symbol_restrictions.get(symbol_type, {}).get("buy") == "no":
+            restrict_buy_order = 1
+        if symbol_restrictions.get(symbol_type, {}).get("sell") == "no":
+            restrict_sell_order = 1
 
-            logger.info(f"Restrictions - Buy: {restrict_buy_order}, Sell: {restrict_sell_order}")
-            
-            scaled_buy_gap, scaled_sell_gap = self._get_scaled_gaps(current_diff_scale)
-            logger.info(f"Position Imbalance: {current_diff_scale:.2f} -> Scaled Gaps | Buy: {scaled_buy_gap}, Sell: {scaled_sell_gap}")
+        logger.info(f"Restrictions - Buy: {restrict_buy_order}, Sell: {restrict_sell_order}")
+        
+        scaled_buy_gap, scaled_sell_gap = self._get_scaled_gaps(current_diff_scale)
+        logger.info(f"Position Imbalance: {current_diff_scale:.2f} -> Scaled Gaps | Buy: {scaled_buy_gap}, Sell: {scaled_sell_gap}")
 
-            final_prices = self._prepare_final_prices(scaled_buy_gap, scaled_sell_gap)
-            logger.info(f"Final Prices -> Buy: {final_prices['buy']:.2f}, Sell: {final_prices['sell']:.2f}")
+        return {
+            'symbol': symbol,
+            'symbol_class': symbol_class,
+            'restrict_buy_order': restrict_buy_order,
+            'restrict_sell_order': restrict_sell_order,
+            'scaled_buy_gap': scaled_buy_gap,
+            'scaled_sell_gap': scaled_sell_gap,
+            'best_prices': self._initial_prices(scaled_buy_gap, scaled_sell_gap),
+        }
 
+    def _finish_wave_cycle(self, cycle: Dict) -> None:
+        """Post-cool-off pricing and order placement for a cycle from `_begin_wave_cycle`"""
+        symbol = cycle['symbol']
+        restrict_buy_order = cycle['restrict_buy_order']
+        restrict_sell_order = cycle['restrict_sell_order']
 
-            second_buy_price = None
-            second_sell_price = None
+        final_prices = self._final_prices(cycle['best_prices'], cycle['scaled_buy_gap'], cycle['scaled_sell_gap'])
+        logger.info(f"Final Prices -> Buy: {final_prices['buy']:.2f}, Sell: {final_prices['sell']:.2f}")
 
-            if self.prev_wave_buy_price is not None: 
-                second_buy_price = self.prev_wave_buy_price
-            else:
-                second_buy_price = final_prices['buy']
 
+        second_buy_price = None
+        second_sell_price = None
 
+        if self.prev_wave_buy_price is not None: 
+            second_buy_price = self.prev_wave_buy_price
+        else:
+            second_buy_price = final_prices['buy']
 
-            logger.info(f"Last Wave Values {self.prev_wave_buy_price}, Sell: {self.prev_wave_sell_price}")
 
-            if self.prev_wave_sell_price is not None:
-                second_sell_price = self.prev_wave_sell_price
-            else:
-                second_sell_price = final_prices['sell']
 
-            final_prices = self._get_best_buy_sell_price(
-                final_prices['buy'],  second_buy_price,
-                final_prices['sell'], second_sell_price
-            )
+        logger.info(f"Last Wave Values {self.prev_wave_buy_price}, Sell: {self.prev_wave_sell_price}")
 
-            # Special case to treat for NIFTY -  If the product is NIFTY and buy price is less than 25, 
-            # the buy restrict order is not considered and the buy order is placed. 
-            # This is done to save on the margins by closing the position.
-            if symbol_class == "nifty" and restrict_buy_order == 1 and final_prices['buy'] < 25:
-                restrict_buy_order = 0
-                logger.warning("NIFTY buy price is less than 25, not restricting buy order.")
-                logger.warning(f"Updated Restrictions- Buy: {restrict_buy_order}, Sell: {restrict_sell_order}")
+        if self.prev_wave_sell_price is not None:
+            second_sell_price = self.prev_wave_sell_price
+        else:
+            second_sell_price = final_prices['sell']
 
-            self._execute_orders(symbol, final_prices['buy'], final_prices['sell'], restrict_buy_order, restrict_sell_order)
+        final_prices = self._get_best_buy_sell_price(
+            final_prices['buy'],  second_buy_price,
+            final_prices['sell'], second_sell_price
+        )
 
+        # Special case to treat for NIFTY -  If the product is NIFTY and buy price is less than 25, 
+        # the buy restrict order is not considered and the buy order is placed. 
+        # This is done to save on the margins by closing the position.
+        if cycle['symbol_class'] == "nifty" and restrict_buy_order == 1 and final_prices['buy'] < 25:
+            restrict_buy_order = 0
+            logger.warning("NIFTY buy price is less than 25, not restricting buy order.")
+            logger.warning(f"Updated Restrictions- Buy: {restrict_buy_order}, Sell: {restrict_sell_order}")
+
+        if self._stopped:
+            # Cancelling _wave_task cannot interrupt this call once it runs on the broker pool
+            logger.info("Wave stopped during the cycle, not placing its orders.")
+            return
 
-            self.prev_wave_buy_price = final_prices['buy']
-            self.prev_wave_sell_price = final_prices['sell']
-            
-            logger.info(f"Previous Wave Prices -> Buy: {self.prev_wave_buy_price}, Sell: {self.prev_wave_sell_price}")
+        self._execute_orders(symbol, final_prices['buy'], final_prices['sell'], restrict_buy_order, restrict_sell_order)
 
-            logger.info("--- End of Wave Order Cycle ---")
-            logger.info("Current Orders List: {}".format(self.orders))
-            time.sleep(3)
-        except Exception as e:
-            logger.error(f"Error in wave order execution: {e}", exc_info=True)
-        finally:
-            self.already_executing_order = 0
+
+        self.prev_wave_buy_price = final_prices['buy']
+        self.prev_wave_sell_price = final_prices['sell']
+        
+        logger.info(f"Previous Wave Prices -> Buy: {self.prev_wave_buy_price}, Sell: {self.prev_wave_sell_price}")
+
+        logger.info("--- End of Wave Order Cycle ---")
+        logger.info("Current Orders List: {}".format(self.orders))
             
     def check_and_enforce_restrictions_on_active_orders(self):
         """Checks if active orders violate new delta restrictions and cancels them."""
@@ -0,0 +1,120 @@
+import importlib
+import os
+import sys
+import types
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from brokers.core.enums import Exchange  # noqa: E402
+from brokers.core.gateway import BrokerGateway  # noqa: E402
+from brokers.core.schemas import BrokerCapabilities, Quote  # noqa: E402
+from brokers.risk import MasterRiskController  # noqa: E402
+
+
+def load_strategy(module):
+    """
+    Import ``strategy.<module>``. Strategy modules import the broker layer both
+    absolutely and relative to the repository root, so they are loaded under a
+    package spanning the root, skipping ``strategy/__init__`` (which pulls in
+    every strategy's dependencies).
+    """
+    if "hub" not in sys.modules:
+        hub = types.ModuleType("hub")
+        hub.__path__ = [ROOT]
+        sys.modules["hub"] = hub
+        strategy = types.ModuleType("hub.strategy")
+        strategy.__path__ = [os.path.join(ROOT, "strategy")]
+        sys.modules["hub.strategy"] = strategy
+    return importlib.import_module(f"hub.strategy.{module}")
+
+
+def import_script(module, *strategies):
+    """
+    Import a top-level script (e.g. ``backtest_engine``) that imports
+    ``strategy.<name>`` directly, serving those from `load_strategy`.
+    """
+    for name in strategies:
+        loaded = load_strategy(name)
+        sys.modules.setdefault("strategy", sys.modules["hub.strategy"])
+        sys.modules.setdefault(f"strategy.{name}", loaded)
+    return importlib.import_module(module)
+
+
+def option_price(strike, opt_type, day, expiry_index=0):
+    """Deterministic LTP of the fixture options: moves every day, differs per expiry."""
+    moneyness = (strike - 25000) if opt_type == "PE" else (25000 - strike)
+    return round(max(5.0, 100.0 + moneyness / 5) + 7.0 * day + 30.0 * expiry_index, 2)
+
+
+def write_nse_csvs(path, days=("2026-02-02", "2026-02-03", "2026-02-04", "2026-02-05"),
+                   expiries=("2026-02-24", "2026-03-31"), strikes=range(24800, 25250, 50)):
+    """Tiny NSE index and OPTIDX dumps under the file names CSVDataProvider loads."""
+    closes = [25000.0 + 40 * i for i in range(len(days))]
+    pd.DataFrame({
+        "Date": list(days),
+        "Open": [c - 20 for c in closes],
+        "High": [c + 60 for c in closes],
+        "Low": [c - 60 for c in closes],
+        "Close": closes,
+    }).to_csv(os.path.join(path, "nifty50_3months.csv"), index=False)
+    for opt_type in ("CE", "PE"):
+        rows = [
+            {
+                "Date": day, "Expiry": pd.Timestamp(expiry).strftime("%d-%b-%Y"), "Option type": opt_type,
+                "Strike Price": float(strike), "LTP": option_price(strike, opt_type, d, e),
+                "Close": option_price(strike, opt_type, d, e), "Underlying Value": closes[d],
+            }
+            # Newest rows first, as NSE publishes them; the provider sorts on load
+            for d, day in reversed(list(enumerate(days)))
+            for e, expiry in enumerate(expiries)
+            for strike in strikes
+        ]
+        pd.DataFrame(rows).to_csv(
+            os.path.join(path, f"OPTIDX_NIFTY_{opt_type}_22-Jan-2026_TO_22-Feb-2026.csv"), index=False
+        )
+    return path
+
+
+class StreamingDriver:
+    """Counts REST quotes; ticks pushed through `tick` reach the gateway's websocket callback."""
+
+    def __init__(self):
+        self.rest_quotes = []
+        self.batched_quotes = []
+        self.subscribed = []
+        self._on_ticks = None
+
+    def get_capabilities(self):
+        return BrokerCapabilities()
+
+    def connect_websocket(self, *, on_ticks=None, **kwargs):
+        self._on_ticks = on_ticks
+
+    def symbols_to_subscribe(self, symbols):
+        self.subscribed.extend(symbols)
+
+    def normalize_ticks(self, message):
+        return [{"symbol": message["symbol"], "price": message["ltp"]}]
+
+    def tick(self, symbol, price):
+        self._on_ticks(None, {"symbol": symbol, "ltp": price})
+
+    def get_quotes(self, symbols):
+        self.batched_quotes.append(list(symbols))
+        return {s: self.get_quote(s) for s in symbols}
+
+    def get_quote(self, symbol):
+        self.rest_quotes.append(symbol)
+        return Quote(symbol=symbol.split(":")[1], exchange=Exchange.NFO, last_price=1.0)
+
+
+def risk_over_gateway():
+    """The main.py stack: risk controller over a gateway with a connected tick stream."""
+    driver = StreamingDriver()
+    gateway = BrokerGateway(driver, "backtest", quote_coalesce_ms=0, quote_max_age_ms=1000)
+    gateway.connect_websocket()
+    return driver, MasterRiskController(gateway)
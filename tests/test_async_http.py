@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp import web
+
+from brokers.core.errors import HTTPError
+from brokers.net import AsyncHTTPClient
+
+
+async def serve(app):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_requests_share_one_keep_alive_session():
+    peers = set()
+
+    async def quote(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"ltp": float(request.query["n"])})
+
+    async def fail(request):
+        return web.json_response({"error": "nope"}, status=503)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/quote", quote)
+        app.router.add_get("/fail", fail)
+        runner, base = await serve(app)
+        client = AsyncHTTPClient(pool_size=1)
+        try:
+            for n in range(3):
+                assert await client.get_json(f"{base}/quote", params={"n": n}) == {"ltp": float(n)}
+            with pytest.raises(HTTPError):
+                await client.get_json(f"{base}/fail")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert len(peers) == 1
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+from brokers.core.async_interface import as_async
+from brokers.core.schemas import BrokerCapabilities
+
+
+class CountingDriver:
+    """Records how many calls are inside the driver at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def get_funds(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+
+
+class ThreadSafeDriver(CountingDriver):
+    def get_capabilities(self):
+        return BrokerCapabilities(supports_concurrent_orders=True)
+
+
+def run_strategies(driver):
+
+    async def strategy():
+        adapter = as_async(driver)
+        await asyncio.gather(*(adapter.run(driver.get_funds) for _ in range(3)), adapter.get_funds())
+
+    async def main():
+        await asyncio.gather(strategy(), strategy(), strategy())
+
+    asyncio.run(main())
+    return driver.max_active
+
+
+def test_shared_adapter_serializes_calls_into_unsafe_drivers():
+    assert run_strategies(CountingDriver()) == 1
+
+
+def test_thread_safe_drivers_run_strategies_side_by_side():
+    assert run_strategies(ThreadSafeDriver()) > 1
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from brokers.integrations.backtest import cache
+from brokers.integrations.backtest.cache import read_csv_cached
+
+
+def parse_counting(calls):
+    def parse(path):
+        calls.append(path)
+        return pd.read_csv(path, parse_dates=["date"])
+    return parse
+
+
+def test_second_read_skips_the_parse(tmp_path):
+    src = tmp_path / "nifty.csv"
+    src.write_text("date,close\n2026-02-02,25000\n2026-02-03,25100\n", encoding="utf-8")
+    calls = []
+    first = read_csv_cached(str(src), parse_counting(calls), cache_dir=str(tmp_path / "c"))
+    second = read_csv_cached(str(src), parse_counting(calls), cache_dir=str(tmp_path / "c"))
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_pickle_fallback_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_feather", lambda: None)
+    src = tmp_path / "nifty.csv"
+    src.write_text("date,close\n2026-02-02,25000\n", encoding="utf-8")
+    calls = []
+    read_csv_cached(str(src), parse_counting(calls), cache_dir=str(tmp_path / "c"))
+    df = read_csv_cached(str(src), parse_counting(calls), cache_dir=str(tmp_path / "c"))
+    assert len(calls) == 1
+    assert [p.suffix for p in (tmp_path / "c").iterdir()] == [".pkl"]
+    assert df["close"].tolist() == [25000]
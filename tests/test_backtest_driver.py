@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from brokers.core.enums import Exchange, OrderType, ProductType, TransactionType
+from brokers.core.schemas import OrderRequest
+from brokers.integrations.backtest.driver import MARGIN_LOT_SIZE, MARGIN_PER_LOT, BacktestDriver
+
+SYMBOLS = ["NIFTY26FEB25000CE", "NIFTY26FEB25000PE", "NIFTY26FEB25100CE"]
+
+
+def order(driver, symbol, side, quantity):
+    response = driver.place_order(OrderRequest(
+        symbol=symbol, exchange=Exchange.NFO, quantity=quantity, order_type=OrderType.MARKET,
+        transaction_type=side, product_type=ProductType.MARGIN,
+    ))
+    assert response.status == "ok", response.message
+
+
+def assert_matches_recompute(driver):
+    positions = list(driver.positions.values())
+    for pos in positions:
+        assert pos.pnl == pytest.approx((driver.current_prices[pos.symbol] - pos.average_price) * pos.quantity_total)
+    unrealized = sum(pos.pnl for pos in positions)
+    value = sum(pos.quantity_total * pos.average_price for pos in positions)
+    short = sum(-pos.quantity_total for pos in positions if pos.quantity_total < 0)
+
+    assert driver._unrealized == pytest.approx(unrealized, abs=1e-6)
+    assert driver._position_value == pytest.approx(value, abs=1e-6)
+    assert driver._short_qty == short
+    funds = driver.get_funds()
+    assert funds.equity == pytest.approx(driver.current_cash + unrealized + value, abs=1e-6)
+    assert funds.used_margin == pytest.approx(short / MARGIN_LOT_SIZE * MARGIN_PER_LOT)
+
+
+def test_aggregates_follow_buy_sell_flip_and_close():
+    driver = BacktestDriver(initial_capital=10_000_000.0)
+    driver.set_prices({s: 100.0 for s in SYMBOLS})
+    steps = [
+        ("NIFTY26FEB25000CE", TransactionType.BUY, 50),    # open long
+        ("NIFTY26FEB25000CE", TransactionType.BUY, 25),    # add, new average
+        ("NIFTY26FEB25000PE", TransactionType.SELL, 50),   # open short
+        ("NIFTY26FEB25000CE", TransactionType.SELL, 150),  # flip long to short
+        ("NIFTY26FEB25000PE", TransactionType.SELL, 25),   # add to short
+        ("NIFTY26FEB25000PE", TransactionType.BUY, 125),   # flip short to long
+        ("NIFTY26FEB25000CE", TransactionType.BUY, 75),    # close
+        ("NIFTY26FEB25000PE", TransactionType.SELL, 50),   # close
+    ]
+    for i, (symbol, side, quantity) in enumerate(steps):
+        driver.set_price(symbol, 100.0 + 7 * i)
+        order(driver, symbol, side, quantity)
+        assert_matches_recompute(driver)
+        driver.set_prices({s: 90.0 + 11 * i for s in SYMBOLS})
+        assert_matches_recompute(driver)
+
+    assert driver.positions == {}
+    assert driver.get_funds().equity == pytest.approx(driver.current_cash)
+
+
+def test_aggregates_survive_a_random_walk():
+    rng = random.Random(7)
+    driver = BacktestDriver(initial_capital=10_000_000.0)
+    driver.set_prices({s: 100.0 for s in SYMBOLS})
+    for _ in range(300):
+        symbol = rng.choice(SYMBOLS)
+        if rng.random() < 0.3:
+            driver.set_prices({s: round(rng.uniform(5, 300), 2) for s in rng.sample(SYMBOLS, 2)})
+        else:
+            driver.set_price(symbol, round(rng.uniform(5, 300), 2))
+            order(driver, symbol, rng.choice([TransactionType.BUY, TransactionType.SELL]), 25 * rng.randint(1, 4))
+        assert_matches_recompute(driver)
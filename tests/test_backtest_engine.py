@@ -0,0 +1,53 @@
+from brokers.core.enums import Exchange, OrderType, ProductType, TransactionType
+from brokers.core.schemas import OrderRequest
+from brokers.integrations.backtest.csv_provider import CSVDataProvider
+
+from conftest import import_script, write_nse_csvs
+
+backtest_engine = import_script("backtest_engine", "survivor")
+
+
+class ScriptedStrategy:
+    """Sells a put, then a call, then buys the put back, holding across days."""
+
+    def __init__(self, broker, config, order_tracker=None):
+        self.broker = broker
+        self.symbol_initials = config["symbol_initials"]
+        self.ticks = 0
+
+    def refresh_instruments(self):
+        pass
+
+    def on_ticks_update(self, tick):
+        self.ticks += 1
+        orders = {1: ("25000PE", TransactionType.SELL), 5: ("25100CE", TransactionType.SELL),
+                  9: ("25000PE", TransactionType.BUY)}
+        if self.ticks in orders:
+            leg, side = orders[self.ticks]
+            self.broker.place_order(OrderRequest(
+                symbol=self.symbol_initials + leg, exchange=Exchange.NFO, quantity=50,
+                order_type=OrderType.MARKET, transaction_type=side, product_type=ProductType.MARGIN,
+            ))
+
+
+def run(tmp_path, fast):
+    engine = backtest_engine.BacktestEngine(
+        ScriptedStrategy, {"index_symbol": "NSE:NIFTY 50"}, initial_capital=1_000_000.0,
+        output_dir=str(tmp_path / ("fast" if fast else "slow")),
+    )
+    provider = CSVDataProvider(str(tmp_path), use_cache=False)
+    data = engine.select_csv_window(engine.use_csv_provider(provider), "2026-02-01", "2026-02-28")
+    engine.run(data, fast=fast, save=False)
+    return engine
+
+
+def test_fast_loop_matches_the_row_loop(tmp_path):
+    write_nse_csvs(str(tmp_path))
+    slow, fast = run(tmp_path, fast=False), run(tmp_path, fast=True)
+
+    assert slow.results["total_trades"] == fast.results["total_trades"] == 3
+    assert slow.results["final_equity"] == fast.results["final_equity"]
+    assert list(slow._curve_equity) == list(fast._curve_equity)
+    assert [(t["symbol"], t["price"]) for t in slow.driver.trades] == [(t["symbol"], t["price"]) for t in fast.driver.trades]
+    # The short call is still open and marked at the last day's price, not its fill
+    assert slow.driver.positions["NIFTY26FEB25100CE"].pnl != 0
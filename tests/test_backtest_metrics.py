@@ -0,0 +1,31 @@
+import numpy as np
+
+from backtest_metrics import NS_PER_DAY, drawdown_metrics
+
+
+def days(n):
+    return np.arange(n, dtype=np.int64) * NS_PER_DAY
+
+
+def test_no_drawdown_on_flat_or_rising_curve():
+    for equity in ([100.0] * 5, [100.0, 101.0, 102.0, 103.0, 104.0]):
+        metrics = drawdown_metrics(days(5), np.asarray(equity))
+        assert metrics["max_drawdown"] == 0
+        assert metrics["max_drawdown_bars"] == 0
+        assert metrics["max_drawdown_days"] == 0.0
+
+
+def test_drawdown_spell_runs_from_high_to_recovery():
+    # High at bar 1, underwater bars 2-4, recovered at bar 5
+    equity = np.asarray([100.0, 110.0, 105.0, 100.0, 108.0, 111.0, 111.0])
+    metrics = drawdown_metrics(days(len(equity)), equity)
+    assert metrics["max_drawdown"] == 10.0
+    assert metrics["max_drawdown_bars"] == 4
+    assert metrics["max_drawdown_days"] == 4.0
+
+
+def test_open_drawdown_runs_to_last_bar():
+    equity = np.asarray([100.0, 90.0, 95.0, 98.0])
+    metrics = drawdown_metrics(days(len(equity)), equity)
+    assert metrics["max_drawdown_bars"] == 3
+    assert metrics["max_drawdown_days"] == 3.0
@@ -0,0 +1,38 @@
+import multiprocessing
+import os
+
+import pytest
+
+from conftest import ROOT, import_script, write_nse_csvs
+
+backtest_sweep = import_script("backtest_sweep", "survivor")
+
+# Workers reuse the strategy modules the parent imported; a fresh interpreter
+# cannot import strategy/ directly
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork workers")
+
+
+def sweep(tmp_path, start="2026-02-01", end="2026-02-28"):
+    config = backtest_sweep.load_survivor_config(os.path.join(ROOT, "strategy", "configs", "survivor.yml"))
+    grid = backtest_sweep.build_grid({"pe_gap": [20, 30]})
+    return backtest_sweep.run_sweep(grid, str(tmp_path), start, end, config, initial_capital=1_000_000.0, workers=2)
+
+
+def test_grid_runs_in_worker_processes(tmp_path):
+    write_nse_csvs(str(tmp_path))
+    table = sweep(tmp_path)
+
+    assert sorted(table["pe_gap"]) == [20, 30]
+    assert table["error"].isna().all()
+    assert (table["total_trades"] > 0).all()
+    assert backtest_sweep.exit_code(table) == 0
+
+
+def test_sweep_with_no_successful_run_exits_non_zero(tmp_path):
+    write_nse_csvs(str(tmp_path))
+    table = sweep(tmp_path, start="2025-01-01", end="2025-01-31")
+
+    assert table["error"].str.contains("No data in the selected window").all()
+    assert backtest_sweep.exit_code(table) == 1
+    table.loc[0, "error"] = None
+    assert backtest_sweep.exit_code(table) == 0
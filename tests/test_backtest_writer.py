@@ -0,0 +1,17 @@
+from backtest_writer import BacktestWriter, read_jsonl
+from brokers.core.schemas import Funds
+
+
+def test_read_jsonl_skips_a_partly_written_last_line(tmp_path):
+    path = tmp_path / "equity.jsonl"
+    path.write_text('{"equity": 100}\n{"equity": 101}\n{"equi', encoding="utf-8")
+    assert read_jsonl(str(path)) == [{"equity": 100}, {"equity": 101}]
+
+
+def test_writer_closes_once(tmp_path):
+    writer = BacktestWriter(str(tmp_path), buffer_size=10)
+    writer.record_equity("2026-02-02", Funds(equity=100.0, available_cash=100.0, used_margin=0.0, net=100.0))
+    writer.close()
+    writer.close()
+    assert writer.closed
+    assert read_jsonl(writer.equity_path)[0]["equity"] == 100.0
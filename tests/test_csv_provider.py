@@ -0,0 +1,146 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from brokers.integrations.backtest.csv_provider import CSVDataProvider
+
+from conftest import write_nse_csvs
+
+CE_FILE = "OPTIDX_NIFTY_CE_22-Jan-2026_TO_22-Feb-2026.csv"
+PE_FILE = "OPTIDX_NIFTY_PE_22-Jan-2026_TO_22-Feb-2026.csv"
+TIMES = [pd.Timestamp(t) for t in ("2026-01-30 10:00", "2026-02-02 09:15", "2026-02-03 15:00",
+                                   "2026-02-04 11:00", "2026-02-05 12:00", "2026-02-08 10:00")]
+
+
+def gappy_csvs(path):
+    """Fixture dumps with holes: strikes missing per expiry/day, a PE-less day and unusable LTPs."""
+    write_nse_csvs(path)
+    for name in (CE_FILE, PE_FILE):
+        df = pd.read_csv(os.path.join(path, name))
+        expiry = pd.to_datetime(df["Expiry"])
+        drop = ((df["Strike Price"] == 25000) & (expiry == "2026-03-31") & (df["Date"] == "2026-02-03")) | (
+            (df["Strike Price"] == 24800) & (df["Date"] == "2026-02-04"))
+        if name == PE_FILE:
+            drop |= df["Date"] == "2026-02-05"
+        df = df[~drop].copy()
+        df["LTP"] = df["LTP"].astype(object)
+        df.loc[df["Strike Price"] == 25050, "LTP"] = "-"
+        df.loc[df["Strike Price"] == 25150, "LTP"] = 0
+        df.to_csv(os.path.join(path, name), index=False)
+    return path
+
+
+def raw(path):
+    frames = {}
+    for opt_type, name in (("CE", CE_FILE), ("PE", PE_FILE)):
+        df = pd.read_csv(os.path.join(path, name))
+        df["Date"] = pd.to_datetime(df["Date"])
+        df["Expiry"] = pd.to_datetime(df["Expiry"])
+        frames[opt_type] = df
+    return frames
+
+
+def row_price(row):
+    ltp = pd.to_numeric(row["LTP"], errors="coerce")
+    return float(ltp) if pd.notna(ltp) and ltp != 0 else float(row["Close"])
+
+
+def filtered_price(frames, symbol, timestamp):
+    """The pre-index lookup: boolean masks over the whole frame, preferring the symbol's own month."""
+    year, month, strike, opt_type = re.match(r"NIFTY(\d{2})([A-Z]{3})(\d+)(CE|PE)", symbol).groups()
+    data = frames[opt_type]
+    date = pd.Timestamp(timestamp.date())
+    if not (data["Date"] == date).any():
+        earlier = data.loc[data["Date"] <= date, "Date"]
+        if earlier.empty:
+            return 0.0
+        date = earlier.max()
+    rows = data[(data["Date"] == date) & (data["Strike Price"] == float(strike))].sort_values("Expiry")
+    in_month = rows[rows["Expiry"].dt.strftime("%y%b").str.upper() == year + month]
+    for candidates in (in_month, rows):
+        if not candidates.empty:
+            return row_price(candidates.iloc[0])
+    return 0.0
+
+
+def filtered_chain(frames, timestamp):
+    ce, pe = frames["CE"], frames["PE"]
+    date = pd.Timestamp(timestamp.date())
+    if not ((ce["Date"] == date).any() or (pe["Date"] == date).any()):
+        earlier = ce.loc[ce["Date"] <= date, "Date"]
+        if earlier.empty:
+            return None
+        date = earlier.max()
+    day_ce, day_pe = ce[ce["Date"] == date], pe[pe["Date"] == date]
+    expiry = (day_ce if not day_ce.empty else day_pe)["Expiry"].min()
+    return {side: rows[rows["Expiry"] == expiry] for side, rows in (("CE", day_ce), ("PE", day_pe))}, expiry
+
+
+def legs(frame):
+    return sorted(zip(frame["Date"], frame["Expiry"], frame["Strike Price"], frame["Option type"]))
+
+
+@pytest.fixture
+def data(tmp_path):
+    return str(gappy_csvs(str(tmp_path)))
+
+
+def test_indexed_quotes_match_row_filters(data):
+    provider, frames = CSVDataProvider(data, use_cache=False), raw(data)
+    for month in ("FEB", "MAR", "APR"):
+        for strike in range(24750, 25300, 25):
+            for opt_type in ("CE", "PE"):
+                symbol = f"NIFTY26{month}{strike}{opt_type}"
+                for t in TIMES:
+                    assert provider.get_option_price(symbol, t) == filtered_price(frames, symbol, t), (symbol, t)
+
+
+def test_indexed_chains_match_row_filters(data):
+    provider, frames = CSVDataProvider(data, use_cache=False), raw(data)
+    for t in TIMES:
+        chain = provider.get_option_chain(t)
+        expected = filtered_chain(frames, t)
+        if expected is None:
+            assert chain is None
+            continue
+        sides, expiry = expected
+        assert chain["expiry"] == expiry
+        for side in ("CE", "PE"):
+            assert legs(chain[side]) == legs(sides[side]), (t, side)
+            assert chain[side]["_price"].tolist() == [row_price(r) for _, r in sides[side].sort_values("Strike Price").iterrows()]
+
+
+def test_synth_symbols_match_the_row_formatter(data):
+    def synth_symbol(row):
+        exp = row["Expiry"]
+        return f"NIFTY{exp.strftime('%y')}{exp.strftime('%b').upper()}{int(row['Strike Price'])}{row['Option type']}"
+
+    for frame in raw(data).values():
+        frame.loc[len(frame)] = frame.iloc[0]
+        frame.loc[len(frame) - 1, "Expiry"] = pd.NaT
+        symbols = CSVDataProvider._synth_symbols(frame)
+        assert isinstance(symbols.dtype, pd.CategoricalDtype)
+        assert symbols.iloc[:-1].tolist() == frame.iloc[:-1].apply(synth_symbol, axis=1).tolist()
+        # A row without an expiry gets no symbol instead of breaking the column
+        assert pd.isna(symbols.iloc[-1])
+
+
+def test_instruments_are_built_once_per_chain(data):
+    provider = CSVDataProvider(data, use_cache=False)
+
+    morning = provider.get_instruments(pd.Timestamp("2026-02-03 09:15"))
+    assert provider.get_instruments(pd.Timestamp("2026-02-03 15:30")) is morning
+    chain = provider.get_option_chain(pd.Timestamp("2026-02-03 09:15"))
+    assert sorted(morning["symbol"]) == sorted(chain["CE"]["synth_symbol"].tolist() + chain["PE"]["synth_symbol"].tolist())
+    assert set(morning["instrument_type"]) == {"CE", "PE"}
+    assert (morning["lot_size"] == 50).all() and (morning["segment"] == "NFO-OPT").all()
+
+    next_day = provider.get_instruments(pd.Timestamp("2026-02-04 09:15"))
+    assert next_day is not morning
+    assert "NIFTY26FEB24800CE" not in set(next_day["symbol"])
+    # A day without data falls back to the last day's chain, and its cached table
+    last_day = provider.get_instruments(pd.Timestamp("2026-02-05 10:00"))
+    assert provider.get_instruments(pd.Timestamp("2026-02-08 10:00")) is last_day
+    assert provider.get_instruments(pd.Timestamp("2026-01-30 10:00")) is None
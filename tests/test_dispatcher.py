@@ -0,0 +1,190 @@
+import threading
+import time
+
+import pytest
+
+from dispatcher import CONFLATE_MODE, FANOUT_MODE, DataDispatcher
+
+
+def tick(symbol, price):
+    return {"symbol": symbol, "ltp": price}
+
+
+@pytest.fixture
+def fanout():
+    dispatcher = DataDispatcher(mode=FANOUT_MODE, ingest_size=3)
+    yield dispatcher
+    dispatcher.close()
+
+
+def test_fanout_routes_ticks_by_symbol_and_to_wildcards(fanout):
+    nifty = fanout.subscribe(["NIFTY"])
+    everything = fanout.subscribe()
+
+    fanout.dispatch([tick("NIFTY", 1.0), tick("BANKNIFTY", 2.0)])
+
+    assert [everything.get(timeout=1)["symbol"] for _ in range(2)] == ["NIFTY", "BANKNIFTY"]
+    assert nifty.get(timeout=1)["ltp"] == 1.0
+    assert nifty.get(timeout=0.1) is None
+
+
+def test_subscribers_share_one_read_only_tick(fanout):
+    first, second = fanout.subscribe(["NIFTY"]), fanout.subscribe(["NIFTY"])
+    fanout.dispatch(tick("NIFTY", 1.0))
+
+    shared = first.get(timeout=1)
+    assert second.get(timeout=1) is shared
+    with pytest.raises(TypeError):
+        shared["ltp"] = 2.0
+
+
+def test_slow_subscriber_drops_oldest_ticks(fanout):
+    slow, fast = fanout.subscribe(["NIFTY"], maxsize=2), fanout.subscribe(["NIFTY"])
+    fanout.dispatch([tick("NIFTY", p) for p in (1.0, 2.0, 3.0, 4.0)])
+    fanout.dispatch(tick("NIFTY", 5.0))
+    assert [fast.get(timeout=1)["ltp"] for _ in range(5)] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    assert [t["ltp"] for t in slow.get_batch(timeout=1)] == [4.0, 5.0]
+    assert (slow.delivered, slow.dropped) == (5, 3)
+
+
+def test_unsubscribed_consumer_receives_nothing(fanout):
+    gone, kept = fanout.subscribe(["NIFTY"]), fanout.subscribe(["NIFTY"])
+    gone.close()
+    fanout.dispatch(tick("NIFTY", 1.0))
+
+    assert kept.get(timeout=1)["ltp"] == 1.0
+    assert gone.get(timeout=0.1) is None
+    assert fanout._subscribers == {"NIFTY": [kept]}
+
+
+def test_close_stops_the_ingest_thread():
+    dispatcher = DataDispatcher(mode=FANOUT_MODE)
+    dispatcher.subscribe(["NIFTY"])
+    dispatcher.close()
+
+    assert not dispatcher._ingest_thread.is_alive()
+
+
+def test_ingest_backlog_drops_oldest_when_routing_stalls(fanout):
+    routing, release = threading.Event(), threading.Event()
+    stuck = fanout.subscribe(["STUCK"])
+
+    def offer(shared):
+        routing.set()
+        release.wait(5)
+
+    stuck._offer = offer
+    nifty = fanout.subscribe(["NIFTY"])
+    fanout.dispatch(tick("STUCK", 0.0))
+    assert routing.wait(1)  # the ingest thread is held up routing that tick
+
+    for price in range(5):
+        fanout.dispatch(tick("NIFTY", float(price)))
+    assert fanout.stats()["ingest_backlog"] == 3
+    assert fanout.stats()["ingest_dropped"] == 2
+
+    release.set()
+    assert [t["ltp"] for t in (nifty.get(timeout=1) for _ in range(3))] == [2.0, 3.0, 4.0]
+
+
+def test_close_with_a_full_ingest_backlog(fanout):
+    routing, release = threading.Event(), threading.Event()
+    stuck = fanout.subscribe(["STUCK"])
+
+    def offer(shared):
+        routing.set()
+        release.wait(5)
+
+    stuck._offer = offer
+    nifty = fanout.subscribe(["NIFTY"])
+    fanout.dispatch(tick("STUCK", 0.0))
+    assert routing.wait(1)
+    for price in range(3):
+        fanout.dispatch(tick("NIFTY", float(price)))
+
+    closing = threading.Thread(target=fanout.close)
+    closing.start()
+    # The stop marker displaces the oldest backlog item instead of waiting for room
+    deadline = time.monotonic() + 1
+    while fanout.stats()["ingest_dropped"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fanout.stats()["ingest_dropped"] == 1
+
+    release.set()
+    closing.join(5)
+    assert not closing.is_alive()
+    assert not fanout._ingest_thread.is_alive()
+    assert [t["ltp"] for t in nifty.get_batch(timeout=1)] == [1.0, 2.0]
+
+
+def test_stats_count_whole_ingest_batches(fanout):
+    routing, release = threading.Event(), threading.Event()
+    stuck = fanout.subscribe(["STUCK"])
+
+    def offer(shared):
+        routing.set()
+        release.wait(5)
+
+    stuck._offer = offer
+    nifty = fanout.subscribe(["NIFTY"])
+    fanout.dispatch([tick("NIFTY", 1.0), {"ltp": 2.0}, tick("STUCK", 3.0)])
+    assert routing.wait(1)
+    stats = fanout.stats()
+    assert (stats["received"], stats["delivered"], stats["dropped"]) == (0, 0, 0)
+
+    release.set()
+    assert nifty.get(timeout=1)["ltp"] == 1.0
+    deadline = time.monotonic() + 1
+    while fanout.stats()["received"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = fanout.stats()
+    assert (stats["received"], stats["delivered"], stats["dropped"]) == (3, 2, 1)
+
+
+def test_every_tick_is_received_or_counted_as_dropped_across_producers():
+    dispatcher = DataDispatcher(mode=FANOUT_MODE, ingest_size=4)
+    dispatcher.subscribe()
+    producers = [
+        threading.Thread(target=lambda: [dispatcher.dispatch(tick("NIFTY", float(p))) for p in range(2000)])
+        for _ in range(4)
+    ]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    dispatcher.close()
+
+    stats = dispatcher.stats()
+    assert stats["received"] + stats["ingest_dropped"] + stats["ingest_backlog"] == 8000
+
+
+def test_conflate_keeps_latest_tick_per_symbol_in_first_update_order():
+    dispatcher = DataDispatcher(mode=CONFLATE_MODE)
+    dispatcher.dispatch([tick("NIFTY", 1.0), tick("BANKNIFTY", 2.0), tick("NIFTY", 3.0)])
+    dispatcher.dispatch({"ltp": 4.0})  # no symbol to conflate on
+
+    assert dispatcher.drain(timeout=1) == [tick("NIFTY", 3.0), tick("BANKNIFTY", 2.0)]
+    stats = dispatcher.stats()
+    assert (stats["received"], stats["delivered"], stats["conflated"], stats["dropped"]) == (4, 2, 1, 1)
+    assert stats["pending_symbols"] == 0
+
+
+def test_drain_times_out_empty_and_resumes_on_new_ticks():
+    dispatcher = DataDispatcher(mode=CONFLATE_MODE)
+    assert dispatcher.drain(timeout=0.05) == []
+
+    dispatcher.dispatch(tick("NIFTY", 1.0))
+    dispatcher.drain(timeout=1)
+    assert dispatcher.drain(timeout=0.05) == []
+
+    threading.Timer(0.05, dispatcher.dispatch, args=(tick("NIFTY", 2.0),)).start()
+    assert dispatcher.drain(timeout=1) == [tick("NIFTY", 2.0)]
+
+
+def test_ring_keeps_recent_history_per_symbol():
+    dispatcher = DataDispatcher(mode=CONFLATE_MODE, ring_size=2)
+    dispatcher.dispatch([tick("NIFTY", p) for p in (1.0, 2.0, 3.0)])
+
+    assert [t["ltp"] for t in dispatcher.history("NIFTY")] == [2.0, 3.0]
+    assert dispatcher.history("BANKNIFTY") == []
@@ -0,0 +1,122 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from brokers.instruments import MasterContractCache
+from brokers.integrations.fyers import driver as fyers
+
+SEGMENTS = fyers.FYERS_MASTER_SEGMENTS
+
+
+def sym_details(segment):
+    """Two rows of a Fyers sym_details CSV for `segment`."""
+    exchange = segment.split("_")[0]
+    rows = []
+    for i, strike in enumerate((25000, 25100)):
+        ticker = f"{exchange}:NIFTY26FEB{strike}CE" if segment.endswith("_FO") else f"{exchange}:{segment}{i}-EQ"
+        expiry = "1771927200" if segment.endswith("_FO") else ""
+        rows.append(",".join([
+            f"10{SEGMENTS.index(segment)}{i}", f"{segment} {i}", "14", "75", "0.05", "", "0915-1530", "1770000000",
+            expiry, ticker, "10", "11", str(1000 + i), "NIFTY", "26000", str(strike), "CE", "101", "", "", "",
+        ]))
+    return ("\n".join(rows) + "\n").encode()
+
+
+class Response:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def raise_for_status(self):
+        if self.status != 200:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), 7):
+            yield self.body[start:start + 7]
+
+
+class Session:
+    """Serves every segment, holding each request until `parallel` of them are in flight."""
+
+    def __init__(self, parallel=1, failing=()):
+        self.urls = []
+        self.failing = failing
+        self._barrier = threading.Barrier(parallel, timeout=5) if parallel > 1 else None
+
+    def get(self, url, stream, timeout):
+        self.urls.append(url)
+        if self._barrier is not None:
+            self._barrier.wait()
+        segment = url.rsplit("/", 1)[1][:-len(".csv")]
+        return Response(sym_details(segment), 500 if segment in self.failing else 200)
+
+
+@pytest.fixture
+def driver(tmp_path, monkeypatch):
+    for var in ("BROKER_API_KEY", "FYERS_API_KEY", "FYERS_ACCESS_TOKEN", "BROKER_ACCESS_TOKEN"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(fyers, "FYERS_MASTER_DIR", str(tmp_path / "raw"))
+    monkeypatch.setattr(fyers, "MasterContractCache", lambda name: MasterContractCache(name, cache_dir=str(tmp_path / "cache")))
+    return fyers.FyersDriver()
+
+
+def serve(monkeypatch, session):
+    monkeypatch.setattr(fyers, "get_session", lambda broker: session)
+    return session
+
+
+def sequential_master(tmp_path, segments):
+    frames = []
+    for seg in segments:
+        path = tmp_path / f"{seg}.csv"
+        path.write_bytes(sym_details(seg))
+        frames.append(fyers.FyersDriver._parse_master_contract(str(path)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_segments_download_concurrently_into_one_ordered_master(driver, tmp_path, monkeypatch):
+    # Every request waits for all the others, so this only completes if they overlap
+    session = serve(monkeypatch, Session(parallel=len(SEGMENTS)))
+    driver.download_instruments()
+
+    assert len(session.urls) == len(SEGMENTS)
+    pd.testing.assert_frame_equal(driver.master_contract_df, sequential_master(tmp_path, SEGMENTS))
+    assert not [p for p in (tmp_path / "raw").iterdir() if p.suffix == ".tmp"]
+
+
+def test_fresh_segments_come_from_the_cache(driver, monkeypatch):
+    serve(monkeypatch, Session(parallel=len(SEGMENTS)))
+    driver.download_instruments()
+    first = driver.master_contract_df
+
+    session = serve(monkeypatch, Session())
+    driver.download_instruments()
+    assert session.urls == []
+    pd.testing.assert_frame_equal(driver.master_contract_df, first)
+
+    driver.download_instruments(force=True, segments=["nse_fo"])
+    assert session.urls == [fyers.FYERS_MASTER_URL.format(segment="NSE_FO")]
+
+
+def test_subset_keeps_segment_order(driver, tmp_path, monkeypatch):
+    serve(monkeypatch, Session(parallel=2))
+    driver.download_instruments(segments=["NSE_CM", "NSE_FO"])
+    pd.testing.assert_frame_equal(driver.master_contract_df, sequential_master(tmp_path, ["NSE_FO", "NSE_CM"]))
+
+    with pytest.raises(ValueError, match="NSE_XX"):
+        driver.download_instruments(segments=["NSE_XX"])
+
+
+def test_a_failed_segment_fails_the_download_and_caches_nothing_for_it(driver, tmp_path, monkeypatch):
+    serve(monkeypatch, Session(failing=("BSE_FO",)))
+    with pytest.raises(RuntimeError, match="HTTP 500"):
+        driver.download_instruments(segments=["NSE_FO", "BSE_FO"])
+    assert MasterContractCache("fyers_BSE_FO", cache_dir=str(tmp_path / "cache")).load() is None
@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("urllib3")
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
+
+from brokers.net.http import pool_options
+
+
+def retry():
+    return pool_options()["max_retries"]
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+def test_order_calls_retry_connection_errors_only(method):
+    assert not retry().is_retry(method, 503)
+    with pytest.raises(ReadTimeoutError):
+        retry().increment(method=method, url="/orders", error=ReadTimeoutError(None, "/orders", "timed out"))
+    assert retry().increment(method=method, url="/orders", error=NewConnectionError(None, "refused")).connect == 2
+
+
+def test_reads_retry_timeouts_and_server_errors():
+    assert retry().is_retry("GET", 503)
+    assert retry().increment(method="GET", url="/quote", error=ReadTimeoutError(None, "/quote", "timed out")).read == 2
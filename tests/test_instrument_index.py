@@ -0,0 +1,68 @@
+import pandas as pd
+
+from brokers.instruments import InstrumentIndex
+
+
+def master():
+    rows = [("NSE", "SBIN", 779521, None, None, "EQ", "NSE"),
+            ("BSE", "SBIN", 128028676, None, None, "EQ", "BSE")]
+    for strike, token in ((24900.0, 1001), (25000.0, 1002), (25100.0, 1003)):
+        rows.append(("NFO", f"NIFTY26FEB{int(strike)}CE", token, "NIFTY", strike, "CE", "NFO-OPT"))
+        rows.append(("NFO", f"NIFTY26FEB{int(strike)}PE", token + 100, "NIFTY", strike, "PE", "NFO-OPT"))
+    rows.append(("NFO", "NIFTY26MAR25000CE", 2002, "NIFTY", 25000.0, "CE", "NFO-OPT"))
+    return pd.DataFrame(rows, columns=["exchange", "symbol", "token", "name", "strike", "instrument_type", "segment"])
+
+
+def test_get_by_bare_and_qualified_symbol():
+    index = InstrumentIndex(master())
+
+    assert index.get("NIFTY26FEB25000CE")["token"] == 1002
+    assert index.get("BSE:SBIN")["token"] == 128028676
+    assert index.get("NSE:SBIN")["token"] == 779521
+    assert "NIFTY26FEB25000PE" in index
+
+
+def test_missing_symbol_and_token_return_none():
+    index = InstrumentIndex(master())
+
+    assert index.get("NIFTY26FEB99999CE") is None
+    assert index.get("MCX:SBIN") is None
+    assert index.token("NIFTY26FEB99999CE") is None
+    assert index.by_token(42) is None
+    assert InstrumentIndex(None).get("SBIN") is None
+
+
+def test_symbol_token_round_trip():
+    index = InstrumentIndex(master())
+
+    for qualified in ("NSE:SBIN", "BSE:SBIN", "NFO:NIFTY26FEB25100PE"):
+        row = index.by_token(index.token(qualified))
+        assert f"{row['exchange']}:{row['symbol']}" == qualified
+
+
+def test_series_exact_and_nearest_strike():
+    index = InstrumentIndex(master())
+    calls = index.series("NIFTY26FEB", "CE", segment="NFO-OPT")
+
+    assert calls.strikes == [24900.0, 25000.0, 25100.0]
+    assert calls.step == 100.0
+    assert index.nearest(calls, 25000.0)["symbol"] == "NIFTY26FEB25000CE"
+    assert index.nearest(calls, 25040.0)["symbol"] == "NIFTY26FEB25000CE"
+    assert index.nearest(calls, 25060.0)["symbol"] == "NIFTY26FEB25100CE"
+    assert index.nearest(calls, 25050.0)["symbol"] == "NIFTY26FEB25000CE"  # ties go to the lower strike
+    assert index.nearest(calls, 30000.0)["symbol"] == "NIFTY26FEB25100CE"
+    assert index.nearest(calls, 30000.0, tolerance=100.0) is None
+    assert index.nearest(None, 25000.0) is None
+    assert len(index.series("NIFTY26FEB", "CE", segment="BFO-OPT")) == 0
+
+
+def test_ladders_group_by_underlying_expiry_and_type():
+    df = master()
+    df["expiry"] = df["symbol"].str[5:10].where(df["instrument_type"] != "EQ")
+    index = InstrumentIndex(df)
+
+    puts = index.ladder("NIFTY", "26FEB", "PE")
+    assert puts.strikes == [24900.0, 25000.0, 25100.0]
+    assert index.nearest(puts, 24920.0)["token"] == 1101
+    assert index.ladder("NIFTY", "26MAR", "CE").strikes == [25000.0]
+    assert index.ladder("NIFTY", "26APR", "CE") is None
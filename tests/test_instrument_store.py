@@ -0,0 +1,83 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from brokers.instruments.store import InstrumentStore
+
+
+def master():
+    return pd.DataFrame({"symbol": ["NIFTY26FEB25000CE", "NIFTY26FEB25000PE"], "strike": [25000.0, 25000.0]})
+
+
+def test_writes_through_a_view_stay_private():
+    store = InstrumentStore()
+    first = store.acquire("kite", "survivor", master)
+    second = store.acquire("kite", "wave", master)
+
+    try:
+        first.loc[0, "strike"] = 1.0  # pandas 3 copies on write
+    except ValueError:
+        pass  # pandas 2: the shared arrays are read-only
+    first["strike"] = first["strike"] * 2
+    first["mine"] = 1
+
+    assert second["strike"].tolist() == [25000.0, 25000.0]
+    assert "mine" not in second.columns
+
+
+def test_refresh_replaces_the_master_with_one_download():
+    store = InstrumentStore()
+    downloads = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def download():
+        downloads.append(1)
+        started.set()
+        release.wait(5)
+        return master()
+
+    store.acquire("kite", "survivor", master)
+    views = {}
+    leader = threading.Thread(target=lambda: views.setdefault("survivor", store.refresh("kite", "survivor", download)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: views.setdefault("wave", store.refresh("kite", "wave", download)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(downloads) == 1
+    assert set(views) == {"survivor", "wave"}
+    assert store.owners("kite") == {"survivor", "wave"}
+
+
+def test_failed_refresh_keeps_the_held_master():
+    store = InstrumentStore()
+    store.acquire("kite", "survivor", master)
+
+    def broken():
+        raise ConnectionError("master download failed")
+
+    try:
+        store.refresh("kite", "survivor", broken)
+    except ConnectionError:
+        pass
+    assert store.owners("kite") == {"survivor"}
+    assert len(store.acquire("kite", "wave", broken)) == 2
+
+
+def test_owners_share_one_read_only_copy():
+    store = InstrumentStore()
+    downloaded = master()
+    downloaded["segment"] = pd.Categorical(["NFO-OPT", "NFO-OPT"])
+    first = store.acquire("kite", "survivor", lambda: downloaded)
+    second = store.acquire("kite", "wave", lambda: downloaded)
+
+    for column in ("strike", "symbol"):
+        assert np.shares_memory(first[column].array, second[column].array)
+    assert not first["strike"].to_numpy().flags.writeable
+    assert not np.shares_memory(first["strike"].to_numpy(), downloaded["strike"].to_numpy())
+    assert first["segment"].tolist() == ["NFO-OPT", "NFO-OPT"]
@@ -0,0 +1,101 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from brokers.instruments import cache
+from brokers.instruments.cache import MasterContractCache, last_refresh_boundary
+
+# 2026-02-06 is a Friday, 2026-02-09 the Monday after
+FRI_EVENING = datetime(2026, 2, 6, 18, 0)
+SAT_NOON = datetime(2026, 2, 7, 12, 0)
+MON_EARLY = datetime(2026, 2, 9, 7, 59)
+MON_OPEN = datetime(2026, 2, 9, 8, 0)
+TUE_EARLY = datetime(2026, 2, 10, 7, 30)
+
+
+class Clock:
+    now = None
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return Clock.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(cache, "datetime", FrozenDatetime)
+    return Clock
+
+
+def master():
+    return pd.DataFrame({"symbol": ["NIFTY26FEB25000CE", "NIFTY26FEB25000PE"], "token": [1, 2]})
+
+
+def written_at(mcc, when):
+    os.utime(mcc.path, (when.timestamp(), when.timestamp()))
+
+
+def downloads(calls):
+    def download():
+        calls.append(Clock.now)
+        return master()
+    return download
+
+
+@pytest.mark.parametrize("now, boundary", [
+    (MON_EARLY, datetime(2026, 2, 6, 8, 0)),
+    (MON_OPEN, MON_OPEN),
+    (SAT_NOON, datetime(2026, 2, 6, 8, 0)),
+    (TUE_EARLY, MON_OPEN),
+])
+def test_refresh_boundary_skips_weekends(now, boundary):
+    assert last_refresh_boundary(now) == boundary
+
+
+def test_cache_rolls_over_at_the_refresh_boundary(tmp_path, clock):
+    mcc = MasterContractCache("zerodha", cache_dir=str(tmp_path))
+    calls = []
+
+    clock.now = FRI_EVENING
+    mcc.get_or_download(downloads(calls))
+    written_at(mcc, FRI_EVENING)
+
+    # Through the weekend and up to Monday's refresh the Friday copy is served
+    for now in (SAT_NOON, MON_EARLY):
+        clock.now = now
+        assert mcc.is_fresh(now)
+        pd.testing.assert_frame_equal(mcc.get_or_download(downloads(calls)), master())
+    assert calls == [FRI_EVENING]
+
+    clock.now = MON_OPEN
+    assert not mcc.is_fresh(clock.now)
+    mcc.get_or_download(downloads(calls))
+    assert calls == [FRI_EVENING, MON_OPEN]
+
+
+def test_forced_refresh_ignores_a_fresh_copy(tmp_path, clock):
+    mcc = MasterContractCache("zerodha", cache_dir=str(tmp_path))
+    calls = []
+    clock.now = MON_OPEN
+    mcc.get_or_download(downloads(calls))
+    mcc.get_or_download(downloads(calls), force=True)
+    assert len(calls) == 2
+
+
+def test_corrupt_cache_is_a_miss(tmp_path, clock):
+    mcc = MasterContractCache("zerodha", cache_dir=str(tmp_path))
+    calls = []
+    clock.now = MON_OPEN
+    with open(mcc.path, "wb") as f:
+        f.write(b"not a master contract")
+
+    assert mcc.is_fresh(clock.now)
+    assert mcc.load() is None
+    pd.testing.assert_frame_equal(mcc.get_or_download(downloads(calls)), master())
+    assert len(calls) == 1
+    # The download replaced the bad file
+    pd.testing.assert_frame_equal(mcc.load(), master())
@@ -0,0 +1,60 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from brokers.instruments import normalize_fyers, normalize_zerodha
+
+TODAY = date(2026, 2, 2)  # a Monday
+EXPIRY = date(2026, 2, 24)
+EXPIRY_EPOCH = int(datetime(2026, 2, 24, 10, 0, tzinfo=timezone.utc).timestamp())
+
+
+def baseline_fyers_segment(symbol):
+    """The row-wise mapping the Fyers driver used before vectorization."""
+    if symbol.endswith("FUT"):
+        return {"NSE": "NFO-FUT", "BSE": "BFO-FUT"}.get(symbol[:3])
+    if symbol.endswith("CE") or symbol.endswith("PE"):
+        return {"NSE": "NFO-OPT", "BSE": "BFO-OPT"}.get(symbol[:3])
+    return {"NSE": "NSE", "BSE": "BSE"}.get(symbol[:3])
+
+
+def as_objects(series):
+    return [None if pd.isna(v) else v for v in series.astype(object)]
+
+
+def test_fyers_matches_row_wise_baseline():
+    symbols = [
+        "NSE:NIFTY26FEB25000CE", "NSE:NIFTY26FEBFUT", "BSE:SENSEX26FEB80000PE",
+        "BSE:SENSEX26FEBFUT", "NSE:SBIN-EQ", "BSE:TCS", "MCX:CRUDEOIL26FEBFUT",
+    ]
+    expiries = [EXPIRY_EPOCH] * 4 + [np.nan, np.nan, EXPIRY_EPOCH]
+    df = normalize_fyers(pd.DataFrame({"symbol": symbols, "expiry": expiries}), today=TODAY)
+
+    assert list(df["instrument_type"].astype(str)) == ["CE", "FUT", "PE", "FUT", "EQ", "EQ", "FUT"]
+    assert as_objects(df["segment"]) == [baseline_fyers_segment(s) for s in symbols]
+    assert as_objects(df["segment"]) == ["NFO-OPT", "NFO-FUT", "BFO-OPT", "BFO-FUT", "NSE", "BSE", None]
+    assert as_objects(df["expiry"]) == [EXPIRY] * 4 + [None, None, EXPIRY]
+    assert all(type(e) is date for e in df["expiry"].dropna())
+
+    days = np.busday_count(TODAY, EXPIRY) + 1
+    assert days == 17
+    assert df["days_to_expiry"].iloc[0] == days
+    assert df["days_to_expiry"].iloc[4:6].isna().all()
+
+
+def test_zerodha_keeps_given_segments_and_counts_business_days():
+    raw = pd.DataFrame({
+        "tradingsymbol": ["NIFTY26FEB25000CE", "SENSEX26FEBFUT", "SBIN"],
+        "expiry": ["2026-02-24", "2026-02-24", ""],
+        "instrument_type": ["CE", "FUT", "EQ"],
+        "segment": ["NFO-OPT", "BFO-FUT", "NSE"],
+        "exchange": ["NFO", "BFO", "NSE"],
+    })
+    df = normalize_zerodha(raw, today=TODAY)
+
+    assert list(df["instrument_type"].astype(str)) == ["CE", "FUT", "EQ"]
+    assert list(df["segment"].astype(str)) == ["NFO-OPT", "BFO-FUT", "NSE"]
+    assert as_objects(df["expiry"]) == [EXPIRY, EXPIRY, None]
+    assert list(df["days_to_expiry"].iloc[:2]) == [17.0, 17.0]
+    assert np.isnan(df["days_to_expiry"].iloc[2])
@@ -0,0 +1,158 @@
+import threading
+import time
+
+from brokers.core.enums import Exchange, OrderType, ProductType, TransactionType
+from brokers.core.gateway import BrokerGateway
+from brokers.core.interface import BrokerDriver
+from brokers.core.schemas import BrokerCapabilities, OrderRequest, OrderResponse
+from brokers.integrations.backtest.driver import BacktestDriver
+from brokers.risk import MasterRiskController
+
+
+class LegDriver:
+    """Accepts SELL legs; BUY legs raise or are rejected."""
+
+    def __init__(self, buy_raises=False):
+        self.buy_raises = buy_raises
+        self.cancelled = []
+
+    def get_capabilities(self):
+        return BrokerCapabilities()
+
+    def place_order(self, request):
+        if request.transaction_type == TransactionType.BUY:
+            if self.buy_raises:
+                raise ConnectionError("reset by peer")
+            return OrderResponse(status="error", order_id=None, message="rejected")
+        return OrderResponse(status="ok", order_id="S1")
+
+    def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return OrderResponse(status="ok", order_id=order_id)
+
+
+def leg(side):
+    return OrderRequest(
+        symbol="NIFTY26FEB25000CE", exchange=Exchange.NFO, quantity=75, order_type=OrderType.LIMIT,
+        transaction_type=side, product_type=ProductType.MARGIN, price=10.0,
+    )
+
+
+def test_gateway_rolls_back_when_a_leg_raises():
+    driver = LegDriver(buy_raises=True)
+    sell, buy = BrokerGateway(driver, "backtest").place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+    assert driver.cancelled == ["S1"]
+    assert sell.status == "error" and buy.status == "error"
+    assert "reset by peer" in buy.message
+
+
+def test_risk_controller_pairs_legs_on_a_raw_driver():
+    driver = LegDriver()
+    sell, buy = MasterRiskController(driver).place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+    assert driver.cancelled == ["S1"]
+    assert sell.status == "error" and buy.status == "error"
+
+
+class LegacyDriver(LegDriver):
+    """Answers like the Upstox/ICICI REST drivers: dict orders and bool cancels."""
+
+    def get_capabilities(self):
+        return BrokerCapabilities(supports_concurrent_orders=True)
+
+    def place_order(self, request):
+        if request.transaction_type == TransactionType.BUY:
+            return {"status": "error", "order_id": -1, "message": "rejected"}
+        return {"status": "success", "order_id": "S1"}
+
+    def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return True
+
+
+def test_rolls_back_dict_and_bool_responses():
+    driver = LegacyDriver()
+    sell, buy = BrokerGateway(driver, "upstox").place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+    assert driver.cancelled == ["S1"]
+    assert isinstance(sell, OrderResponse) and isinstance(buy, OrderResponse)
+    assert sell.status == "error" and sell.order_id == "S1"
+    assert buy.status == "error" and buy.message == "rejected"
+
+
+def test_failed_bool_cancel_keeps_the_live_leg():
+    driver = LegacyDriver()
+    driver.cancel_order = lambda order_id: False
+    sell, buy = BrokerGateway(driver, "upstox").place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+    assert sell.status == "ok" and sell.order_id == "S1"
+    assert buy.status == "error"
+
+
+class OverlapDriver(LegDriver):
+    """Accepts every leg and records how many were inside place_order at once."""
+
+    def __init__(self, concurrent):
+        super().__init__()
+        self.concurrent = concurrent
+        self._lock = threading.Lock()
+        self.active = self.max_active = 0
+
+    def get_capabilities(self):
+        return BrokerCapabilities(supports_concurrent_orders=self.concurrent)
+
+    def place_order(self, request):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return OrderResponse(status="ok", order_id=request.transaction_type.value)
+
+
+def test_legs_run_concurrently_only_on_thread_safe_drivers():
+    for concurrent, expected in ((False, 1), (True, 2)):
+        driver = OverlapDriver(concurrent)
+        gateway = BrokerGateway(driver, "backtest")
+        assert gateway._order_pool is None
+        gateway.place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+        assert driver.max_active == expected
+        assert (gateway._order_pool is not None) == concurrent
+
+
+def test_same_symbol_legs_book_both_fills_on_paper_driver():
+    driver = BacktestDriver(initial_capital=1_000_000.0)
+    driver.set_price("NIFTY26FEB25000CE", 10.0)
+    sell, buy = BrokerGateway(driver, "backtest").place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+
+    assert sell.status == "ok" and buy.status == "ok"
+    assert {sell.order_id, buy.order_id} == {"BT1", "BT2"}
+    assert driver.trade_count == 2
+    assert "NIFTY26FEB25000CE" not in driver.positions
+
+
+
+class FlaggedBasketDriver(BrokerDriver):
+    """Claims basket support but keeps the base place_basket_orders, like Zerodha did."""
+
+    get_funds = get_positions = get_orderbook = get_tradebook = get_quote = get_history = modify_order = None
+
+    def __init__(self):
+        super().__init__()
+        self.capabilities.supports_basket_orders = True
+        self.placed = []
+
+    def place_order(self, request):
+        self.placed.append(request.transaction_type)
+        return OrderResponse(status="ok", order_id=request.transaction_type.value)
+
+    def cancel_order(self, order_id):
+        return OrderResponse(status="ok", order_id=order_id)
+
+
+def test_basket_flag_without_an_override_places_legs_directly(caplog):
+    driver = FlaggedBasketDriver()
+    with caplog.at_level("WARNING", logger="brokers.core.gateway"):
+        sell, buy = BrokerGateway(driver, "backtest").place_order_pair(leg(TransactionType.SELL), leg(TransactionType.BUY))
+
+    assert (sell.status, buy.status) == ("ok", "ok")
+    assert driver.placed == [TransactionType.SELL, TransactionType.BUY]
+    assert "Basket placement failed" not in caplog.text
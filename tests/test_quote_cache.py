@@ -0,0 +1,42 @@
+from conftest import risk_over_gateway
+
+
+def test_risk_controller_quotes_come_from_ticks():
+    driver, broker = risk_over_gateway()
+    broker.symbols_to_subscribe(["NFO:NIFTY26FEB25000CE"])
+    driver.tick("NFO:NIFTY26FEB25000CE", 101.5)
+
+    assert driver.subscribed == ["NFO:NIFTY26FEB25000CE"]
+    assert broker.get_quote("NFO:NIFTY26FEB25000CE").last_price == 101.5
+    assert broker.get_cached_quote("NFO:NIFTY26FEB25000CE").last_price == 101.5
+    assert driver.rest_quotes == []
+
+
+def test_risk_controller_falls_back_to_rest_without_ticks():
+    driver, broker = risk_over_gateway()
+    assert broker.get_cached_quote("NFO:NIFTY26FEB25000CE") is None
+    assert broker.get_quote("NFO:NIFTY26FEB25000CE").last_price == 1.0
+    assert driver.rest_quotes == ["NFO:NIFTY26FEB25000CE"]
+
+
+def test_batched_quotes_skip_symbols_with_fresh_ticks():
+    driver, broker = risk_over_gateway()
+    driver.tick("NFO:NIFTY26FEB25000CE", 101.5)
+
+    quotes = broker.get_quotes(["NFO:NIFTY26FEB25000CE", "NFO:NIFTY26FEB25000PE"])
+
+    assert quotes["NFO:NIFTY26FEB25000CE"].last_price == 101.5
+    assert driver.batched_quotes == [["NFO:NIFTY26FEB25000PE"]]
+
+
+def test_broken_tick_normalizer_is_logged_once(caplog):
+    driver, broker = risk_over_gateway()
+    driver.normalize_ticks = lambda message: message["missing"]
+
+    with caplog.at_level("ERROR", logger="brokers.core.gateway"):
+        driver.tick("NFO:NIFTY26FEB25000CE", 101.5)
+        driver.tick("NFO:NIFTY26FEB25000CE", 101.6)
+
+    assert len(caplog.records) == 1
+    assert "Could not normalize ticks" in caplog.text
+    assert broker.get_cached_quote("NFO:NIFTY26FEB25000CE") is None
@@ -0,0 +1,101 @@
+import threading
+
+from brokers.core.enums import Exchange
+from brokers.core.gateway import BrokerGateway
+from brokers.core.schemas import BrokerCapabilities, Quote
+
+SYMBOLS = [f"NFO:NIFTY26FEB{strike}CE" for strike in range(25000, 25800, 100)]
+
+
+def strike(symbol):
+    return float(symbol[-7:-2])
+
+
+class BatchDriver:
+    """Prices each symbol by its strike; records batched and single quote calls."""
+
+    def __init__(self, batch_raises=False, max_quote_symbols=50):
+        self.batch_raises = batch_raises
+        self.max_quote_symbols = max_quote_symbols
+        self.batched_quotes = []
+        self.rest_quotes = []
+        self._lock = threading.Lock()
+
+    def get_capabilities(self):
+        return BrokerCapabilities(max_quote_symbols=self.max_quote_symbols)
+
+    def get_quotes(self, symbols):
+        with self._lock:
+            self.batched_quotes.append(sorted(symbols))
+        if self.batch_raises:
+            raise ConnectionError("batch endpoint down")
+        return {s: self._quote(s) for s in symbols}
+
+    def get_quote(self, symbol):
+        with self._lock:
+            self.rest_quotes.append(symbol)
+        return self._quote(symbol)
+
+    @staticmethod
+    def _quote(symbol):
+        tradingsymbol = symbol.split(":")[1]
+        return Quote(symbol=tradingsymbol, exchange=Exchange.NFO, last_price=strike(tradingsymbol))
+
+
+def quote_concurrently(gateway, symbols):
+    barrier = threading.Barrier(len(symbols))
+    results = {}
+
+    def worker(symbol):
+        barrier.wait()
+        results[symbol] = gateway.get_quote(symbol)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in symbols]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+def test_concurrent_quotes_share_one_batch():
+    driver = BatchDriver()
+    gateway = BrokerGateway(driver, "backtest", quote_coalesce_ms=200, quote_max_age_ms=0)
+
+    results = quote_concurrently(gateway, SYMBOLS)
+
+    assert driver.batched_quotes == [sorted(SYMBOLS)]
+    assert driver.rest_quotes == []
+    for symbol in SYMBOLS:
+        assert results[symbol].symbol == symbol.split(":")[1]
+        assert results[symbol].last_price == strike(symbol)
+
+
+def test_failed_batch_falls_back_to_single_quotes():
+    driver = BatchDriver(batch_raises=True)
+    gateway = BrokerGateway(driver, "backtest", quote_coalesce_ms=200, quote_max_age_ms=0)
+
+    results = quote_concurrently(gateway, SYMBOLS)
+
+    assert len(driver.batched_quotes) == 1
+    assert sorted(driver.rest_quotes) == sorted(SYMBOLS)
+    for symbol in SYMBOLS:
+        assert results[symbol].last_price == strike(symbol)
+
+
+def test_hub_gateway_coalesces_by_default(monkeypatch):
+    monkeypatch.delenv("BROKERS_QUOTE_COALESCE_MS", raising=False)
+    driver = BatchDriver()
+    gateway = BrokerGateway(driver, "backtest")  # as main.py builds it
+
+    results = quote_concurrently(gateway, SYMBOLS[:2])
+
+    assert driver.batched_quotes == [sorted(SYMBOLS[:2])]
+    assert driver.rest_quotes == []
+    assert [results[s].last_price for s in SYMBOLS[:2]] == [25000.0, 25100.0]
+
+
+def test_no_default_window_without_a_batched_endpoint(monkeypatch):
+    monkeypatch.delenv("BROKERS_QUOTE_COALESCE_MS", raising=False)
+    gateway = BrokerGateway(BatchDriver(max_quote_symbols=0), "backtest")
+    assert gateway._quote_coalescer is None
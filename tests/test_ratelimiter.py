@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+from brokers.net.ratelimiter import (
+    Priority,
+    RateLimiter,
+    TokenBucket,
+    get_limiter,
+    limiter_stats,
+    rate_limited,
+    rate_limited_fyers,
+)
+
+
+def drain(limiter):
+    while limiter.try_acquire():
+        pass
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity():
+    bucket = TokenBucket(2, 1.0)
+    bucket.tokens = 0.0
+    start = bucket._updated
+    bucket.refill(start + 0.5)
+    assert bucket.tokens == 1.0
+    assert bucket.wait_time() == 0.0
+    assert bucket.wait_time(2.0) == 0.5
+    bucket.refill(start + 10.0)
+    assert bucket.tokens == 2.0
+
+
+def test_try_acquire_never_blocks():
+    limiter = RateLimiter(calls_per_second=2)
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert (limiter.acquired, limiter.rejected) == (2, 1)
+
+
+def test_every_tier_must_have_a_token():
+    limiter = RateLimiter(calls_per_second=100, calls_per_minute=1)
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+
+def test_acquire_waits_for_a_refill():
+    limiter = RateLimiter(calls_per_second=20)
+    drain(limiter)
+    start = time.monotonic()
+    assert limiter.acquire()
+    assert time.monotonic() - start >= 0.03
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_acquire_gives_up_after_timeout():
+    limiter = RateLimiter(calls_per_minute=1)
+    assert limiter.acquire(timeout=0.05)
+    start = time.monotonic()
+    assert not limiter.acquire(timeout=0.05)
+    assert time.monotonic() - start < 1.0
+    assert limiter.rejected == 1
+    assert limiter.stats()["waiting"] == {}
+
+
+def test_cancel_lane_goes_before_a_waiting_quote():
+    limiter = RateLimiter(calls_per_second=5)
+    drain(limiter)
+    order = []
+
+    def wait(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    quote = threading.Thread(target=wait, args=(Priority.QUOTE,))
+    quote.start()
+    time.sleep(0.05)  # the quote is already waiting when the cancel arrives
+    cancel = threading.Thread(target=wait, args=(Priority.CANCEL,))
+    cancel.start()
+    quote.join(5)
+    cancel.join(5)
+    assert order == [Priority.CANCEL, Priority.QUOTE]
+
+
+def test_acquire_async_waits_without_blocking_the_loop():
+    limiter = RateLimiter(calls_per_second=20)
+    drain(limiter)
+    ticks = []
+
+    async def ticker():
+        for _ in range(3):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.005)
+
+    async def acquire():
+        await limiter.acquire_async(Priority.ORDER)
+        return time.monotonic()
+
+    async def main():
+        acquired_at, _ = await asyncio.gather(acquire(), ticker())
+        return acquired_at
+
+    acquired_at = asyncio.run(main())
+    # The loop kept running while the token was refilling
+    assert len(ticks) == 3 and ticks[-1] < acquired_at
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_decorated_coroutines_wait_asynchronously():
+    @rate_limited(calls_per_second=1)
+    async def fetch():
+        return "ok"
+
+    async def main():
+        return await asyncio.wait_for(fetch(), 1)
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_drivers_with_one_client_id_share_a_budget():
+    class Driver:
+        def __init__(self, client_id):
+            self._client_id = client_id
+
+        @rate_limited_fyers(Priority.QUOTE)
+        def get_quote(self, symbol):
+            return symbol
+
+    first, second, other = Driver("SHARED1"), Driver("SHARED1"), Driver("OTHER1")
+    first.get_quote("NSE:SBIN")
+    second.get_quote("NSE:SBIN")
+    other.get_quote("NSE:SBIN")
+
+    stats = limiter_stats()
+    assert stats["fyers:SHARED1"]["acquired"] == 2
+    assert stats["fyers:OTHER1"]["acquired"] == 1
+    assert get_limiter("fyers:SHARED1") is get_limiter("fyers:SHARED1", calls_per_second=1)
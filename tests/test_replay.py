@@ -0,0 +1,34 @@
+import pandas as pd
+
+from brokers.integrations.backtest.replay import TickReplayProvider
+
+
+def make_provider(tmp_path):
+    index_file = tmp_path / "index.csv"
+    pd.DataFrame({"timestamp": ["2026-02-02 09:15:00"], "ltp": [25000.0]}).to_csv(index_file, index=False)
+    options_file = tmp_path / "options.csv"
+    pd.DataFrame(
+        {
+            "timestamp": ["2026-02-02 09:15:00", "2026-02-02 09:15:00", "2026-02-24 15:29:00", "2026-03-30 15:29:00"],
+            "symbol": ["NIFTY26FEB25000CE", "NIFTY26MAR25000CE", "NIFTY26FEB25000PE", "NIFTY26MAR25000PE"],
+            "ltp": [100.0, 150.0, 1.0, 2.0],
+        }
+    ).to_csv(options_file, index=False)
+    return TickReplayProvider(str(index_file), [str(options_file)], "NSE:NIFTY 50", chunksize=2)
+
+
+def test_near_series_rolls_over_after_expiry_within_the_month(tmp_path):
+    provider = make_provider(tmp_path)
+
+    assert provider.near_prefix(pd.Timestamp("2026-01-20 10:00")) == "NIFTY26FEB"
+    assert provider.near_prefix(pd.Timestamp("2026-02-24 15:00")) == "NIFTY26FEB"  # expiry day itself
+    assert provider.near_prefix(pd.Timestamp("2026-02-25 09:15")) == "NIFTY26MAR"
+    assert provider.near_prefix(pd.Timestamp("2026-04-06 09:15")) == "NIFTY26MAR"  # beyond the data
+
+
+def test_option_chain_follows_the_live_series(tmp_path):
+    provider = make_provider(tmp_path)
+
+    chain = provider.get_option_chain(pd.Timestamp("2026-02-26 09:15"))
+    assert chain["prefix"] == "NIFTY26MAR"
+    assert chain["CE"]["synth_symbol"].tolist() == ["NIFTY26MAR25000CE"]
@@ -0,0 +1,50 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from brokers.integrations.backtest.csv_provider import CSVDataProvider
+from brokers.integrations.backtest.shared import SharedMarketData, attach_provider
+
+from conftest import write_nse_csvs
+
+DAYS = [pd.Timestamp("2026-02-02 15:30"), pd.Timestamp("2026-02-04 09:15"), pd.Timestamp("2026-02-07 10:00")]
+SYMBOLS = ["NIFTY26FEB25000CE", "NIFTY26FEB24800PE", "NIFTY26MAR25200PE", "NIFTY26MAR25100CE", "NIFTY26FEB25025CE"]
+
+
+def answers(provider):
+    """Quotes and near-month chains, in plain Python values comparable across processes."""
+    prices = {(s, str(t)): provider.get_option_price(s, t) for s in SYMBOLS for t in DAYS}
+    chains = {}
+    for t in DAYS:
+        chain = provider.get_option_chain(t)
+        chains[str(t)] = {side: chain[side].astype(object).to_dict("records") for side in ("CE", "PE")}
+        chains[str(t)]["expiry"] = chain["expiry"]
+    return prices, chains
+
+
+def attached_answers(handle):
+    provider = attach_provider(handle)
+    assert not provider.ce_data["Strike Price"].to_numpy().flags.writeable
+    return answers(provider)
+
+
+def test_workers_see_the_published_data(tmp_path):
+    provider = CSVDataProvider(str(write_nse_csvs(str(tmp_path))), use_cache=False)
+    expected = answers(provider)
+
+    with SharedMarketData.publish(provider) as shared:
+        names = [col.shm_name for frame in shared.handle.frames.values() if frame for col in frame.columns]
+        # Text columns travel as categorical codes
+        assert any(col.categories for col in shared.handle.frames["ce_data"].columns)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            assert pool.submit(attached_answers, shared.handle).result() == expected
+        # Segments outlive the workers that attached to them
+        assert attached_answers(shared.handle) == expected
+
+    assert shared.nbytes == 0
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
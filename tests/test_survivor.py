@@ -0,0 +1,99 @@
+import pandas as pd
+
+from brokers.core.enums import Exchange
+from brokers.core.schemas import BrokerCapabilities, Quote
+from brokers.instruments import InstrumentIndex
+
+from conftest import load_strategy
+
+
+class QuoteBroker:
+    """Broker that keys batched quotes by exchange-qualified symbol, as the gateway does."""
+
+    def __init__(self, prices, max_quote_symbols=500):
+        self.prices = prices
+        self.max_quote_symbols = max_quote_symbols
+        self.batched_calls = 0
+        self.single_calls = 0
+        self.orders = []
+
+    def get_capabilities(self):
+        return BrokerCapabilities(max_quote_symbols=self.max_quote_symbols)
+
+    def get_quotes(self, symbols):
+        self.batched_calls += 1
+        return {
+            f"NFO:{s}": Quote(symbol=s, exchange=Exchange.NFO, last_price=self.prices[s])
+            for s in symbols
+        }
+
+    def get_quote(self, symbol):
+        self.single_calls += 1
+        return Quote(symbol=symbol, exchange=Exchange.NFO, last_price=self.prices[symbol])
+
+    def place_order(self, request):
+        self.orders.append(request)
+
+
+def make_survivor(broker):
+    strikes = range(24000, 25050, 50)
+    instruments = pd.DataFrame(
+        {
+            "symbol": [f"NIFTY26FEB{k}{t}" for k in strikes for t in ("CE", "PE")],
+            "strike": [float(k) for k in strikes for _ in ("CE", "PE")],
+            "instrument_type": [t for _ in strikes for t in ("CE", "PE")],
+            "segment": "NFO-OPT",
+        }
+    )
+    survivor = load_strategy("survivor").SurvivorStrategy(
+        broker,
+        {
+            "symbol_initials": "NIFTY26FEB",
+            "pe_gap": 25,
+            "pe_quantity": 75,
+            "pe_symbol_gap": 400,
+            "min_price_to_sell": 15,
+            "sell_multiplier_threshold": 5,
+            "exchange": "NFO",
+            "tag": "Survivor",
+        },
+    )
+    survivor.instruments = instruments
+    survivor.instrument_index = InstrumentIndex(instruments)
+    survivor.strike_difference = 50
+    survivor.nifty_pe_last_value = 24950
+    survivor.pe_reset_gap_flag = 0
+    return survivor
+
+
+def walk_prices(first_qualifying=24750):
+    # Strikes further out than `first_qualifying` are too cheap to sell
+    prices = {f"NIFTY26FEB{k}PE": (20.0 if k >= first_qualifying else 5.0) for k in range(24000, 25050, 50)}
+    prices.update({f"NIFTY26FEB{k}CE": 5.0 for k in range(24000, 25050, 50)})
+    return prices
+
+
+def test_strike_walk_uses_one_batched_quote_call():
+    # The walk steps 400 -> 250 before a strike qualifies
+    broker = QuoteBroker(walk_prices())
+    survivor = make_survivor(broker)
+    survivor._place_order = lambda symbol, quantity: broker.orders.append((symbol, quantity))
+
+    survivor._handle_pe_trade(25000)
+
+    assert broker.batched_calls == 1
+    assert broker.single_calls == 0
+    assert broker.orders == [("NIFTY26FEB24750PE", 150)]
+
+
+def test_strike_walk_quotes_lazily_without_a_batch_endpoint():
+    # The first strike qualifies, so one single quote is all the walk needs
+    broker = QuoteBroker(walk_prices(first_qualifying=24000), max_quote_symbols=0)
+    survivor = make_survivor(broker)
+    survivor._place_order = lambda symbol, quantity: broker.orders.append((symbol, quantity))
+
+    survivor._handle_pe_trade(25000)
+
+    assert broker.batched_calls == 0
+    assert broker.single_calls == 1
+    assert broker.orders == [("NIFTY26FEB24600PE", 150)]
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+from conftest import load_strategy, risk_over_gateway
+
+WaveStrategy = load_strategy("wave").WaveStrategy
+
+CONFIG = {
+    "exchange": "NFO",
+    "symbol_name": "NIFTY26FEB25000CE",
+    "buy_gap": 1,
+    "sell_gap": 1,
+    "cool_off_time": 10,
+    "buy_quantity": 75,
+    "sell_quantity": 75,
+}
+
+
+def make_wave(cool_off_time=0, begin=None):
+    """Running Wave whose cycle phases are recorded instead of trading."""
+    _, broker = risk_over_gateway()
+    wave = WaveStrategy(broker, dict(CONFIG, cool_off_time=cool_off_time))
+    wave._is_running = True
+    wave.finished = []
+    wave._begin_wave_cycle = begin or (lambda: {"cycle": 1})
+    wave._finish_wave_cycle = wave.finished.append
+    return wave
+
+
+async def settle(rounds=50):
+    for _ in range(rounds):
+        await asyncio.sleep(0.01)
+
+
+def test_cool_off_quote_comes_from_tick_cache_under_hub_stack():
+    driver, broker = risk_over_gateway()
+    wave = WaveStrategy(broker, CONFIG)
+    wave._subscribe_ticks()
+    driver.tick("NFO:NIFTY26FEB25000CE", 98.25)
+
+    assert wave._quote_after_cool_off() == 98.25
+    assert driver.subscribed == ["NFO:NIFTY26FEB25000CE"]
+    assert driver.rest_quotes == []
+
+
+def test_wave_cycle_completes_after_cool_off():
+    wave = make_wave()
+
+    async def main():
+        wave._schedule_wave_cycle(asyncio.get_running_loop())
+        assert wave.already_executing_order == 1
+        await settle()
+
+    asyncio.run(main())
+    assert wave.finished == [{"cycle": 1}]
+    assert wave.already_executing_order == 0
+
+
+def test_stop_during_begin_places_nothing():
+    started, release = threading.Event(), threading.Event()
+
+    def begin():
+        started.set()
+        release.wait(5)
+        return {"cycle": 1}
+
+    wave = make_wave(begin=begin)
+
+    async def main():
+        wave._schedule_wave_cycle(asyncio.get_running_loop())
+        await asyncio.to_thread(started.wait, 5)
+        wave._is_running = False
+        wave.on_stop()
+        release.set()
+        await settle()
+
+    asyncio.run(main())
+    assert wave.finished == []
+    assert wave._cool_off_handle is None
+    assert wave.already_executing_order == 0
+
+
+def test_stop_during_cool_off_cancels_the_timer():
+    wave = make_wave(cool_off_time=1)
+
+    async def main():
+        wave._schedule_wave_cycle(asyncio.get_running_loop())
+        await settle(10)
+        assert wave._cool_off_handle is not None
+        wave._is_running = False
+        wave.on_stop()
+        await asyncio.sleep(1.2)
+
+    asyncio.run(main())
+    assert wave.finished == []
+    assert wave.already_executing_order == 0
+
+
+def test_stop_during_finish_places_no_orders():
+    pricing, release = threading.Event(), threading.Event()
+    wave = make_wave()
+    del wave._finish_wave_cycle
+    wave.prev_wave_buy_price = wave.prev_wave_sell_price = None
+    executed = []
+
+    def final_prices(best_prices, buy_gap, sell_gap):
+        # The post-cool-off quote is still in flight when the strategy stops
+        pricing.set()
+        release.wait(5)
+        return {"buy": 99.0, "sell": 101.0}
+
+    wave._final_prices = final_prices
+    wave._execute_orders = lambda *args: executed.append(args)
+    wave._begin_wave_cycle = lambda: {
+        "symbol": "NIFTY26FEB25000CE", "symbol_class": "nifty", "restrict_buy_order": 0,
+        "restrict_sell_order": 0, "scaled_buy_gap": 1, "scaled_sell_gap": 1, "best_prices": {},
+    }
+
+    async def main():
+        wave._schedule_wave_cycle(asyncio.get_running_loop())
+        await asyncio.to_thread(pricing.wait, 5)
+        wave._is_running = False
+        wave.on_stop()
+        release.set()
+        await settle()
+
+    asyncio.run(main())
+    assert executed == []
+    assert wave.prev_wave_buy_price is None
@@ -0,0 +1,100 @@
+from datetime import date, datetime
+
+import pytest
+
+from brokers.integrations.zerodha import driver as zerodha
+
+
+def kite_row(exchange, symbol, token, name="", strike=0.0, instrument_type="EQ", segment=None, expiry=""):
+    return {
+        "instrument_token": token, "exchange_token": token // 256, "tradingsymbol": symbol, "name": name,
+        "last_price": 0.0, "expiry": expiry, "strike": strike, "tick_size": 0.05, "lot_size": 1 if not expiry else 75,
+        "instrument_type": instrument_type, "segment": segment or exchange, "exchange": exchange,
+    }
+
+
+class FakeKite:
+    def __init__(self):
+        self.instrument_calls = 0
+        self.history_tokens = []
+
+    def instruments(self, exchange=None):
+        self.instrument_calls += 1
+        return [
+            kite_row("NSE", "SBIN", 779521),
+            kite_row("BSE", "SBIN", 128028676),
+            kite_row("NFO", "NIFTY26FEB25000CE", 12345602, "NIFTY", 25000.0, "CE", "NFO-OPT", date(2026, 2, 24)),
+            kite_row("NFO", "NIFTY26FEB25000PE", 12345603, "NIFTY", 25000.0, "PE", "NFO-OPT", date(2026, 2, 24)),
+        ]
+
+    def historical_data(self, token, from_date, to_date, interval):
+        self.history_tokens.append((token, interval))
+        return [{"date": datetime(2026, 2, 2, 9, 15), "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}]
+
+
+class FakeTicker:
+    MODE_FULL = "full"
+
+    def __init__(self):
+        self.subscribed = []
+        self.modes = []
+
+    def subscribe(self, tokens):
+        self.subscribed.append(list(tokens))
+
+    def set_mode(self, mode, tokens):
+        self.modes.append((mode, list(tokens)))
+
+
+class UncachedMaster:
+    def __init__(self, broker):
+        pass
+
+    def get_or_download(self, download, force=False):
+        return download()
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    for var in ("BROKER_API_KEY", "KITE_API_KEY", "ZERODHA_API_KEY"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("BROKER_LOGIN_MODE", "none")
+    monkeypatch.setattr(zerodha, "MasterContractCache", UncachedMaster)
+    d = zerodha.ZerodhaDriver()
+    d._kite = FakeKite()
+    d._kite_ws = FakeTicker()
+    return d
+
+
+def test_history_resolves_tokens_from_the_master(driver):
+    bars = driver.get_history("NFO:NIFTY26FEB25000CE", "5m", "2026-02-02", "2026-02-03")
+    assert driver.get_history("BSE:SBIN", "1d", "2026-02-02", "2026-02-03")
+    # An NSE-qualified derivative falls back to its NFO listing
+    assert driver.get_history("NSE:NIFTY26FEB25000PE", "15m", "2026-02-02", "2026-02-03")
+
+    assert driver._kite.history_tokens == [(12345602, "5minute"), (128028676, "day"), (12345603, "15minute")]
+    assert bars[0]["close"] == 1.5 and bars[0]["ts"] == int(datetime(2026, 2, 2, 9, 15).timestamp())
+    # The master is fetched once and indexed for every later lookup
+    assert driver._kite.instrument_calls == 1
+
+
+def test_unknown_symbols_have_no_history(driver):
+    assert driver.get_history("NFO:NIFTY26FEB99999CE", "5m", "2026-02-02", "2026-02-03") == []
+    assert driver.get_history("MCX:SBIN", "5m", "2026-02-02", "2026-02-03") == []
+    assert driver._kite.history_tokens == []
+
+
+def test_subscribe_maps_symbols_to_tokens_and_skips_unknown(driver):
+    driver.symbols_to_subscribe(["NSE:SBIN", "NFO:NIFTY26FEB25000CE", "NFO:NIFTY26FEB99999CE", 260105])
+
+    assert driver._kite_ws.subscribed == [[779521, 12345602, 260105]]
+    assert driver._kite_ws.modes == [("full", [779521, 12345602, 260105])]
+
+
+def test_ticks_map_back_to_qualified_symbols(driver):
+    driver._token_index()
+    ticks = driver.normalize_ticks([
+        {"instrument_token": 12345602, "last_price": 101.5},
+        {"instrument_token": 42, "last_price": 1.0},
+    ])
+    assert [(t["symbol"], t["price"]) for t in ticks] == [("NFO:NIFTY26FEB25000CE", 101.5)]